@@ -0,0 +1,356 @@
+"""Teste de carga da API do LetHimCook com N utilizadores virtuais em simultâneo.
+
+Cada utilizador virtual repete o percurso de uma sessão do cliente: login,
+pesquisa enquanto escreve, abrir as receitas próprias e guardadas, seguir
+utilizadores, editar uma receita e ver notificações. Os pedidos são os mesmos
+que as páginas fazem (listas paginadas, /get_recipes em lote, ...).
+
+No fim mostra, por endpoint, pedidos/s e latências p50/p95/p99, e guarda tudo
+em JSON para comparar com uma execução anterior:
+
+    python reference_server.py --db /tmp/bench.db &
+    python benchmark.py --users 50 --duration 30 --output atual.json
+    python benchmark.py --users 50 --duration 30 --baseline atual.json
+
+Com --baseline o código de saída é 1 se algum endpoint piorar mais do que --tolerance.
+"""
+import argparse
+import json
+import platform
+import random
+import string
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+PAGE_SIZE = 48  # Igual ao cliente (recipe_service.PAGE_SIZE)
+PASSWORD = "bench"
+
+
+class Medidor:
+    """Regista a latência de cada pedido, por endpoint. Partilhado por todos os utilizadores virtuais."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencias = defaultdict(list)  # endpoint -> [segundos]
+        self.erros = defaultdict(int)  # endpoint -> pedidos sem resposta ou com 5xx
+        self.ativo = False  # Só conta depois do aquecimento
+
+    def registar(self, endpoint, segundos, erro):
+        if not self.ativo:
+            return
+        with self._lock:
+            self.latencias[endpoint].append(segundos)
+            if erro:
+                self.erros[endpoint] += 1
+
+
+class Cliente:
+    """Uma sessão HTTP (como o ApiClient do cliente) que mede cada pedido."""
+
+    def __init__(self, url, medidor):
+        self.url = url.rstrip("/")
+        self.medidor = medidor
+        self.sessao = requests.Session()
+
+    def post(self, endpoint, payload):
+        inicio = time.perf_counter()
+        try:
+            resposta = self.sessao.post(self.url + endpoint, json=payload, timeout=(3.05, 30))
+        except requests.RequestException:
+            self.medidor.registar(endpoint, time.perf_counter() - inicio, erro=True)
+            return None
+        # check_follow responde 500 quando não segue; não é uma falha do servidor
+        erro = resposta.status_code >= 500 and endpoint != "/check_follow"
+        self.medidor.registar(endpoint, time.perf_counter() - inicio, erro)
+        return resposta
+
+
+def json_ou_vazio(resposta):
+    if resposta is None or resposta.status_code not in (200, 201):
+        return {}
+    try:
+        return resposta.json()
+    except ValueError:
+        return {}
+
+
+# Preparação dos dados
+
+def preparar(url, n_utilizadores, receitas_por_utilizador, prefixo):
+    """Cria os utilizadores, receitas, seguidores e receitas guardadas usados no teste."""
+    cliente = Cliente(url, Medidor())
+    nomes = [f"{prefixo}{i}" for i in range(n_utilizadores)]
+    receitas = {}
+
+    def criar(nome):
+        cliente.post("/add_user", {"username": nome, "password": PASSWORD})
+        ids = json_ou_vazio(cliente.post("/list_recipes", {"username": nome})).get("recipes", [])
+        for i in range(len(ids), receitas_por_utilizador):
+            cliente.post("/add_recipe", {
+                "username": nome,
+                "titulo": f"Receita {i} de {nome}",
+                "ingredientes": ", ".join(random.sample(INGREDIENTES, 5)),
+                "passos": "Misturar, Cozinhar, Servir",
+            })
+        return nome, json_ou_vazio(cliente.post("/list_recipes", {"username": nome})).get("recipes", [])
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        receitas.update(executor.map(criar, nomes))
+
+    rng = random.Random(1)
+    todas = [recipe_id for ids in receitas.values() for recipe_id in ids]
+    for nome in nomes:
+        guardadas = json_ou_vazio(cliente.post("/list_saved_recipes", {"username": nome})).get("saved_recipes", [])
+        for recipe_id in rng.sample(todas, min(len(todas), 20 - len(guardadas))) if len(guardadas) < 20 else []:
+            cliente.post("/save_recipe", {"username": nome, "recipe_id": recipe_id})
+        for outro in rng.sample(nomes, min(len(nomes), 5)):
+            if outro != nome:
+                cliente.post("/follow", {"follower_username": nome, "followed_username": outro})
+    return nomes, receitas
+
+
+INGREDIENTES = [
+    "ovo", "farinha", "leite", "açúcar", "sal", "azeite", "alho", "cebola", "tomate", "arroz",
+    "massa", "frango", "bacalhau", "batata", "cenoura", "manteiga", "queijo", "natas", "limão", "salsa",
+]
+
+
+# Percurso de um utilizador virtual
+
+class UtilizadorVirtual:
+    def __init__(self, url, medidor, nome, nomes, receitas, pausa, semente):
+        self.cliente = Cliente(url, medidor)
+        self.nome = nome
+        self.nomes = nomes
+        self.minhas_receitas = receitas.get(nome, [])
+        self.pausa = pausa
+        self.rng = random.Random(semente)
+        self.cursor_notifs = 0  # Maior id de notificação já recebido
+
+    def pensar(self):
+        if self.pausa:
+            time.sleep(self.rng.uniform(0, 2 * self.pausa))
+
+    def sessao(self):
+        self.login()
+        self.pesquisar()
+        self.abrir_receitas("/list_recipes", "recipes")
+        self.abrir_receitas("/list_saved_recipes", "saved_recipes")
+        self.seguir()
+        self.editar_receita()
+        self.notificacoes()
+
+    def login(self):
+        self.cliente.post("/login", {"username": self.nome, "password": PASSWORD})
+        # O cliente carrega quem o utilizador segue uma vez e responde aos botões Follow da memória
+        self.cliente.post("/list_following", {"username": self.nome})
+        self.pensar()
+
+    def pesquisar(self):
+        # Com o debounce do cliente só saem pedidos quando a escrita pára: 2 ou 3 por pesquisa
+        alvo = self.rng.choice(self.nomes)
+        for tamanho in sorted(self.rng.sample(range(1, len(alvo) + 1), min(3, len(alvo)))):
+            ids = json_ou_vazio(self.cliente.post("/search", {"search": alvo[:tamanho]})).get("user_ids", [])
+        for user_id in ids[:20]:  # A página mostra o username de cada resultado
+            self.cliente.post("/get_user", {"user_id": user_id})
+        self.pensar()
+
+    def abrir_receitas(self, endpoint, campo):
+        cursor, paginas = None, 0
+        while paginas < 2:  # Primeira página e um scroll
+            payload = {"username": self.nome, "limit": PAGE_SIZE}
+            if cursor is not None:
+                payload["cursor"] = cursor
+            dados = json_ou_vazio(self.cliente.post(endpoint, payload))
+            ids = dados.get(campo, [])
+            if ids:
+                self.cliente.post("/get_recipes", {"ids": ids, "etags": {}})
+            cursor, paginas = dados.get("next_cursor"), paginas + 1
+            if cursor is None:
+                break
+        self.pensar()
+
+    def seguir(self):
+        outro = self.rng.choice(self.nomes)
+        if outro != self.nome:
+            payload = {"follower_username": self.nome, "followed_username": outro}
+            self.cliente.post("/unfollow", payload)
+            self.cliente.post("/follow", payload)
+            self.cliente.post("/count_followers", {"followed_username": outro})
+        self.pensar()
+
+    def editar_receita(self):
+        if not self.minhas_receitas:
+            return
+        recipe_id = self.rng.choice(self.minhas_receitas)
+        self.cliente.post("/edit_recipe", {
+            "id": recipe_id,
+            "titulo": "Editada " + "".join(self.rng.choices(string.ascii_lowercase, k=6)),
+            "ingredientes": ", ".join(self.rng.sample(INGREDIENTES, 5)),
+            "passos": "Misturar, Cozinhar, Servir",
+        })
+        self.pensar()
+
+    def notificacoes(self):
+        # Como o cliente ao religar o WebSocket: só as notificações depois da última que já recebeu
+        resposta = json_ou_vazio(self.cliente.post("/notifications_since", {"username": self.nome, "cursor": self.cursor_notifs}))
+        for notificacao in resposta.get("notifications", []):
+            self.cursor_notifs = max(self.cursor_notifs, notificacao["id"])
+        self.pensar()
+
+
+# Resultados
+
+def percentil(ordenados, p):
+    """Percentil pelo método do rank mais próximo (ordenados tem de estar ordenado)."""
+    if not ordenados:
+        return 0.0
+    rank = max(1, int(round(p / 100 * len(ordenados) + 0.5)))
+    return ordenados[min(rank, len(ordenados)) - 1]
+
+
+def resumir(medidor, duracao):
+    endpoints = {}
+    for endpoint, latencias in sorted(medidor.latencias.items()):
+        ordenados = sorted(latencias)
+        endpoints[endpoint] = {
+            "requests": len(ordenados),
+            "errors": medidor.erros.get(endpoint, 0),
+            "rps": len(ordenados) / duracao,
+            "mean_ms": 1000 * sum(ordenados) / len(ordenados),
+            "p50_ms": 1000 * percentil(ordenados, 50),
+            "p95_ms": 1000 * percentil(ordenados, 95),
+            "p99_ms": 1000 * percentil(ordenados, 99),
+            "max_ms": 1000 * ordenados[-1],
+        }
+    total = sum(e["requests"] for e in endpoints.values())
+    return {
+        "total": {
+            "requests": total,
+            "errors": sum(e["errors"] for e in endpoints.values()),
+            "rps": total / duracao,
+        },
+        "endpoints": endpoints,
+    }
+
+
+def commit_atual():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def mostrar(resultado):
+    print(f"\n{'endpoint':<22}{'pedidos':>9}{'erros':>7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for endpoint, e in resultado["endpoints"].items():
+        print(
+            f"{endpoint:<22}{e['requests']:>9}{e['errors']:>7}{e['rps']:>9.1f}"
+            f"{e['p50_ms']:>9.1f}{e['p95_ms']:>9.1f}{e['p99_ms']:>9.1f}{e['max_ms']:>9.1f}"
+        )
+    total = resultado["total"]
+    print(f"\nTotal: {total['requests']} pedidos, {total['errors']} erros, {total['rps']:.1f} req/s")
+
+
+def comparar(resultado, base, tolerancia, minimo_ms):
+    """Mostra a variação face a uma execução anterior e devolve os endpoints que pioraram."""
+    pioraram = []
+    print(f"\n{'endpoint':<22}{'p95 antes':>11}{'p95 agora':>11}{'Δ p95':>9}{'req/s Δ':>9}")
+    for endpoint, agora in resultado["endpoints"].items():
+        antes = base["endpoints"].get(endpoint)
+        if not antes:
+            continue
+        delta_p95 = (agora["p95_ms"] - antes["p95_ms"]) / antes["p95_ms"] if antes["p95_ms"] else 0.0
+        delta_rps = (agora["rps"] - antes["rps"]) / antes["rps"] if antes["rps"] else 0.0
+        marca = ""
+        # Abaixo de minimo_ms a diferença é ruído de escalonamento, não uma regressão
+        piorou_p95 = delta_p95 > tolerancia and agora["p95_ms"] - antes["p95_ms"] > minimo_ms
+        if piorou_p95 or agora["errors"] > antes["errors"]:
+            pioraram.append(endpoint)
+            marca = "  <-- pior"
+        print(f"{endpoint:<22}{antes['p95_ms']:>11.1f}{agora['p95_ms']:>11.1f}{delta_p95:>+9.0%}{delta_rps:>+9.0%}{marca}")
+    return pioraram
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga da API do LetHimCook")
+    parser.add_argument("--url", default="http://127.0.0.1:18080")
+    parser.add_argument("--users", type=int, default=20, help="utilizadores virtuais em simultâneo")
+    parser.add_argument("--duration", type=float, default=30, help="segundos de medição")
+    parser.add_argument("--warmup", type=float, default=5, help="segundos iniciais que não contam")
+    parser.add_argument("--think-time", type=float, default=0.0, help="pausa média entre passos, em segundos")
+    parser.add_argument("--recipes", type=int, default=60, help="receitas criadas por utilizador")
+    parser.add_argument("--prefix", default="bench_", help="prefixo dos utilizadores de teste")
+    parser.add_argument("--output", help="ficheiro JSON onde guardar os resultados")
+    parser.add_argument("--baseline", help="resultados anteriores (JSON) para comparar")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="aumento de p95 tolerado face à baseline")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="aumento de p95 ignorado por ser ruído")
+    args = parser.parse_args()
+
+    print(f"A preparar {args.users} utilizadores com {args.recipes} receitas cada...")
+    nomes, receitas = preparar(args.url, args.users, args.recipes, args.prefix)
+
+    medidor = Medidor()
+    fim = threading.Event()
+    sessoes = defaultdict(int)
+
+    def correr(i):
+        vu = UtilizadorVirtual(args.url, medidor, nomes[i], nomes, receitas, args.think_time, semente=i)
+        while not fim.is_set():
+            vu.sessao()
+            if medidor.ativo:
+                sessoes[i] += 1
+
+    print(f"A correr {args.users} utilizadores virtuais durante {args.warmup:g}+{args.duration:g} s...")
+    threads = [threading.Thread(target=correr, args=(i,), daemon=True) for i in range(args.users)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.warmup)
+    medidor.ativo = True
+    inicio = time.perf_counter()
+    time.sleep(args.duration)
+    medidor.ativo = False
+    duracao = time.perf_counter() - inicio
+    fim.set()
+    for thread in threads:
+        thread.join(timeout=30)
+
+    resultado = resumir(medidor, duracao)
+    resultado["total"]["sessions"] = sum(sessoes.values())
+    resultado["meta"] = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit_atual(),
+        "url": args.url,
+        "users": args.users,
+        "duration_s": duracao,
+        "think_time_s": args.think_time,
+        "recipes_per_user": args.recipes,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+    mostrar(resultado)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(resultado, f, indent=2, sort_keys=True)
+        print(f"Resultados guardados em {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            base = json.load(f)
+        pioraram = comparar(resultado, base, args.tolerance, args.min_delta_ms)
+        if pioraram:
+            print(f"\nPioraram: {', '.join(pioraram)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1063 @@
+"""Servidor de referência da API do LetHimCook, em Python e só com a biblioteca padrão.
+
+Implementa as mesmas rotas (e respostas) que o server.cpp sobre o mesmo esquema
+do users.db, para testar e medir o cliente numa máquina Linux sem o Crow.
+Cada thread do servidor tem a sua ligação ao SQLite e a base de dados usa WAL,
+por isso leituras concorrentes não bloqueiam umas às outras.
+
+Diferenças em relação ao server.cpp:
+  - ids novos são atribuídos pelo SQLite em vez de aleatórios entre 1 e 9999;
+  - tem /status (GET) e /change_password, que o cliente usa;
+  - /ws/notifications implementa só o que o cliente usa do WebSocket (texto, ping e fecho);
+  - /download_image só serve ficheiros dentro de images/.
+
+Uso: python reference_server.py --db users.db --port 18080
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import re
+import secrets
+import sqlite3
+import struct
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+MAX_BATCH_IDS = 500  # Como em server.cpp: máximo de ids num pedido em lote
+MAX_PAGE_SIZE = 500  # Tamanho máximo de uma página em /list_recipes e /list_saved_recipes
+SEARCH_PAGE_SIZE = 50  # Resultados por página em /search_recipes quando não vem "limit"
+MAX_INGREDIENTES_PESQUISA = 30  # Ingredientes considerados num pedido a /cook_with
+NOTIFS_PAGE_SIZE = 100  # Notificações por página em /notifications_since quando não vem "limit"
+
+# Igual ao server.cpp: palavras que não identificam um ingrediente ("200 g de farinha" -> "farinha")
+PALAVRAS_IGNORADAS = {
+    "a", "o", "e", "de", "da", "do", "das", "dos", "com", "q", "b", "qb",
+    "g", "gr", "kg", "mg", "ml", "cl", "dl", "l", "colher", "colheres", "cha", "sopa", "sobremesa",
+    "chavena", "chavenas", "pitada", "pitadas", "dente", "dentes", "lata", "latas", "pacote", "fatia", "fatias",
+    "of", "and", "cup", "cups", "tbsp", "tsp", "oz", "lb", "lbs", "pinch", "clove", "cloves", "can", "slice", "slices",
+}
+
+# Minúsculas ASCII e letras U+00C0-U+00FF sem acento, com a mesma tabela que o server.cpp ('?' fica como está)
+_SEM_ACENTO = "aaaaaa?ceeeeiiii?nooooo?ouuuuy??aaaaaa?ceeeeiiii?nooooo?ouuuuy?y"
+_SIMPLIFICAR = str.maketrans(
+    {**{chr(0xC0 + i): letra for i, letra in enumerate(_SEM_ACENTO) if letra != "?"},
+     **{chr(c): chr(c + 32) for c in range(ord("A"), ord("Z") + 1)}}
+)
+MAX_UPLOAD_CHUNK = 4 * 1024 * 1024
+MAX_UPLOAD_SIZE = 50 * 1024 * 1024
+
+DADOS_INVALIDOS = "Erro: Dados inválidos."
+
+# Mesmo esquema que o server.cpp cria
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    profile_pic TEXT,
+    banner TEXT,
+    username TEXT NOT NULL UNIQUE,
+    password TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS receitas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    titulo TEXT NOT NULL,
+    ingredientes TEXT NOT NULL,
+    passos TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    image TEXT,
+    FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE);
+CREATE INDEX IF NOT EXISTS idx_receitas_user ON receitas(user_id, id);
+CREATE TABLE IF NOT EXISTS saved_recipes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    recipe_id INTEGER NOT NULL,
+    FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY(recipe_id) REFERENCES receitas(id) ON DELETE CASCADE);
+CREATE INDEX IF NOT EXISTS idx_saved_recipes_user ON saved_recipes(user_id, id);
+CREATE TABLE IF NOT EXISTS followers (
+    follower_id INTEGER NOT NULL,
+    followed_id INTEGER NOT NULL,
+    PRIMARY KEY (follower_id, followed_id),
+    FOREIGN KEY(followed_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY(follower_id) REFERENCES users(id) ON DELETE CASCADE);
+CREATE TABLE IF NOT EXISTS meal_planner (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    recipe_id INTEGER NOT NULL,
+    meal_type TEXT NOT NULL,
+    day_of_week TEXT NOT NULL,
+    FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY(recipe_id) REFERENCES receitas(id) ON DELETE CASCADE);
+CREATE INDEX IF NOT EXISTS idx_meal_planner_user ON meal_planner(user_id);
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    origin_user_id INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY(origin_user_id) REFERENCES users(id) ON DELETE CASCADE);
+CREATE INDEX IF NOT EXISTS idx_notifications_user ON notifications(user_id, id);
+CREATE TABLE IF NOT EXISTS receita_ingredientes (
+    ingrediente TEXT NOT NULL,
+    recipe_id INTEGER NOT NULL,
+    canonico TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (ingrediente, recipe_id, canonico)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_receita_ingredientes_receita ON receita_ingredientes(recipe_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS receitas_fts USING fts5(
+    titulo, ingredientes, passos,
+    content='receitas', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3');
+CREATE TRIGGER IF NOT EXISTS receitas_fts_insert AFTER INSERT ON receitas BEGIN
+    INSERT INTO receitas_fts(rowid, titulo, ingredientes, passos) VALUES (new.id, new.titulo, new.ingredientes, new.passos);
+END;
+CREATE TRIGGER IF NOT EXISTS receitas_fts_delete AFTER DELETE ON receitas BEGIN
+    INSERT INTO receitas_fts(receitas_fts, rowid, titulo, ingredientes, passos) VALUES ('delete', old.id, old.titulo, old.ingredientes, old.passos);
+END;
+CREATE TRIGGER IF NOT EXISTS receitas_fts_update AFTER UPDATE OF titulo, ingredientes, passos ON receitas BEGIN
+    INSERT INTO receitas_fts(receitas_fts, rowid, titulo, ingredientes, passos) VALUES ('delete', old.id, old.titulo, old.ingredientes, old.passos);
+    INSERT INTO receitas_fts(rowid, titulo, ingredientes, passos) VALUES (new.id, new.titulo, new.ingredientes, new.passos);
+END;
+"""
+
+# Só quando o índice de pesquisa é criado: indexa as receitas existentes e fixa os pesos do BM25
+INICIAR_PESQUISA = """
+INSERT INTO receitas_fts(receitas_fts) VALUES ('rebuild');
+INSERT INTO receitas_fts(receitas_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0)');
+"""
+
+
+class ErroPedido(Exception):
+    """Termina o pedido com este código e mensagem (como os crow::response de erro)."""
+
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+        self.mensagem = mensagem
+
+
+class Database:
+    """Acesso ao users.db com uma ligação por thread."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._local = threading.local()
+        ligacao = self.ligacao()
+        ligacao.execute("PRAGMA journal_mode=WAL;")
+        existia = ligacao.execute("SELECT 1 FROM sqlite_master WHERE name = 'receitas_fts';").fetchone()
+        existia_ingredientes = ligacao.execute("SELECT 1 FROM sqlite_master WHERE name = 'receita_ingredientes';").fetchone()
+        if existia_ingredientes and not any(
+            coluna[1] == "canonico" for coluna in ligacao.execute("PRAGMA table_info(receita_ingredientes);")
+        ):  # Índice de uma versão anterior, sem o ingrediente de cada termo: é refeito
+            ligacao.execute("DROP TABLE receita_ingredientes;")
+            existia_ingredientes = None
+        ligacao.executescript(ESQUEMA)
+        if not existia:
+            ligacao.executescript(INICIAR_PESQUISA)
+        if not existia_ingredientes:  # Indexa as receitas que já existiam antes do índice
+            with self.transacao():
+                for recipe_id, ingredientes in self.todos("SELECT id, ingredientes FROM receitas;"):
+                    self.indexar_ingredientes(recipe_id, ingredientes)
+
+    def ligacao(self):
+        ligacao = getattr(self._local, "ligacao", None)
+        if ligacao is None:
+            ligacao = sqlite3.connect(self.caminho, isolation_level=None)  # autocommit, como o server.cpp
+            ligacao.execute("PRAGMA busy_timeout = 5000;")
+            ligacao.execute("PRAGMA synchronous = NORMAL;")  # Seguro em WAL e muito mais rápido que FULL
+            self._local.ligacao = ligacao
+        return ligacao
+
+    def todos(self, sql, parametros=()):
+        return self.ligacao().execute(sql, parametros).fetchall()
+
+    def um(self, sql, parametros=()):
+        return self.ligacao().execute(sql, parametros).fetchone()
+
+    def executar(self, sql, parametros=()):
+        """Executa uma escrita e devolve o id da linha inserida."""
+        return self.ligacao().execute(sql, parametros).lastrowid
+
+    def transacao(self):
+        """Context manager para várias escritas atómicas."""
+        return _Transacao(self.ligacao())
+
+    def indexar_ingredientes(self, recipe_id, ingredientes):
+        """Atualiza o índice invertido de ingredientes de uma receita (como o Database::indexarIngredientes)."""
+        self.executar("DELETE FROM receita_ingredientes WHERE recipe_id = ?;", (recipe_id,))
+        canonicos = normalizar_ingredientes(ingredientes)
+        termos = set()  # (termo, ingrediente canónico a que pertence)
+        for canonico in canonicos:
+            termos.add((canonico, canonico))
+            if " " in canonico:  # "queijo feta" também é encontrado por "feta"
+                termos.update((palavra, canonico) for palavra in canonico.split() if len(palavra) >= 3)
+        self.ligacao().executemany(
+            "INSERT OR IGNORE INTO receita_ingredientes (ingrediente, recipe_id, canonico, total) VALUES (?, ?, ?, ?);",
+            [(termo, recipe_id, canonico, len(canonicos)) for termo, canonico in termos],
+        )
+
+    # Consultas usadas por várias rotas
+
+    def utilizador_id(self, username):
+        linha = self.um("SELECT id FROM users WHERE username = ?;", (username,))
+        return linha[0] if linha else None
+
+    def exigir_utilizador(self, username, status=404, mensagem="Erro: Utilizador não encontrado."):
+        user_id = self.utilizador_id(username)
+        if user_id is None:
+            raise ErroPedido(status, mensagem)
+        return user_id
+
+    def receita_existe(self, recipe_id):
+        return self.um("SELECT 1 FROM receitas WHERE id = ?;", (recipe_id,)) is not None
+
+    def notificar(self, user_ids, origin_user_id, mensagem):
+        """Guarda a notificação para cada destinatário. Devolve [(user_id, notificação)] para enviar."""
+        if not user_ids:
+            return []
+        origin_username = self.um("SELECT username FROM users WHERE id = ?;", (origin_user_id,))[0]
+        criadas = []
+        for user_id in user_ids:
+            notificacao_id = self.executar(
+                "INSERT INTO notifications (user_id, origin_user_id, message) VALUES (?, ?, ?);",
+                (user_id, origin_user_id, mensagem),
+            )
+            criadas.append((user_id, {
+                "id": notificacao_id, "origin_user_id": origin_user_id,
+                "origin_username": origin_username, "message": mensagem,
+            }))
+        return criadas
+
+
+class _Transacao:
+    def __init__(self, ligacao):
+        self.ligacao = ligacao
+
+    def __enter__(self):
+        self.ligacao.execute("BEGIN IMMEDIATE;")
+        return self.ligacao
+
+    def __exit__(self, tipo, valor, traceback):
+        self.ligacao.execute("COMMIT;" if tipo is None else "ROLLBACK;")
+
+
+def calcular_etag(titulo, ingredientes, passos, image):
+    # Só tem de mudar quando o conteúdo muda; não precisa de coincidir com o do server.cpp
+    conteudo = "\x1f".join((titulo, ingredientes, passos, image or ""))
+    return hashlib.sha1(conteudo.encode()).hexdigest()[:16]
+
+
+def singular(palavra):
+    """Singular das formas mais comuns, com as regras do server.cpp."""
+    if len(palavra) > 3 and palavra.endswith(("oes", "aes")):
+        return palavra[:-3] + "ao"
+    if len(palavra) > 3 and palavra.endswith("zes"):
+        return palavra[:-2]
+    if len(palavra) > 3 and palavra.endswith("s") and not palavra.endswith("ss"):
+        return palavra[:-1]
+    return palavra
+
+
+def normalizar_ingrediente(texto):
+    """Forma canónica de um ingrediente ("200 g de Açúcar" -> "acucar"), igual ao server.cpp."""
+    palavras = re.findall(r"[0-9a-z\x80-\U0010ffff]+", texto.translate(_SIMPLIFICAR))
+    return " ".join(
+        singular(palavra) for palavra in palavras
+        if palavra not in PALAVRAS_IGNORADAS and not any(c.isdigit() for c in palavra if c < "\x80")
+    )
+
+
+def normalizar_ingredientes(texto):
+    """Ingredientes distintos, normalizados, de uma lista separada por vírgulas, ';' ou linhas."""
+    ingredientes = []
+    for parte in re.split(r"[,;\n]", texto):
+        canonico = normalizar_ingrediente(parte)
+        if canonico and canonico not in ingredientes:
+            ingredientes.append(canonico)
+    return ingredientes
+
+
+def consulta_pesquisa(texto):
+    """Texto do utilizador como consulta FTS5: cada palavra entre aspas e como prefixo (igual ao server.cpp)."""
+    return " ".join(f'"{palavra}"*' for palavra in re.findall(r"[0-9A-Za-z\x80-\U0010ffff]+", texto))
+
+
+def exigir(body, *campos):
+    if not isinstance(body, dict) or any(campo not in body for campo in campos):
+        raise ErroPedido(400, DADOS_INVALIDOS)
+
+
+def pagina(body):
+    """(limite, cursor) de um pedido paginado, com os mesmos limites que o server.cpp."""
+    limite = max(1, min(int(body["limit"]), MAX_PAGE_SIZE))
+    cursor = body.get("cursor")
+    return limite, cursor if isinstance(cursor, int) else 0
+
+
+# Tabela de rotas: caminho -> função(servidor, body) que devolve (status, dict ou texto)
+ROTAS = {}
+
+
+def rota(caminho, binario=False):
+    """Regista uma rota POST. Com binario=True a função recebe o corpo em bytes e os parâmetros do URL."""
+    def registar(funcao):
+        funcao.binario = binario
+        ROTAS[caminho] = funcao
+        return funcao
+    return registar
+
+
+# Utilizadores
+
+@rota("/add_user")
+def add_user(servidor, body):
+    exigir(body, "username", "password")
+    username, password = body["username"], body["password"]
+    if not username or not password:
+        raise ErroPedido(400, "Erro: Nome de utilizador ou senha não pode ser vazio.")
+    if servidor.db.utilizador_id(username) is not None:
+        raise ErroPedido(400, "Erro: Nome de utilizador já está em uso.")
+    user_id = servidor.db.executar("INSERT INTO users (username, password) VALUES (?, ?);", (username, password))
+    return 201, f"Utilizador criado com sucesso! ID: {user_id}"
+
+
+@rota("/login")
+def login(servidor, body):
+    exigir(body, "username", "password")
+    username, password = body["username"], body["password"]
+    if not username or not password:
+        raise ErroPedido(400, "Erro: Nome de user ou senha não pode ser vazio.")
+    servidor.db.exigir_utilizador(username, mensagem="Erro: user não encontrado.")
+    if servidor.db.um("SELECT 1 FROM users WHERE username = ? AND password = ?;", (username, password)):
+        return 200, {"message": "Login bem-sucedido!"}
+    raise ErroPedido(401, "Erro: Palavra-passe incorreta.")
+
+
+@rota("/delete_user")
+def delete_user(servidor, body):
+    exigir(body, "username", "password")
+    servidor.db.exigir_utilizador(body["username"], mensagem="Erro: User não encontrado.")
+    if not servidor.db.um(
+        "SELECT 1 FROM users WHERE username = ? AND password = ?;", (body["username"], body["password"])
+    ):
+        raise ErroPedido(401, "Erro: Palavra-passe incorreta.")
+    servidor.db.executar("DELETE FROM users WHERE username = ? AND password = ?;", (body["username"], body["password"]))
+    return 200, "User excluído com sucesso."
+
+
+@rota("/change_password")
+def change_password(servidor, body):
+    exigir(body, "username", "current_password", "new_password")
+    servidor.db.exigir_utilizador(body["username"])
+    if not body["new_password"]:
+        raise ErroPedido(400, "Erro: Palavra-passe não pode ser vazia.")
+    if not servidor.db.um(
+        "SELECT 1 FROM users WHERE username = ? AND password = ?;", (body["username"], body["current_password"])
+    ):
+        raise ErroPedido(401, "Erro: Palavra-passe incorreta.")
+    servidor.db.executar("UPDATE users SET password = ? WHERE username = ?;", (body["new_password"], body["username"]))
+    return 200, "Palavra-passe alterada com sucesso."
+
+
+@rota("/get_user")
+def get_user(servidor, body):
+    exigir(body, "user_id")
+    linha = servidor.db.um("SELECT username FROM users WHERE id = ?;", (body["user_id"],))
+    if linha is None:
+        raise ErroPedido(404, "Erro: Utilizador não encontrado.")
+    return 200, {"username": linha[0]}
+
+
+@rota("/logout")
+def logout(servidor, body):
+    return 200, "Logout bem-sucedido."
+
+
+@rota("/search")
+def search(servidor, body):
+    exigir(body, "search")
+    linhas = servidor.db.todos("SELECT id FROM users WHERE username LIKE ?;", (f"%{body['search']}%",))
+    return 200, {"user_ids": [linha[0] for linha in linhas]}
+
+
+@rota("/search_recipes")
+def search_recipes(servidor, body):
+    exigir(body, "search")
+    limite = max(1, min(int(body["limit"]), MAX_PAGE_SIZE)) if "limit" in body else SEARCH_PAGE_SIZE
+    cursor = max(0, body["cursor"]) if isinstance(body.get("cursor"), int) else 0
+    consulta = consulta_pesquisa(str(body["search"]))
+    ids = []
+    if consulta:
+        linhas = servidor.db.todos(
+            "SELECT rowid FROM receitas_fts WHERE receitas_fts MATCH ? ORDER BY rank LIMIT ? OFFSET ?;",
+            (consulta, limite, cursor),
+        )
+        ids = [linha[0] for linha in linhas]
+    return 200, {"recipe_ids": ids, "next_cursor": cursor + limite if len(ids) == limite else None}
+
+
+@rota("/cook_with")
+def cook_with(servidor, body):
+    exigir(body, "ingredients")
+    limite = max(1, min(int(body["limit"]), MAX_PAGE_SIZE)) if "limit" in body else SEARCH_PAGE_SIZE
+    cursor = max(0, body["cursor"]) if isinstance(body.get("cursor"), int) else 0
+    ingredientes = normalizar_ingredientes(str(body["ingredients"]))[:MAX_INGREDIENTES_PESQUISA]
+    linhas = []
+    if ingredientes:
+        marcadores = ", ".join("?" * len(ingredientes))
+        linhas = servidor.db.todos(
+            # Cada ingrediente da receita conta uma vez, mesmo que vários termos o encontrem ("queijo", "feta")
+            "SELECT recipe_id, COUNT(DISTINCT canonico) AS encontrados, MAX(total) AS total FROM receita_ingredientes "
+            f"WHERE ingrediente IN ({marcadores}) GROUP BY recipe_id "
+            "ORDER BY encontrados DESC, total - encontrados ASC, recipe_id LIMIT ? OFFSET ?;",
+            (*ingredientes, limite, cursor),
+        )
+    return 200, {
+        "results": [{"id": recipe_id, "matched": encontrados, "total": total} for recipe_id, encontrados, total in linhas],
+        "ingredients": ingredientes,
+        "next_cursor": cursor + limite if len(linhas) == limite else None,
+    }
+
+
+@rota("/get_profile_images")
+def get_profile_images(servidor, body):
+    exigir(body, "username")
+    user_id = servidor.db.exigir_utilizador(body["username"])
+    profile_pic, banner = servidor.db.um("SELECT profile_pic, banner FROM users WHERE id = ?;", (user_id,))
+    return 200, {"profile_pic": profile_pic or "", "banner": banner or ""}
+
+
+# Receitas
+
+@rota("/add_recipe")
+def add_recipe(servidor, body):
+    exigir(body, "username", "titulo", "ingredientes", "passos")
+    db = servidor.db
+    user_id = db.exigir_utilizador(body["username"])
+    with db.transacao():
+        recipe_id = db.executar(
+            "INSERT INTO receitas (titulo, ingredientes, passos, user_id) VALUES (?, ?, ?, ?);",
+            (body["titulo"], body["ingredientes"], body["passos"], user_id),
+        )
+        db.indexar_ingredientes(recipe_id, body["ingredientes"])
+        seguidores = [linha[0] for linha in db.todos("SELECT follower_id FROM followers WHERE followed_id = ?;", (user_id,))]
+        criadas = db.notificar(seguidores, user_id, f"Este utilizador adicionou uma nova receita chamada: {body['titulo']}!")
+    servidor.enviar_notificacoes(criadas)
+    return 201, {"id": recipe_id, "mensagem": "Receita adicionada com sucesso!"}
+
+
+@rota("/edit_recipe")
+def edit_recipe(servidor, body):
+    exigir(body, "id", "titulo", "ingredientes", "passos")
+    db = servidor.db
+    dono = db.um("SELECT user_id FROM receitas WHERE id = ?;", (body["id"],))
+    if dono is None:
+        raise ErroPedido(400, "Erro: id de receita não existe.")
+    with db.transacao():
+        db.executar(
+            "UPDATE receitas SET titulo = ?, ingredientes = ?, passos = ? WHERE id = ?;",
+            (body["titulo"], body["ingredientes"], body["passos"], body["id"]),
+        )
+        db.indexar_ingredientes(body["id"], body["ingredientes"])
+        quem_guardou = [linha[0] for linha in db.todos("SELECT user_id FROM saved_recipes WHERE recipe_id = ?;", (body["id"],))]
+        criadas = db.notificar(quem_guardou, dono[0], f"Este utilizador editou a receita chamada: {body['titulo']}!")
+    servidor.enviar_notificacoes(criadas)
+    return 200, "Receita editada com sucesso."
+
+
+@rota("/delete_recipe")
+def delete_recipe(servidor, body):
+    exigir(body, "recipe_id", "username")
+    user_id = servidor.db.exigir_utilizador(body["username"])
+    if not servidor.db.receita_existe(body["recipe_id"]):
+        raise ErroPedido(404, "Erro: Receita não encontrada.")
+    with servidor.db.transacao() as ligacao:
+        apagada = ligacao.execute(
+            "DELETE FROM receitas WHERE id = ? AND user_id = ?;", (body["recipe_id"], user_id)
+        ).rowcount
+        if apagada:
+            ligacao.execute("DELETE FROM receita_ingredientes WHERE recipe_id = ?;", (body["recipe_id"],))
+    return 200, "Receita apagada com sucesso."
+
+
+@rota("/list_recipes")
+def list_recipes(servidor, body):
+    exigir(body, "username")
+    user_id = servidor.db.exigir_utilizador(body["username"])
+    if "limit" in body:
+        limite, cursor = pagina(body)
+        ids = [linha[0] for linha in servidor.db.todos(
+            "SELECT id FROM receitas WHERE user_id = ? AND id > ? ORDER BY id LIMIT ?;", (user_id, cursor, limite)
+        )]
+        return 200, {"recipes": ids, "next_cursor": ids[-1] if len(ids) == limite else None}
+    linhas = servidor.db.todos("SELECT id FROM receitas WHERE user_id = ?;", (user_id,))
+    return 200, {"recipes": [linha[0] for linha in linhas]}
+
+
+@rota("/get_recipe")
+def get_recipe(servidor, body):
+    exigir(body, "id")
+    linha = servidor.db.um("SELECT titulo, ingredientes, passos FROM receitas WHERE id = ?;", (body["id"],))
+    if linha is None:
+        raise ErroPedido(404, "Erro: Receita não encontrada.")
+    return 200, {"titulo": linha[0], "ingredientes": linha[1], "passos": linha[2]}
+
+
+@rota("/get_recipes")
+def get_recipes(servidor, body):
+    exigir(body, "ids")
+    ids = body["ids"]
+    if not isinstance(ids, list):
+        raise ErroPedido(400, DADOS_INVALIDOS)
+    if len(ids) > MAX_BATCH_IDS:
+        raise ErroPedido(400, f"Erro: Demasiados ids (máximo {MAX_BATCH_IDS}).")
+    etags = body.get("etags") if isinstance(body.get("etags"), dict) else {}
+
+    receitas, inalteradas = [], []
+    if ids:
+        marcadores = ", ".join("?" * len(ids))
+        linhas = servidor.db.todos(
+            f"SELECT id, titulo, ingredientes, passos, image FROM receitas WHERE id IN ({marcadores});", ids
+        )
+        for recipe_id, titulo, ingredientes, passos, image in linhas:
+            etag = calcular_etag(titulo, ingredientes, passos, image)
+            if etags.get(str(recipe_id)) == etag:
+                inalteradas.append(recipe_id)
+                continue
+            receitas.append({
+                "id": recipe_id,
+                "titulo": titulo,
+                "ingredientes": ingredientes,
+                "passos": passos,
+                "image": image or "",
+                "etag": etag,
+            })
+    return 200, {"recipes": receitas, "unchanged": inalteradas}
+
+
+@rota("/save_recipe")
+def save_recipe(servidor, body):
+    exigir(body, "username", "recipe_id")
+    user_id = servidor.db.exigir_utilizador(body["username"])
+    if not servidor.db.receita_existe(body["recipe_id"]):
+        raise ErroPedido(404, "Erro: Receita não encontrada.")
+    servidor.db.executar("INSERT INTO saved_recipes (user_id, recipe_id) VALUES (?, ?);", (user_id, body["recipe_id"]))
+    return 201, "Receita guardada com sucesso!"
+
+
+@rota("/list_saved_recipes")
+def list_saved_recipes(servidor, body):
+    exigir(body, "username")
+    user_id = servidor.db.exigir_utilizador(body["username"])
+    if "limit" in body:
+        limite, cursor = pagina(body)
+        linhas = servidor.db.todos(
+            "SELECT id, recipe_id FROM saved_recipes WHERE user_id = ? AND id > ? ORDER BY id LIMIT ?;",
+            (user_id, cursor, limite),
+        )
+        return 200, {
+            "saved_recipes": [linha[1] for linha in linhas],
+            "next_cursor": linhas[-1][0] if len(linhas) == limite else None,
+        }
+    linhas = servidor.db.todos("SELECT recipe_id FROM saved_recipes WHERE user_id = ?;", (user_id,))
+    return 200, {"saved_recipes": [linha[0] for linha in linhas]}
+
+
+# Seguidores
+
+def ids_seguidor_e_seguido(servidor, body):
+    exigir(body, "follower_username", "followed_username")
+    follower_id = servidor.db.utilizador_id(body["follower_username"])
+    followed_id = servidor.db.utilizador_id(body["followed_username"])
+    if follower_id is None or followed_id is None:
+        raise ErroPedido(404, "Erro: Utilizador não encontrado.")
+    return follower_id, followed_id
+
+
+@rota("/follow")
+def follow(servidor, body):
+    follower_id, followed_id = ids_seguidor_e_seguido(servidor, body)
+    try:
+        with servidor.db.transacao():
+            servidor.db.executar(
+                "INSERT INTO followers (follower_id, followed_id) VALUES (?, ?);", (follower_id, followed_id)
+            )
+            criadas = servidor.db.notificar([followed_id], follower_id, "Este utilizador começou a seguir-te!")
+    except sqlite3.IntegrityError:  # Já seguia: o server.cpp também falha aqui
+        raise ErroPedido(500, "Erro interno ao seguir utilizador.")
+    servidor.enviar_notificacoes(criadas)
+    return 200, "Seguiu utilizador com sucesso"
+
+
+@rota("/unfollow")
+def unfollow(servidor, body):
+    follower_id, followed_id = ids_seguidor_e_seguido(servidor, body)
+    servidor.db.executar("DELETE FROM followers WHERE follower_id = ? AND followed_id = ?;", (follower_id, followed_id))
+    return 200, "Deixou de seguir utilizador com sucesso"
+
+
+@rota("/count_followers")
+def count_followers(servidor, body):
+    exigir(body, "followed_username")
+    followed_id = servidor.db.exigir_utilizador(body["followed_username"])
+    n_followers = servidor.db.um("SELECT COUNT(*) FROM followers WHERE followed_id = ?;", (followed_id,))[0]
+    return 200, {"n_followers": n_followers}
+
+
+@rota("/check_follow")
+def check_follow(servidor, body):
+    follower_id, followed_id = ids_seguidor_e_seguido(servidor, body)
+    if servidor.db.um(
+        "SELECT 1 FROM followers WHERE followed_id = ? AND follower_id = ?;", (followed_id, follower_id)
+    ):
+        return 200, "Utilizador segue o outro"
+    # O server.cpp responde 500 quando não segue; o cliente conta com isso
+    raise ErroPedido(500, "Erro interno ao deixar de seguir utilizador.")
+
+
+@rota("/list_following")
+def list_following(servidor, body):
+    exigir(body, "username")
+    user_id = servidor.db.exigir_utilizador(body["username"])
+    linhas = servidor.db.todos(
+        "SELECT u.username FROM followers f JOIN users u ON u.id = f.followed_id WHERE f.follower_id = ?;", (user_id,)
+    )
+    return 200, {"following": [linha[0] for linha in linhas]}
+
+
+@rota("/check_follows")
+def check_follows(servidor, body):
+    exigir(body, "follower_username", "usernames")
+    usernames = body["usernames"]
+    if not isinstance(usernames, list):
+        raise ErroPedido(400, DADOS_INVALIDOS)
+    if len(usernames) > MAX_BATCH_IDS:
+        raise ErroPedido(400, f"Erro: Demasiados utilizadores (máximo {MAX_BATCH_IDS}).")
+    follower_id = servidor.db.exigir_utilizador(body["follower_username"])
+    linhas = []
+    if usernames:
+        marcadores = ", ".join("?" * len(usernames))
+        linhas = servidor.db.todos(
+            "SELECT u.username FROM followers f JOIN users u ON u.id = f.followed_id "
+            f"WHERE f.follower_id = ? AND u.username IN ({marcadores});",
+            (follower_id, *usernames),
+        )
+    return 200, {"following": [linha[0] for linha in linhas]}
+
+
+# Planeador de refeições
+
+def utilizador_do_planeador(servidor, body):
+    """O planeador aceita "user_id" ou "username"."""
+    if "user_id" in body:
+        return body["user_id"]
+    exigir(body, "username")
+    return servidor.db.exigir_utilizador(body["username"])
+
+
+@rota("/adicionar_refeicao")
+def adicionar_refeicao(servidor, body):
+    exigir(body, "recipe_id", "meal_type", "day_of_week")
+    servidor.db.executar(
+        "INSERT INTO meal_planner (user_id, recipe_id, meal_type, day_of_week) VALUES (?, ?, ?, ?);",
+        (utilizador_do_planeador(servidor, body), body["recipe_id"], body["meal_type"], body["day_of_week"]),
+    )
+    return 201, "Refeição adicionada com sucesso!"
+
+
+@rota("/remover_refeicao")
+def remover_refeicao(servidor, body):
+    exigir(body, "recipe_id", "day_of_week")
+    sql = "DELETE FROM meal_planner WHERE user_id = ? AND recipe_id = ? AND day_of_week = ?"
+    parametros = [utilizador_do_planeador(servidor, body), body["recipe_id"], body["day_of_week"]]
+    if "meal_type" in body:  # Sem meal_type sai de todas as refeições desse dia
+        sql += " AND meal_type = ?"
+        parametros.append(body["meal_type"])
+    servidor.db.executar(sql + ";", parametros)
+    return 200, "Refeição removida com sucesso!"
+
+
+@rota("/listar_refeicoes")
+def listar_refeicoes(servidor, body):
+    linhas = servidor.db.todos(
+        "SELECT id, recipe_id, meal_type, day_of_week FROM meal_planner WHERE user_id = ? ORDER BY id;",
+        (utilizador_do_planeador(servidor, body),),
+    )
+    return 200, {"refeicoes": [
+        {"id": linha[0], "recipe_id": linha[1], "meal_type": linha[2], "day_of_week": linha[3]} for linha in linhas
+    ]}
+
+
+# Notificações
+
+@rota("/get_notifications")
+def get_notifications(servidor, body):
+    exigir(body, "username")
+    user_id = servidor.db.exigir_utilizador(body["username"], status=400, mensagem="Erro: Utilizador não existe.")
+    linhas = servidor.db.todos("SELECT id FROM notifications WHERE user_id = ?;", (user_id,))
+    return 200, {"notifications": [linha[0] for linha in linhas]}
+
+
+@rota("/notifications_since")
+def notifications_since(servidor, body):
+    exigir(body, "username")
+    user_id = servidor.db.exigir_utilizador(body["username"], status=400, mensagem="Erro: Utilizador não existe.")
+    limite = max(1, min(int(body["limit"]), MAX_PAGE_SIZE)) if "limit" in body else NOTIFS_PAGE_SIZE
+    linhas = servidor.db.todos(
+        "SELECT n.id, n.origin_user_id, u.username, n.message FROM notifications n "
+        "JOIN users u ON u.id = n.origin_user_id WHERE n.user_id = ? AND n.id > ? ORDER BY n.id LIMIT ?;",
+        (user_id, int(body.get("cursor", 0)), limite),
+    )
+    notificacoes = [
+        {"id": linha[0], "origin_user_id": linha[1], "origin_username": linha[2], "message": linha[3]}
+        for linha in linhas
+    ]
+    return 200, {"notifications": notificacoes, "next_cursor": linhas[-1][0] if len(linhas) == limite else None}
+
+
+@rota("/get_notif")
+def get_notif(servidor, body):
+    exigir(body, "id")
+    linha = servidor.db.um("SELECT origin_user_id, message FROM notifications WHERE id = ?;", (body["id"],))
+    if linha is None:
+        raise ErroPedido(404, "Erro: Notificação não encontrada.")
+    return 200, {"origin_user_id": linha[0], "message": linha[1]}
+
+
+@rota("/read_notif")
+def read_notif(servidor, body):
+    exigir(body, "id")
+    if servidor.db.um("SELECT 1 FROM notifications WHERE id = ?;", (body["id"],)) is None:
+        raise ErroPedido(404, "Erro: Notificação não encontrada.")
+    servidor.db.executar("DELETE FROM notifications WHERE id = ?;", (body["id"],))
+    return 200, "Notificação apagada com sucesso"
+
+
+# Imagens
+
+def associar_imagem(servidor, body, caminho):
+    """Guarda o caminho na receita ('r'), foto de perfil ('p') ou banner ('b'), como em server.cpp."""
+    op = body.get("op") or ""
+    if op.startswith("r"):
+        if "id" not in body:
+            raise ErroPedido(400, "Erro: id não fornecido")
+        if not servidor.db.receita_existe(body["id"]):
+            raise ErroPedido(400, "Erro: id de receita não existe.")
+        servidor.db.executar("UPDATE receitas SET image = ? WHERE id = ?;", (caminho, body["id"]))
+    elif op.startswith(("p", "b")):
+        if "username" not in body:
+            raise ErroPedido(400, "Erro: username não fornecido")
+        user_id = servidor.db.exigir_utilizador(body["username"], status=400, mensagem="Erro: user não existe")
+        coluna = "profile_pic" if op.startswith("p") else "banner"
+        servidor.db.executar(f"UPDATE users SET {coluna} = ? WHERE id = ?;", (caminho, user_id))
+    return 200, "Imagem guardada com sucesso"
+
+
+@rota("/upload_image")
+def upload_image(servidor, body):
+    exigir(body, "image", "op")
+    try:
+        dados = base64.b64decode(body["image"], validate=True)
+    except ValueError:
+        raise ErroPedido(400, "Erro ao descodificar a imagem")
+    caminho = servidor.guardar_imagem(dados)
+    return associar_imagem(servidor, body, caminho)
+
+
+@rota("/download_image")
+def download_image(servidor, body):
+    exigir(body, "path")
+    caminho = servidor.caminho_imagem(body["path"])
+    if caminho is None or not os.path.isfile(caminho):
+        raise ErroPedido(404, "Ficheiro não encontrado!")
+    with open(caminho, "rb") as f:
+        return 200, f.read()
+
+
+UPLOAD_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+def caminho_upload(servidor, upload_id):
+    if not isinstance(upload_id, str) or not UPLOAD_ID.match(upload_id):
+        raise ErroPedido(404, "Erro: Upload não encontrado.")
+    caminho = os.path.join(servidor.pasta_uploads, upload_id + ".part")
+    if not os.path.exists(caminho):
+        raise ErroPedido(404, "Erro: Upload não encontrado.")
+    return caminho
+
+
+@rota("/upload_init")
+def upload_init(servidor, body):
+    exigir(body, "size")
+    if not 0 <= int(body["size"]) <= MAX_UPLOAD_SIZE:
+        raise ErroPedido(413, "Erro: Imagem demasiado grande.")
+    upload_id = secrets.token_hex(16)
+    with servidor.lock_uploads:
+        open(os.path.join(servidor.pasta_uploads, upload_id + ".part"), "wb").close()
+    return 200, {"upload_id": upload_id, "offset": 0}
+
+
+@rota("/upload_status")
+def upload_status(servidor, body):
+    exigir(body, "upload_id")
+    with servidor.lock_uploads:
+        return 200, {"offset": os.path.getsize(caminho_upload(servidor, body["upload_id"]))}
+
+
+@rota("/upload_chunk", binario=True)
+def upload_chunk(servidor, dados, parametros):
+    if "upload_id" not in parametros or "offset" not in parametros:
+        raise ErroPedido(400, DADOS_INVALIDOS)
+    if len(dados) > MAX_UPLOAD_CHUNK:
+        raise ErroPedido(413, "Erro: Parte demasiado grande.")
+    try:
+        offset = int(parametros["offset"])
+    except ValueError:
+        raise ErroPedido(400, "Erro: offset inválido.")
+
+    with servidor.lock_uploads:
+        caminho = caminho_upload(servidor, parametros["upload_id"])
+        atual = os.path.getsize(caminho)
+        if offset != atual:
+            return 409, {"offset": atual}
+        if atual + len(dados) > MAX_UPLOAD_SIZE:
+            raise ErroPedido(413, "Erro: Imagem demasiado grande.")
+        with open(caminho, "ab") as f:
+            f.write(dados)
+        return 200, {"offset": atual + len(dados)}
+
+
+@rota("/upload_finish")
+def upload_finish(servidor, body):
+    exigir(body, "upload_id", "op")
+    with servidor.lock_uploads:
+        parcial = caminho_upload(servidor, body["upload_id"])
+        caminho = servidor.novo_caminho_imagem()
+        os.replace(parcial, os.path.join(servidor.pasta_dados, caminho))
+    return associar_imagem(servidor, body, caminho)
+
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MAX_TRAMA_CLIENTE = 64 * 1024  # O cliente só envia pings e o fecho
+
+
+class LigacaoWebSocket:
+    """Lado do servidor de uma ligação WebSocket (RFC 6455), só com o que /ws/notifications usa."""
+
+    def __init__(self, rfile, wfile):
+        self.rfile = rfile
+        self.wfile = wfile
+        self.lock = threading.Lock()  # Escrevem a thread da ligação e as das rotas que notificam
+
+    def enviar(self, opcode, dados=b""):
+        tamanho = len(dados)
+        if tamanho < 126:
+            cabecalho = struct.pack("!BB", 0x80 | opcode, tamanho)
+        elif tamanho < 1 << 16:
+            cabecalho = struct.pack("!BBH", 0x80 | opcode, 126, tamanho)
+        else:
+            cabecalho = struct.pack("!BBQ", 0x80 | opcode, 127, tamanho)
+        with self.lock:
+            try:
+                self.wfile.write(cabecalho + dados)
+            except OSError:
+                pass  # A ligação caiu; a thread da ligação dá por isso ao ler
+
+    def enviar_texto(self, texto):
+        self.enviar(0x1, texto.encode())
+
+    def ler(self):
+        """Próxima trama do cliente como (opcode, dados), ou None se a ligação fechou."""
+        cabecalho = self.rfile.read(2)
+        if len(cabecalho) < 2:
+            return None
+        opcode, tamanho = cabecalho[0] & 0x0F, cabecalho[1] & 0x7F
+        if tamanho == 126:
+            tamanho = struct.unpack("!H", self.rfile.read(2))[0]
+        elif tamanho == 127:
+            tamanho = struct.unpack("!Q", self.rfile.read(8))[0]
+        if tamanho > MAX_TRAMA_CLIENTE:
+            return None
+        mascara = self.rfile.read(4) if cabecalho[1] & 0x80 else b"\0\0\0\0"
+        dados = self.rfile.read(tamanho)
+        if len(dados) < tamanho:
+            return None
+        return opcode, bytes(byte ^ mascara[i % 4] for i, byte in enumerate(dados))
+
+    def servir(self):
+        """Responde a pings até o cliente fechar a ligação."""
+        while True:
+            trama = self.ler()
+            if trama is None:
+                return
+            opcode, dados = trama
+            if opcode == 0x8:
+                self.enviar(0x8, dados[:2])
+                return
+            if opcode == 0x9:
+                self.enviar(0xA, dados)
+
+
+class ServidorReferencia(ThreadingHTTPServer):
+    daemon_threads = True
+    verbose = False
+
+    def __init__(self, endereco, caminho_db, pasta_dados):
+        self.db = Database(caminho_db)
+        self.pasta_dados = pasta_dados
+        self.pasta_uploads = os.path.join(pasta_dados, "uploads")
+        self.lock_uploads = threading.Lock()  # Protege file_counter.txt e os ficheiros parciais
+        self.lock_notificacoes = threading.Lock()  # Protege ligacoes_notificacoes
+        self.ligacoes_notificacoes = {}  # user_id -> LigacaoWebSocket abertas em /ws/notifications
+        os.makedirs(os.path.join(pasta_dados, "images"), exist_ok=True)
+        os.makedirs(self.pasta_uploads, exist_ok=True)
+        super().__init__(endereco, Pedido)
+
+    def enviar_notificacoes(self, criadas):
+        """Envia as notificações (já guardadas) pelas ligações abertas dos destinatários."""
+        with self.lock_notificacoes:
+            envios = [(list(self.ligacoes_notificacoes.get(user_id, ())), notificacao) for user_id, notificacao in criadas]
+        for ligacoes, notificacao in envios:
+            texto = json.dumps(notificacao)
+            for ligacao in ligacoes:
+                ligacao.enviar_texto(texto)
+
+    def servir_notificacoes(self, user_id, ligacao):
+        with self.lock_notificacoes:
+            self.ligacoes_notificacoes.setdefault(user_id, set()).add(ligacao)
+        try:
+            ligacao.servir()
+        finally:
+            with self.lock_notificacoes:
+                ligacoes = self.ligacoes_notificacoes[user_id]
+                ligacoes.discard(ligacao)
+                if not ligacoes:
+                    del self.ligacoes_notificacoes[user_id]
+
+    def novo_caminho_imagem(self):
+        """Próximo caminho livre em images/ (chamar com lock_uploads), com o mesmo contador que o server.cpp."""
+        contador_path = os.path.join(self.pasta_dados, "file_counter.txt")
+        try:
+            with open(contador_path) as f:
+                contador = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            contador = 0
+        with open(contador_path, "w") as f:
+            f.write(str(contador + 1))
+        return f"images/i_{contador}.jpg"
+
+    def guardar_imagem(self, dados):
+        with self.lock_uploads:
+            caminho = self.novo_caminho_imagem()
+        with open(os.path.join(self.pasta_dados, caminho), "wb") as f:
+            f.write(dados)
+        return caminho
+
+    def caminho_imagem(self, caminho):
+        """Caminho absoluto de uma imagem guardada, ou None se estiver fora de images/."""
+        pasta = os.path.realpath(os.path.join(self.pasta_dados, "images"))
+        absoluto = os.path.realpath(os.path.join(self.pasta_dados, caminho))
+        return absoluto if absoluto.startswith(pasta + os.sep) else None
+
+
+class Pedido(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Mantém as ligações abertas, como o Crow
+    # Cabeçalhos e corpo saem em escritas separadas; com Nagle cada resposta esperava ~40 ms pelo ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/status":
+            self.responder(200, "OK")
+        elif url.path == "/ws/notifications":
+            self.abrir_notificacoes(url)
+        else:
+            self.responder(404, "Not Found")
+
+    def abrir_notificacoes(self, url):
+        """Aceita o WebSocket de /ws/notifications?username=... e mantém-no até o cliente fechar."""
+        username = parse_qs(url.query).get("username", [None])[0]
+        user_id = self.server.db.utilizador_id(username) if username else None
+        chave = self.headers.get("Sec-WebSocket-Key")
+        if user_id is None or chave is None or (self.headers.get("Upgrade") or "").lower() != "websocket":
+            self.responder(400, "Erro: Pedido inválido.")
+            return
+
+        aceite = base64.b64encode(hashlib.sha1((chave + WS_GUID).encode()).digest()).decode()
+        self.send_response(101)
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", aceite)
+        self.end_headers()
+        self.server.servir_notificacoes(user_id, LigacaoWebSocket(self.rfile, self.wfile))
+        self.close_connection = True
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        tamanho = int(self.headers.get("Content-Length") or 0)
+        dados = self.rfile.read(tamanho)
+
+        funcao = ROTAS.get(url.path)
+        if funcao is None:
+            self.responder(404, "Not Found")
+            return
+
+        try:
+            if funcao.binario:
+                parametros = {chave: valores[0] for chave, valores in parse_qs(url.query).items()}
+                status, resposta = funcao(self.server, dados, parametros)
+            else:
+                try:
+                    body = json.loads(dados or b"null")
+                except ValueError:
+                    raise ErroPedido(400, DADOS_INVALIDOS)
+                status, resposta = funcao(self.server, body)
+        except ErroPedido as e:
+            status, resposta = e.status, e.mensagem
+        except (KeyError, TypeError, ValueError):
+            status, resposta = 400, DADOS_INVALIDOS
+        except Exception as e:
+            status, resposta = 500, f"Erro interno: {e}"
+        self.responder(status, resposta)
+
+    def responder(self, status, resposta):
+        if isinstance(resposta, (dict, list)):
+            corpo, tipo = json.dumps(resposta).encode(), "application/json"
+        elif isinstance(resposta, bytes):
+            corpo, tipo = resposta, "application/octet-stream"
+        else:
+            corpo, tipo = str(resposta).encode(), "text/plain; charset=utf-8"
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        if self.server.verbose:
+            super().log_message(formato, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de referência da API do LetHimCook")
+    parser.add_argument("--db", default="users.db", help="ficheiro SQLite (criado se não existir)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--data-dir", default=".", help="pasta com images/, uploads/ e file_counter.txt")
+    parser.add_argument("--verbose", action="store_true", help="mostra cada pedido")
+    args = parser.parse_args()
+
+    servidor = ServidorReferencia((args.host, args.port), args.db, args.data_dir)
+    servidor.verbose = args.verbose
+    print(f"Servidor de referência em http://{args.host}:{args.port} (db: {args.db})")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
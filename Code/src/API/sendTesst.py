@@ -1,14 +1,19 @@
-import requests
+import os
+import sys
 
-# Caminho da imagem a ser enviada
-image_path = "test.jpg"
+# Usa o mesmo módulo de upload que o cliente (Code/src/GUI/services/uploader.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "GUI"))
+from services.uploader import upload_image
 
-# URL do endpoint do servidor
-url = "http://127.0.0.1:18080/upload"
+# Caminho da imagem a ser enviada e receita a que fica associada
+image_path = sys.argv[1] if len(sys.argv) > 1 else "test.jpg"
+recipe_id = int(sys.argv[2]) if len(sys.argv) > 2 else 1
 
-# Abrindo a imagem e enviando via multipart/form-data
-with open(image_path, "rb") as img_file:
-    files = {"image": img_file}
-    response = requests.post(url, files=files)
 
-print(f"Resposta do servidor: {response.status_code}, {response.text}")
+def mostrar_progresso(enviados, total):
+    print(f"\r{enviados}/{total} bytes", end="", flush=True)
+
+
+# Envia por partes; se a ligação cair, correr outra vez retoma onde parou
+upload_image(image_path, "r", on_progress=mostrar_progresso, id=recipe_id)
+print("\nImagem enviada com sucesso")
@@ -3,13 +3,54 @@
 #include <iostream>
 #include <stdexcept>
 #include <unordered_map>
+#include <unordered_set>
 #include <string>
 #include <random>
 #include <memory>
 #include <fstream>
 #include <regex>
+#include <sstream>
+#include <functional>
+#include <mutex>
+#include <iomanip>
+#include <filesystem>
+#include <cctype>
+#include <algorithm>
+#include <cstring>
+#include <cstdint>
+#include <tuple>
 #include "base64.h"
 
+// Máximo de ids aceites num pedido em lote (abaixo do limite de parâmetros do SQLite)
+const size_t MAX_BATCH_IDS = 500;
+
+// Tamanho máximo de uma página em /list_recipes e /list_saved_recipes
+const int MAX_PAGE_SIZE = 500;
+const int SEARCH_PAGE_SIZE = 50;  // Resultados por página em /search_recipes quando não vem "limit"
+const int MAX_INGREDIENTES_PESQUISA = 30;  // Ingredientes considerados num pedido a /cook_with
+const int NOTIFS_PAGE_SIZE = 100;  // Notificações por página em /notifications_since quando não vem "limit"
+
+// Palavras que não identificam um ingrediente: unidades, quantidades e ligações ("200 g de farinha" -> "farinha")
+const std::unordered_set<std::string> PALAVRAS_IGNORADAS = {
+    "a", "o", "e", "de", "da", "do", "das", "dos", "com", "q", "b", "qb",
+    "g", "gr", "kg", "mg", "ml", "cl", "dl", "l", "colher", "colheres", "cha", "sopa", "sobremesa",
+    "chavena", "chavenas", "pitada", "pitadas", "dente", "dentes", "lata", "latas", "pacote", "fatia", "fatias",
+    "of", "and", "cup", "cups", "tbsp", "tsp", "oz", "lb", "lbs", "pinch", "clove", "cloves", "can", "slice", "slices",
+};
+
+// Uploads por partes: ficheiros parciais ficam em uploads/ até /upload_finish
+const std::string UPLOADS_DIR = "uploads";
+const size_t MAX_UPLOAD_CHUNK = 4 * 1024 * 1024;
+const uintmax_t MAX_UPLOAD_SIZE = 50 * 1024 * 1024;
+
+// ETag de uma receita: muda sempre que o conteúdo muda, permite ao cliente revalidar a cache
+std::string calcularEtag(const std::string& titulo, const std::string& ingredientes, const std::string& passos, const std::string& image)
+{
+    std::ostringstream etag;
+    etag << std::hex << std::hash<std::string>{}(titulo + '\x1f' + ingredientes + '\x1f' + passos + '\x1f' + image);
+    return etag.str();
+}
+
 // DataBase Class
 class Database {
 private:
@@ -26,6 +67,7 @@ public:
         criarTabelaReceitas();
         criarTabelaReceitasSalvas();
         criarTabelaSeguidores();
+        criarTabelaMealPlanner();
         criarTabelaNotifs();
     }
 
@@ -48,6 +90,17 @@ public:
         }
     }
 
+    void executarSql(const char* sql)
+    {
+        char* mensagemErro = nullptr;
+        if (sqlite3_exec(db.get(), sql, nullptr, nullptr, &mensagemErro) != SQLITE_OK)
+        {
+            std::string erro(mensagemErro);
+            sqlite3_free(mensagemErro);
+            throw std::runtime_error("Erro ao executar SQL: " + erro);
+        }
+    }
+
     bool utilizadorExiste(const std::string& username)
     {
         const std::string sql = "SELECT 1 FROM users WHERE username = ?;";
@@ -229,6 +282,29 @@ public:
         return true;
     }
 
+    // Caminhos da foto de perfil e do banner (vazios se o utilizador não tiver imagem)
+    std::pair<std::string, std::string> obterImagensPerfil(int user_id)
+    {
+        const std::string sql = "SELECT profile_pic, banner FROM users WHERE id = ?;";
+        sqlite3_stmt* stmt;
+
+        if (sqlite3_prepare_v2(db.get(), sql.c_str(), -1, &stmt, nullptr) != SQLITE_OK) throw std::runtime_error("Erro ao preparar consulta: " + std::string(sqlite3_errmsg(db.get())));
+
+        sqlite3_bind_int(stmt, 1, user_id);
+
+        std::pair<std::string, std::string> imagens;
+        if (sqlite3_step(stmt) == SQLITE_ROW)
+        {
+            const unsigned char* pfp = sqlite3_column_text(stmt, 0);
+            const unsigned char* banner = sqlite3_column_text(stmt, 1);
+            imagens.first = pfp ? reinterpret_cast<const char*>(pfp) : "";
+            imagens.second = banner ? reinterpret_cast<const char*>(banner) : "";
+        }
+
+        sqlite3_finalize(stmt);
+        return imagens;
+    }
+
     void criarTabelaReceitas()
     {
         const char* sql = "CREATE TABLE IF NOT EXISTS receitas ("
@@ -248,6 +324,319 @@ public:
             sqlite3_free(mensagemErro);
             throw std::runtime_error("Erro ao criar tabela de receitas: " + erro);
         }
+
+        // Índice para paginar as receitas de um utilizador sem percorrer a tabela
+        executarSql("CREATE INDEX IF NOT EXISTS idx_receitas_user ON receitas(user_id, id);");
+        criarIndicePesquisa();
+        criarIndiceIngredientes();
+    }
+
+    bool tabelaExiste(const std::string& nome)
+    {
+        const std::string sql = "SELECT 1 FROM sqlite_master WHERE name = ?;";
+        sqlite3_stmt* stmt;
+
+        if (sqlite3_prepare_v2(db.get(), sql.c_str(), -1, &stmt, nullptr) != SQLITE_OK) throw std::runtime_error("Erro ao preparar consulta: " + std::string(sqlite3_errmsg(db.get())));
+
+        sqlite3_bind_text(stmt, 1, nome.c_str(), -1, SQLITE_TRANSIENT);
+
+        bool existe = (sqlite3_step(stmt) == SQLITE_ROW);
+        sqlite3_finalize(stmt);
+        return existe;
+    }
+
+    bool colunaExiste(const std::string& tabela, const std::string& coluna)
+    {
+        // A consulta só compila se a coluna existir
+        const std::string sql = "SELECT " + coluna + " FROM " + tabela + " LIMIT 0;";
+        sqlite3_stmt* stmt;
+
+        bool existe = (sqlite3_prepare_v2(db.get(), sql.c_str(), -1, &stmt, nullptr) == SQLITE_OK);
+        sqlite3_finalize(stmt);
+        return existe;
+    }
+
+    // Índice de texto integral (FTS5) sobre titulo/ingredientes/passos, atualizado pelos triggers.
+    // Guarda só o índice: o texto continua em receitas (content='receitas').
+    void criarIndicePesquisa()
+    {
+        bool existia = tabelaExiste("receitas_fts");
+
+        executarSql(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS receitas_fts USING fts5("
+            "titulo, ingredientes, passos, "
+            "content='receitas', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2', "  // "acucar" encontra "açúcar"
+            "prefix='2 3');");  // Pesquisas por prefixo enquanto se escreve sem percorrer o índice todo
+
+        executarSql(
+            "CREATE TRIGGER IF NOT EXISTS receitas_fts_insert AFTER INSERT ON receitas BEGIN "
+            "INSERT INTO receitas_fts(rowid, titulo, ingredientes, passos) VALUES (new.id, new.titulo, new.ingredientes, new.passos); "
+            "END;");
+        executarSql(
+            "CREATE TRIGGER IF NOT EXISTS receitas_fts_delete AFTER DELETE ON receitas BEGIN "
+            "INSERT INTO receitas_fts(receitas_fts, rowid, titulo, ingredientes, passos) VALUES ('delete', old.id, old.titulo, old.ingredientes, old.passos); "
+            "END;");
+        executarSql(
+            "CREATE TRIGGER IF NOT EXISTS receitas_fts_update AFTER UPDATE OF titulo, ingredientes, passos ON receitas BEGIN "
+            "INSERT INTO receitas_fts(receitas_fts, rowid, titulo, ingredientes, passos) VALUES ('delete', old.id, old.titulo, old.ingredientes, old.passos); "
+            "INSERT INTO receitas_fts(rowid, titulo, ingredientes, passos) VALUES (new.id, new.titulo, new.ingredientes, new.passos); "
+            "END;");
+
+        if (!existia)
+        {
+            // Indexa as receitas que já existiam antes do índice
+            executarSql("INSERT INTO receitas_fts(receitas_fts) VALUES ('rebuild');");
+            // BM25 com mais peso no título e nos ingredientes; "ORDER BY rank" usa estes pesos
+            executarSql("INSERT INTO receitas_fts(receitas_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0)');");
+        }
+    }
+
+    // Índice invertido ingrediente -> receitas, para pesquisar pelo que se tem em casa.
+    // Cada ingrediente é guardado na forma canónica (normalizarIngrediente) e, se tiver
+    // várias palavras, também cada palavra ("queijo feta" é encontrado por "feta").
+    // "canonico" é o ingrediente a que o termo pertence, para o contar uma só vez.
+    // "total" é o número de ingredientes da receita, para ordenar pelos que faltam.
+    void criarIndiceIngredientes()
+    {
+        bool existia = tabelaExiste("receita_ingredientes");
+        if (existia && !colunaExiste("receita_ingredientes", "canonico"))
+        {
+            // Índice de uma versão anterior, sem o ingrediente de cada termo: é refeito
+            executarSql("DROP TABLE receita_ingredientes;");
+            existia = false;
+        }
+
+        executarSql(
+            "CREATE TABLE IF NOT EXISTS receita_ingredientes ("
+            "ingrediente TEXT NOT NULL, "
+            "recipe_id INTEGER NOT NULL, "
+            "canonico TEXT NOT NULL, "
+            "total INTEGER NOT NULL, "
+            "PRIMARY KEY (ingrediente, recipe_id, canonico)) WITHOUT ROWID;");
+        executarSql("CREATE INDEX IF NOT EXISTS idx_receita_ingredientes_receita ON receita_ingredientes(recipe_id);");
+
+        if (!existia)
+        {
+            // Indexa as receitas que já existiam antes do índice
+            sqlite3_stmt* stmt;
+            if (sqlite3_prepare_v2(db.get(), "SELECT id, ingredientes FROM receitas;", -1, &stmt, nullptr) != SQLITE_OK) throw std::runtime_error("Erro ao preparar consulta: " + std::string(sqlite3_errmsg(db.get())));
+
+            std::vector<std::pair<int, std::string>> receitas;
+            while (sqlite3_step(stmt) == SQLITE_ROW)
+                receitas.emplace_back(sqlite3_column_int(stmt, 0), reinterpret_cast<const char*>(sqlite3_column_text(stmt, 1)));
+            sqlite3_finalize(stmt);
+
+            executarSql("BEGIN;");
+            for (const auto& receita : receitas) indexarIngredientes(receita.first, receita.second);
+            executarSql("COMMIT;");
+        }
+    }
+
+    // Forma canónica de um ingrediente: minúsculas, sem acentos, sem quantidades nem unidades,
+    // palavras no singular ("200 g de Açúcar" -> "acucar", "Ovos" -> "ovo", "eggs" -> "egg").
+    // O reference_server.py usa as mesmas regras.
+    static std::string normalizarIngrediente(const std::string& texto)
+    {
+        // Letras latinas U+00C0-U+00FF (C3 80-BF em UTF-8) sem acento; '?' fica como está
+        static const char* SEM_ACENTO = "aaaaaa?ceeeeiiii?nooooo?ouuuuy??aaaaaa?ceeeeiiii?nooooo?ouuuuy?y";
+
+        std::vector<std::string> palavras;
+        std::string palavra;
+        auto fecharPalavra = [&]()
+        {
+            bool temDigito = std::any_of(palavra.begin(), palavra.end(), [](unsigned char c) { return std::isdigit(c); });
+            if (!palavra.empty() && !temDigito && !PALAVRAS_IGNORADAS.count(palavra))
+            {
+                palavras.push_back(singular(palavra));
+            }
+            palavra.clear();
+        };
+
+        for (size_t i = 0; i < texto.size(); i++)
+        {
+            unsigned char c = texto[i];
+            if (c == 0xC3 && i + 1 < texto.size())
+            {
+                unsigned char seguinte = texto[i + 1];
+                if (seguinte >= 0x80 && seguinte <= 0xBF && SEM_ACENTO[seguinte - 0x80] != '?')
+                {
+                    palavra += SEM_ACENTO[seguinte - 0x80];
+                    i++;
+                    continue;
+                }
+            }
+            if (c < 0x80 && std::isalnum(c)) palavra += static_cast<char>(std::tolower(c));
+            else if (c >= 0x80) palavra += static_cast<char>(c);
+            else fecharPalavra();
+        }
+        fecharPalavra();
+
+        std::string canonico;
+        for (const auto& p : palavras) canonico += (canonico.empty() ? "" : " ") + p;
+        return canonico;
+    }
+
+    // Singular das formas mais comuns: "limoes" -> "limao", "nozes" -> "noz", "ovos"/"eggs" -> "ovo"/"egg".
+    // "-res" fica só sem o "s" ("espinafres" -> "espinafre"), mesmo que "flores" não chegue a "flor".
+    static std::string singular(const std::string& palavra)
+    {
+        auto terminaEm = [&](const char* fim)
+        {
+            size_t n = std::strlen(fim);
+            return palavra.size() > n && palavra.compare(palavra.size() - n, n, fim) == 0;
+        };
+
+        if (terminaEm("oes") || terminaEm("aes")) return palavra.substr(0, palavra.size() - 3) + "ao";
+        if (terminaEm("zes")) return palavra.substr(0, palavra.size() - 2);
+        if (palavra.size() > 3 && palavra.back() == 's' && palavra[palavra.size() - 2] != 's') return palavra.substr(0, palavra.size() - 1);
+        return palavra;
+    }
+
+    // Ingredientes distintos de uma lista separada por vírgulas (ou ';' ou linhas), já normalizados
+    static std::vector<std::string> normalizarIngredientes(const std::string& texto)
+    {
+        std::vector<std::string> ingredientes;
+        std::string atual;
+        auto fecharIngrediente = [&]()
+        {
+            std::string canonico = normalizarIngrediente(atual);
+            if (!canonico.empty() && std::find(ingredientes.begin(), ingredientes.end(), canonico) == ingredientes.end())
+                ingredientes.push_back(canonico);
+            atual.clear();
+        };
+
+        for (char c : texto)
+        {
+            if (c == ',' || c == ';' || c == '\n') fecharIngrediente();
+            else atual += c;
+        }
+        fecharIngrediente();
+        return ingredientes;
+    }
+
+    void indexarIngredientes(int recipe_id, const std::string& ingredientes)
+    {
+        removerIngredientes(recipe_id);
+
+        std::vector<std::string> canonicos = normalizarIngredientes(ingredientes);
+        std::vector<std::pair<std::string, std::string>> termos; // (termo, ingrediente canónico a que pertence)
+        for (const auto& canonico : canonicos)
+        {
+            termos.emplace_back(canonico, canonico);
+            if (canonico.find(' ') == std::string::npos) continue;
+            std::istringstream palavras(canonico);
+            std::string palavra;
+            while (palavras >> palavra)
+                if (palavra.size() >= 3) termos.emplace_back(palavra, canonico);
+        }
+
+        // Termos repetidos ("queijo queijo") são ignorados pelo INSERT OR IGNORE
+        const std::string sql = "INSERT OR IGNORE INTO receita_ingredientes (ingrediente, recipe_id, canonico, total) VALUES (?, ?, ?, ?);";
+        sqlite3_stmt* stmt;
+
+        if (sqlite3_prepare_v2(db.get(), sql.c_str(), -1, &stmt, nullptr) != SQLITE_OK) throw std::runtime_error("Erro ao preparar inserção de ingredientes: " + std::string(sqlite3_errmsg(db.get())));
+
+        for (const auto& termo : termos)
+        {
+            sqlite3_bind_text(stmt, 1, termo.first.c_str(), -1, SQLITE_TRANSIENT);
+            sqlite3_bind_int(stmt, 2, recipe_id);
+            sqlite3_bind_text(stmt, 3, termo.second.c_str(), -1, SQLITE_TRANSIENT);
+            sqlite3_bind_int(stmt, 4, static_cast<int>(canonicos.size()));
+            if (sqlite3_step(stmt) != SQLITE_DONE)
+            {
+                sqlite3_finalize(stmt);
+                throw std::runtime_error("Erro ao indexar ingredientes: " + std::string(sqlite3_errmsg(db.get())));
+            }
+            sqlite3_reset(stmt);
+        }
+
+        sqlite3_finalize(stmt);
+    }
+
+    void removerIngredientes(int recipe_id)
+    {
+        const std::string sql = "DELETE FROM receita_ingredientes WHERE recipe_id = ?;";
+        sqlite3_stmt* stmt;
+
+        if (sqlite3_prepare_v2(db.get(), sql.c_str(), -1, &stmt, nullptr) != SQLITE_OK) throw std::runtime_error("Erro ao preparar remoção de ingredientes: " + std::string(sqlite3_errmsg(db.get())));
+
+        sqlite3_bind_int(stmt, 1, recipe_id);
+        sqlite3_step(stmt);
+        sqlite3_finalize(stmt);
+    }
+
+    // Receitas que usam os ingredientes dados, (id, encontrados, total), ordenadas pelos que
+    // usam mais deles e depois pelas que pedem menos ingredientes em falta.
+    // Cada ingrediente da receita conta uma vez, mesmo que vários termos o encontrem ("queijo", "feta").
+    // Só lê as entradas do índice desses ingredientes, não a tabela de receitas.
+    std::vector<std::tuple<int, int, int>> receitasComIngredientes(const std::vector<std::string>& ingredientes, int offset, int limite)
+    {
+        std::vector<std::tuple<int, int, int>> resultados;
+        if (ingredientes.empty()) return resultados;
+
+        std::string sql = "SELECT recipe_id, COUNT(DISTINCT canonico) AS encontrados, MAX(total) AS total FROM receita_ingredientes WHERE ingrediente IN (";
+        for (size_t i = 0; i < ingredientes.size(); i++) sql += (i == 0) ? "?" : ", ?";
+        sql += ") GROUP BY recipe_id ORDER BY encontrados DESC, total - encontrados ASC, recipe_id LIMIT ? OFFSET ?;";
+        sqlite3_stmt* stmt;
+
+        if (sqlite3_prepare_v2(db.get(), sql.c_str(), -1, &stmt, nullptr) != SQLITE_OK) throw std::runtime_error("Erro ao preparar consulta: " + std::string(sqlite3_errmsg(db.get())));
+
+        int posicao = 1;
+        for (const auto& ingrediente : ingredientes) sqlite3_bind_text(stmt, posicao++, ingrediente.c_str(), -1, SQLITE_TRANSIENT);
+        sqlite3_bind_int(stmt, posicao++, limite);
+        sqlite3_bind_int(stmt, posicao, offset);
+
+        while (sqlite3_step(stmt) == SQLITE_ROW)
+            resultados.emplace_back(sqlite3_column_int(stmt, 0), sqlite3_column_int(stmt, 1), sqlite3_column_int(stmt, 2));
+
+        sqlite3_finalize(stmt);
+        return resultados;
+    }
+
+    // Converte o texto escrito pelo utilizador numa consulta FTS5 segura:
+    // cada palavra entre aspas e como prefixo ("ovo" encontra "ovos"), todas obrigatórias.
+    static std::string consultaPesquisa(const std::string& texto)
+    {
+        std::string consulta, palavra;
+        auto fecharPalavra = [&]()
+        {
+            if (palavra.empty()) return;
+            if (!consulta.empty()) consulta += " ";
+            consulta += "\"" + palavra + "\"*";
+            palavra.clear();
+        };
+
+        for (unsigned char c : texto)
+        {
+            // Bytes >= 0x80 fazem parte de letras UTF-8 (acentos), que o tokenizer trata
+            if (std::isalnum(c) || c >= 0x80) palavra += static_cast<char>(c);
+            else fecharPalavra();
+        }
+        fecharPalavra();
+        return consulta;
+    }
+
+    // Ids das receitas que correspondem ao texto, das mais relevantes para as menos (BM25)
+    std::vector<int> pesquisarReceitas(const std::string& texto, int offset, int limite)
+    {
+        std::vector<int> receita_ids;
+        std::string consulta = consultaPesquisa(texto);
+        if (consulta.empty()) return receita_ids;
+
+        const std::string sql = "SELECT rowid FROM receitas_fts WHERE receitas_fts MATCH ? ORDER BY rank LIMIT ? OFFSET ?;";
+        sqlite3_stmt* stmt;
+
+        if (sqlite3_prepare_v2(db.get(), sql.c_str(), -1, &stmt, nullptr) != SQLITE_OK) throw std::runtime_error("Erro ao preparar consulta: " + std::string(sqlite3_errmsg(db.get())));
+
+        sqlite3_bind_text(stmt, 1, consulta.c_str(), -1, SQLITE_TRANSIENT);
+        sqlite3_bind_int(stmt, 2, limite);
+        sqlite3_bind_int(stmt, 3, offset);
+
+        while (sqlite3_step(stmt) == SQLITE_ROW) receita_ids.push_back(sqlite3_column_int(stmt, 0));
+
+        sqlite3_finalize(stmt);
+        return receita_ids;
     }
 
     bool inserirReceita(int id, const std::string& titulo, const std::string& ingredientes, const std::string& passos, int user_id)
@@ -270,6 +659,7 @@ public:
         }
 
         sqlite3_finalize(stmt);
+        indexarIngredientes(id, ingredientes);
         return true;
     }
 
@@ -292,6 +682,7 @@ public:
         }
 
         sqlite3_finalize(stmt);
+        if (sqlite3_changes(db.get()) > 0) indexarIngredientes(id, ingredientes);
         return true;
     }
 
@@ -312,6 +703,7 @@ public:
         }
 
         sqlite3_finalize(stmt);
+        if (sqlite3_changes(db.get()) > 0) removerIngredientes(recipe_id);
         return true;
     }
 
@@ -335,7 +727,7 @@ public:
 
     int obterUtilizadorPorReceita(int recipe_id)
     {
-        const std::string sql = "SELECT user_id FROM recipes WHERE recipe_id = ?;";
+        const std::string sql = "SELECT user_id FROM receitas WHERE id = ?;";
         sqlite3_stmt* stmt;
 
         if (sqlite3_prepare_v2(db.get(), sql.c_str(), -1, &stmt, nullptr) != SQLITE_OK)
@@ -366,6 +758,25 @@ public:
         return receita_ids;
     }
 
+    // Página de receitas de um utilizador com id > cursor (paginação por chave)
+    std::vector<int> obterReceitasPorUtilizadorPaginado(int user_id, int cursor, int limite)
+    {
+        const std::string sql = "SELECT id FROM receitas WHERE user_id = ? AND id > ? ORDER BY id LIMIT ?;";
+        sqlite3_stmt* stmt;
+
+        if (sqlite3_prepare_v2(db.get(), sql.c_str(), -1, &stmt, nullptr) != SQLITE_OK) throw std::runtime_error("Erro ao preparar consulta: " + std::string(sqlite3_errmsg(db.get())));
+
+        sqlite3_bind_int(stmt, 1, user_id);
+        sqlite3_bind_int(stmt, 2, cursor);
+        sqlite3_bind_int(stmt, 3, limite);
+
+        std::vector<int> receita_ids;
+        while (sqlite3_step(stmt) == SQLITE_ROW) receita_ids.push_back(sqlite3_column_int(stmt, 0));
+
+        sqlite3_finalize(stmt);
+        return receita_ids;
+    }
+
     std::tuple<std::string, std::string, std::string> obterReceitaPorId(int id)
     {
         const std::string sql = "SELECT titulo, ingredientes, passos FROM receitas WHERE id = ?;";
@@ -392,6 +803,36 @@ public:
         return std::make_tuple(titulo, ingredientes, passos);
     }
 
+    // Obtém várias receitas numa só consulta (id, titulo, ingredientes, passos, image)
+    std::vector<std::tuple<int, std::string, std::string, std::string, std::string>> obterReceitasPorIds(const std::vector<int>& ids)
+    {
+        std::vector<std::tuple<int, std::string, std::string, std::string, std::string>> receitas;
+        if (ids.empty()) return receitas;
+
+        std::string sql = "SELECT id, titulo, ingredientes, passos, image FROM receitas WHERE id IN (";
+        for (size_t i = 0; i < ids.size(); i++) sql += (i == 0) ? "?" : ", ?";
+        sql += ");";
+        sqlite3_stmt* stmt;
+
+        if (sqlite3_prepare_v2(db.get(), sql.c_str(), -1, &stmt, nullptr) != SQLITE_OK) throw std::runtime_error("Erro ao preparar consulta: " + std::string(sqlite3_errmsg(db.get())));
+
+        for (size_t i = 0; i < ids.size(); i++) sqlite3_bind_int(stmt, static_cast<int>(i) + 1, ids[i]);
+
+        while (sqlite3_step(stmt) == SQLITE_ROW)
+        {
+            const unsigned char* image = sqlite3_column_text(stmt, 4);
+            receitas.emplace_back(
+                sqlite3_column_int(stmt, 0),
+                reinterpret_cast<const char*>(sqlite3_column_text(stmt, 1)),
+                reinterpret_cast<const char*>(sqlite3_column_text(stmt, 2)),
+                reinterpret_cast<const char*>(sqlite3_column_text(stmt, 3)),
+                image ? reinterpret_cast<const char*>(image) : "");
+        }
+
+        sqlite3_finalize(stmt);
+        return receitas;
+    }
+
     void criarTabelaReceitasSalvas()
     {
         const char* sql = "CREATE TABLE IF NOT EXISTS saved_recipes ("
@@ -409,6 +850,8 @@ public:
             sqlite3_free(mensagemErro);
             throw std::runtime_error("Erro ao criar tabela de receitas salvas: " + erro);
         }
+
+        executarSql("CREATE INDEX IF NOT EXISTS idx_saved_recipes_user ON saved_recipes(user_id, id);");
     }
 
     bool salvarReceita(int user_id, int recipe_id)
@@ -452,6 +895,29 @@ public:
         return recipe_ids;
     }
 
+    // Página de receitas guardadas: pares (id da linha em saved_recipes, recipe_id) com id > cursor
+    std::vector<std::pair<int, int>> obterReceitasSalvasPaginado(int user_id, int cursor, int limite)
+    {
+        const std::string sql = "SELECT id, recipe_id FROM saved_recipes WHERE user_id = ? AND id > ? ORDER BY id LIMIT ?;";
+        sqlite3_stmt* stmt;
+
+        if (sqlite3_prepare_v2(db.get(), sql.c_str(), -1, &stmt, nullptr) != SQLITE_OK)
+            throw std::runtime_error("Erro ao preparar consulta: " + std::string(sqlite3_errmsg(db.get())));
+
+        sqlite3_bind_int(stmt, 1, user_id);
+        sqlite3_bind_int(stmt, 2, cursor);
+        sqlite3_bind_int(stmt, 3, limite);
+
+        std::vector<std::pair<int, int>> pagina;
+        while (sqlite3_step(stmt) == SQLITE_ROW)
+        {
+            pagina.emplace_back(sqlite3_column_int(stmt, 0), sqlite3_column_int(stmt, 1));
+        }
+
+        sqlite3_finalize(stmt);
+        return pagina;
+    }
+
     std::vector<int> obterRecipeSavers(int recipe_id)
     {
         const std::string sql = "SELECT user_id FROM saved_recipes WHERE recipe_id = ?;";
@@ -631,6 +1097,45 @@ public:
         return count > 0;
     }
 
+    // Usernames de quem o utilizador segue (usa a chave primária (follower_id, followed_id))
+    std::vector<std::string> listarSeguidos(int follower_id)
+    {
+        const std::string sql = "SELECT u.username FROM followers f JOIN users u ON u.id = f.followed_id WHERE f.follower_id = ?;";
+        sqlite3_stmt* stmt;
+
+        if (sqlite3_prepare_v2(db.get(), sql.c_str(), -1, &stmt, nullptr) != SQLITE_OK) throw std::runtime_error("Erro ao preparar consulta: " + std::string(sqlite3_errmsg(db.get())));
+
+        sqlite3_bind_int(stmt, 1, follower_id);
+
+        std::vector<std::string> usernames;
+        while (sqlite3_step(stmt) == SQLITE_ROW) usernames.push_back(reinterpret_cast<const char*>(sqlite3_column_text(stmt, 0)));
+
+        sqlite3_finalize(stmt);
+        return usernames;
+    }
+
+    // Quais dos usernames dados o utilizador segue, numa só consulta
+    std::vector<std::string> filtrarSeguidos(int follower_id, const std::vector<std::string>& usernames)
+    {
+        std::vector<std::string> seguidos;
+        if (usernames.empty()) return seguidos;
+
+        std::string sql = "SELECT u.username FROM followers f JOIN users u ON u.id = f.followed_id WHERE f.follower_id = ? AND u.username IN (";
+        for (size_t i = 0; i < usernames.size(); i++) sql += (i == 0) ? "?" : ", ?";
+        sql += ");";
+        sqlite3_stmt* stmt;
+
+        if (sqlite3_prepare_v2(db.get(), sql.c_str(), -1, &stmt, nullptr) != SQLITE_OK) throw std::runtime_error("Erro ao preparar consulta: " + std::string(sqlite3_errmsg(db.get())));
+
+        sqlite3_bind_int(stmt, 1, follower_id);
+        for (size_t i = 0; i < usernames.size(); i++) sqlite3_bind_text(stmt, static_cast<int>(i) + 2, usernames[i].c_str(), -1, SQLITE_TRANSIENT);
+
+        while (sqlite3_step(stmt) == SQLITE_ROW) seguidos.push_back(reinterpret_cast<const char*>(sqlite3_column_text(stmt, 0)));
+
+        sqlite3_finalize(stmt);
+        return seguidos;
+    }
+
     void criarTabelaMealPlanner() {
         const char* sql = "CREATE TABLE IF NOT EXISTS meal_planner ("
             "id INTEGER PRIMARY KEY AUTOINCREMENT, "
@@ -639,7 +1144,9 @@ public:
             "meal_type TEXT NOT NULL, " // Almoço ou Jantar
             "day_of_week TEXT NOT NULL, " // Segunda-feira, Terça-feira, etc.
             "FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE, "
-            "FOREIGN KEY(recipe_id) REFERENCES receitas(id) ON DELETE CASCADE);";
+            "FOREIGN KEY(recipe_id) REFERENCES receitas(id) ON DELETE CASCADE);"
+            // Para /listar_refeicoes ler a semana de um utilizador sem percorrer a tabela toda
+            "CREATE INDEX IF NOT EXISTS idx_meal_planner_user ON meal_planner(user_id);";
         char* mensagemErro = nullptr;
         int resultado = sqlite3_exec(db.get(), sql, nullptr, nullptr, &mensagemErro);
 
@@ -671,8 +1178,10 @@ public:
         return true;
     }
 
-    bool removerRefeicao(int user_id, int recipe_id, const std::string& day_of_week) {
-        const std::string sql = "DELETE FROM meal_planner WHERE user_id = ? AND recipe_id = ? AND day_of_week = ?;";
+    // Sem meal_type remove a receita de todas as refeições desse dia
+    bool removerRefeicao(int user_id, int recipe_id, const std::string& day_of_week, const std::string& meal_type = "") {
+        std::string sql = "DELETE FROM meal_planner WHERE user_id = ? AND recipe_id = ? AND day_of_week = ?";
+        sql += meal_type.empty() ? ";" : " AND meal_type = ?;";
         sqlite3_stmt* stmt;
 
         if (sqlite3_prepare_v2(db.get(), sql.c_str(), -1, &stmt, nullptr) != SQLITE_OK) {
@@ -682,6 +1191,7 @@ public:
         sqlite3_bind_int(stmt, 1, user_id);
         sqlite3_bind_int(stmt, 2, recipe_id);
         sqlite3_bind_text(stmt, 3, day_of_week.c_str(), -1, SQLITE_STATIC);
+        if (!meal_type.empty()) sqlite3_bind_text(stmt, 4, meal_type.c_str(), -1, SQLITE_STATIC);
 
         if (sqlite3_step(stmt) != SQLITE_DONE) {
             sqlite3_finalize(stmt);
@@ -692,6 +1202,29 @@ public:
         return true;
     }
 
+    // Todas as refeições planeadas de um utilizador: (id, recipe_id, meal_type, day_of_week)
+    std::vector<std::tuple<int, int, std::string, std::string>> obterRefeicoes(int user_id) {
+        const std::string sql = "SELECT id, recipe_id, meal_type, day_of_week FROM meal_planner WHERE user_id = ? ORDER BY id;";
+        sqlite3_stmt* stmt;
+
+        if (sqlite3_prepare_v2(db.get(), sql.c_str(), -1, &stmt, nullptr) != SQLITE_OK)
+            throw std::runtime_error("Erro ao preparar consulta ao Planeador de Refeições: " + std::string(sqlite3_errmsg(db.get())));
+
+        sqlite3_bind_int(stmt, 1, user_id);
+
+        std::vector<std::tuple<int, int, std::string, std::string>> refeicoes;
+        while (sqlite3_step(stmt) == SQLITE_ROW) {
+            refeicoes.emplace_back(
+                sqlite3_column_int(stmt, 0),
+                sqlite3_column_int(stmt, 1),
+                reinterpret_cast<const char*>(sqlite3_column_text(stmt, 2)),
+                reinterpret_cast<const char*>(sqlite3_column_text(stmt, 3)));
+        }
+
+        sqlite3_finalize(stmt);
+        return refeicoes;
+    }
+
     void criarTabelaNotifs()
     {
         const std::string sql = "CREATE TABLE IF NOT EXISTS notifications ("
@@ -721,9 +1254,19 @@ public:
         }
 
         sqlite3_finalize(stmt);
+
+        // Para /notifications_since ler só as notificações de um utilizador a seguir a um id
+        char* mensagemErro = nullptr;
+        if (sqlite3_exec(db.get(), "CREATE INDEX IF NOT EXISTS idx_notifications_user ON notifications(user_id, id);", nullptr, nullptr, &mensagemErro) != SQLITE_OK)
+        {
+            std::string erro(mensagemErro);
+            sqlite3_free(mensagemErro);
+            throw std::runtime_error("Erro ao criar índice de notificações: " + erro);
+        }
     }
 
-    void adicionarNotificacao(int user_id, int origin_user_id, const std::string& message)
+    // Devolve o id da notificação criada
+    int adicionarNotificacao(int user_id, int origin_user_id, const std::string& message)
     {
         const std::string sql = "INSERT INTO notifications (user_id, origin_user_id, message) VALUES (?, ?, ?);";
         sqlite3_stmt* stmt;
@@ -748,6 +1291,7 @@ public:
         }
 
         sqlite3_finalize(stmt);
+        return static_cast<int>(sqlite3_last_insert_rowid(db.get()));
     }
 
     std::vector<int> obterNotifs(int user_id)
@@ -770,6 +1314,34 @@ public:
         return notif_ids;
     }
 
+    // Notificações de user_id com id > cursor, por ordem: (id, origin_user_id, username de origem, message)
+    std::vector<std::tuple<int, int, std::string, std::string>> obterNotifsDesde(int user_id, int cursor, int limite)
+    {
+        const std::string sql = "SELECT n.id, n.origin_user_id, u.username, n.message FROM notifications n "
+            "JOIN users u ON u.id = n.origin_user_id WHERE n.user_id = ? AND n.id > ? ORDER BY n.id LIMIT ?;";
+        sqlite3_stmt* stmt;
+
+        if (sqlite3_prepare_v2(db.get(), sql.c_str(), -1, &stmt, nullptr) != SQLITE_OK)
+            throw std::runtime_error("Erro ao preparar consulta: " + std::string(sqlite3_errmsg(db.get())));
+
+        sqlite3_bind_int(stmt, 1, user_id);
+        sqlite3_bind_int(stmt, 2, cursor);
+        sqlite3_bind_int(stmt, 3, limite);
+
+        std::vector<std::tuple<int, int, std::string, std::string>> notificacoes;
+        while (sqlite3_step(stmt) == SQLITE_ROW)
+        {
+            notificacoes.emplace_back(
+                sqlite3_column_int(stmt, 0),
+                sqlite3_column_int(stmt, 1),
+                reinterpret_cast<const char*>(sqlite3_column_text(stmt, 2)),
+                reinterpret_cast<const char*>(sqlite3_column_text(stmt, 3)));
+        }
+
+        sqlite3_finalize(stmt);
+        return notificacoes;
+    }
+
     std::pair<int, std::string> notifInfo(int notif_id)
     {
         const std::string sql = "SELECT origin_user_id, message FROM notifications WHERE id = ?;";
@@ -843,14 +1415,136 @@ class App {
 private:
     crow::SimpleApp app;
     Database db;
+    std::mutex uploadsMutex; // Protege file_counter.txt e os ficheiros parciais em uploads/
+    std::mutex notifsMutex; // Protege ligacoesNotifs
+    // Ligações abertas em /ws/notifications, por utilizador
+    std::unordered_map<int, std::unordered_set<crow::websocket::connection*>> ligacoesNotifs;
 
-public:
-    App(const std::string& db_name) : db(db_name) {}
-
-    void configurarRotas()
+    // Guarda a notificação para cada destinatário e envia-a logo pelas ligações que ele tiver abertas
+    void notificar(const std::vector<int>& user_ids, int origin_user_id, const std::string& mensagem)
     {
-        // Add_User Route
-        CROW_ROUTE(app, "/add_user").methods("POST"_method)([this](const crow::request& req)
+        if (user_ids.empty()) return;
+        std::string origin_username = db.obterUsername(origin_user_id);
+
+        for (int user_id : user_ids)
+        {
+            int id = db.adicionarNotificacao(user_id, origin_user_id, mensagem);
+
+            std::lock_guard<std::mutex> lock(notifsMutex);
+            auto ligacoes = ligacoesNotifs.find(user_id);
+            if (ligacoes == ligacoesNotifs.end()) continue;
+
+            crow::json::wvalue notificacao;
+            notificacao["id"] = id;
+            notificacao["origin_user_id"] = origin_user_id;
+            notificacao["origin_username"] = origin_username;
+            notificacao["message"] = mensagem;
+            std::string texto = notificacao.dump();
+            for (auto* ligacao : ligacoes->second) ligacao->send_text(texto);
+        }
+    }
+
+    // O id do utilizador vai no userdata da ligação
+    static int utilizadorDaLigacao(crow::websocket::connection& ligacao)
+    {
+        return static_cast<int>(reinterpret_cast<intptr_t>(ligacao.userdata()));
+    }
+
+    // O planeador aceita "user_id" ou "username"; -1 se o utilizador não existir
+    int idDoPedido(const crow::json::rvalue& body)
+    {
+        if (body.has("user_id")) return static_cast<int>(body["user_id"].i());
+        return db.obterUtilizadorId(body["username"].s());
+    }
+
+    // Próximo caminho livre em images/ (chamar com uploadsMutex bloqueado)
+    std::string novoCaminhoImagem()
+    {
+        int file_counter = 0;
+        std::ifstream counter_file_in("file_counter.txt");
+        if (counter_file_in.is_open()) {
+            counter_file_in >> file_counter;
+            counter_file_in.close();
+        }
+
+        std::string file_name = "images/i_" + std::to_string(file_counter++) + ".jpg";
+
+        std::ofstream counter_file_out("file_counter.txt", std::ios::trunc);
+        counter_file_out << file_counter;
+        counter_file_out.close();
+
+        return file_name;
+    }
+
+    // Guarda o caminho da imagem na receita ('r'), foto de perfil ('p') ou banner ('b') indicado no pedido
+    crow::response associarImagem(const crow::json::rvalue& body, const std::string& file_name)
+    {
+        std::string op = body["op"].s();
+        if (op.empty())
+            return crow::response(400, "Erro: op inválida");
+
+        //guarda na database dependendo da op
+        if (op[0] == 'r')
+        {
+            //ver se body tem id de receita
+            if (!body.has("id"))
+                return crow::response(400, "Erro: id não fornecido");
+            int id = body["id"].i();
+            //verificar se tem id da receita
+            if (!db.idReceitaExiste(id))
+                return crow::response(400, "Erro: id de receita não existe.");
+            //adicionar caminho à tabela de receitas
+            if (!db.atualizarImagemReceita(file_name, id))
+                return crow::response(400, "Erro: interno");
+        }
+        else if (op[0] == 'p')
+        {
+            if (!body.has("username"))
+                return crow::response(400, "Erro: username não fornecido");
+            std::string username = body["username"].s();
+
+            if (!db.utilizadorExiste(username))
+                return crow::response(400, "Erro: user não existe");
+            int id = db.obterUtilizadorId(username);
+            if (!db.atualizarPfp(file_name, id))
+                return crow::response(400, "Erro: interno");
+        }
+        else if (op[0] == 'b')
+        {
+            if (!body.has("username"))
+                return crow::response(400, "Erro: username não fornecido");
+            std::string username = body["username"].s();
+
+            if (!db.utilizadorExiste(username))
+                return crow::response(400, "Erro: user não existe");
+            int id = db.obterUtilizadorId(username);
+            if (!db.atualizarBanner(file_name, id))
+                return crow::response(400, "Erro: interno");
+        }
+        // Responde com sucesso e os campos adicionais
+        return crow::response(200, "Imagem guardada com sucesso");
+    }
+
+    // Ids de upload são gerados pelo servidor (32 dígitos hex); qualquer outra coisa é rejeitada,
+    // para que o id nunca possa apontar para fora de uploads/
+    static bool uploadIdValido(const std::string& upload_id)
+    {
+        static const std::regex formato("^[0-9a-f]{32}$");
+        return std::regex_match(upload_id, formato);
+    }
+
+    static std::string caminhoUpload(const std::string& upload_id)
+    {
+        return UPLOADS_DIR + "/" + upload_id + ".part";
+    }
+
+public:
+    App(const std::string& db_name) : db(db_name) {}
+
+    void configurarRotas()
+    {
+        // Add_User Route
+        CROW_ROUTE(app, "/add_user").methods("POST"_method)([this](const crow::request& req)
         {
             try
             {
@@ -1008,13 +1702,13 @@ public:
                 if (db.inserirReceita(id, titulo, ingredientes, passos, user_id))
                 {
                     std::vector<int> followers = db.listFollowers(user_id);
+                    notificar(followers, user_id, "Este utilizador adicionou uma nova receita chamada: " + titulo + "!");
 
-                    for (int i = 0; i < followers.size(); i++)
-                    {
-                        std::string mensagem = "Este utilizador adicionou uma nova receita chamada: " + titulo + "!";
-                        db.adicionarNotificacao(followers[i], user_id, mensagem);
-                    }
-                    return crow::response(201, "Receita adicionada com sucesso!");
+                    // Devolve o id para o cliente poder associar uma imagem à receita nova
+                    crow::json::wvalue resposta;
+                    resposta["id"] = id;
+                    resposta["mensagem"] = "Receita adicionada com sucesso!";
+                    return crow::response(201, resposta);
                 }
 
                 return crow::response(500, "Erro interno ao adicionar receita.");
@@ -1046,13 +1740,11 @@ public:
                     {
                         //obter pessoas que guardaram receita
                         std::vector<int>savers = db.obterRecipeSavers(id);
-                        
-                        for (int i = 0; i < savers.size(); i++)
+                        if (!savers.empty())
                         {
                             //obter id do dono da receita
                             int user_id = db.obterUtilizadorPorReceita(id);
-                            std::string mensagem = "Este utilizador editou a receita chamada: " + titulo + "!";
-                            db.adicionarNotificacao(savers[i], user_id, mensagem);
+                            notificar(savers, user_id, "Este utilizador editou a receita chamada: " + titulo + "!");
                         }
                         return crow::response(200, "Receita editada com sucesso.");
                     }
@@ -1077,6 +1769,23 @@ public:
                 if (!db.utilizadorExiste(username)) return crow::response(404, "Erro: Utilizador não encontrado.");
 
                 int user_id = db.obterUtilizadorId(username);
+
+                // Com "limit": devolve uma página a seguir a "cursor" e o cursor da próxima (null no fim)
+                if (body.has("limit"))
+                {
+                    int limite = std::max(1, std::min(static_cast<int>(body["limit"].i()), MAX_PAGE_SIZE));
+                    int cursor = (body.has("cursor") && body["cursor"].t() == crow::json::type::Number) ? static_cast<int>(body["cursor"].i()) : 0;
+                    auto pagina = db.obterReceitasPorUtilizadorPaginado(user_id, cursor, limite);
+
+                    crow::json::wvalue resposta;
+                    std::vector<crow::json::wvalue> lista;
+                    for (int id : pagina) lista.push_back(id);
+                    resposta["recipes"] = std::move(lista);
+                    if (static_cast<int>(pagina.size()) == limite) resposta["next_cursor"] = pagina.back();
+                    else resposta["next_cursor"] = nullptr;
+                    return crow::response(200, resposta);
+                }
+
                 auto receitas = db.obterReceitasPorUtilizador(user_id);
 
                 crow::json::wvalue resposta;
@@ -1116,6 +1825,60 @@ public:
             }
         });
 
+        // Get_Recipes Route: várias receitas num só pedido, evita um /get_recipe por id
+        CROW_ROUTE(app, "/get_recipes").methods("POST"_method)([this](const crow::request& req)
+        {
+            try
+            {
+                auto body = crow::json::load(req.body);
+                if (!body || !body.has("ids") || body["ids"].t() != crow::json::type::List)
+                    return crow::response(400, "Erro: Dados inválidos.");
+
+                if (body["ids"].size() > MAX_BATCH_IDS)
+                    return crow::response(400, "Erro: Demasiados ids (máximo " + std::to_string(MAX_BATCH_IDS) + ").");
+
+                std::vector<int> ids;
+                for (size_t i = 0; i < body["ids"].size(); i++) ids.push_back(body["ids"][i].i());
+
+                auto receitas = db.obterReceitasPorIds(ids);
+
+                // "etags" opcional: {id: etag} das receitas que o cliente já tem em cache
+                bool tem_etags = body.has("etags") && body["etags"].t() == crow::json::type::Object;
+
+                crow::json::wvalue resposta;
+                std::vector<crow::json::wvalue> lista;
+                std::vector<crow::json::wvalue> inalteradas;
+                for (const auto& receita : receitas)
+                {
+                    int id = std::get<0>(receita);
+                    std::string etag = calcularEtag(std::get<1>(receita), std::get<2>(receita), std::get<3>(receita), std::get<4>(receita));
+
+                    std::string chave = std::to_string(id);
+                    if (tem_etags && body["etags"].has(chave) && body["etags"][chave].s() == etag)
+                    {
+                        inalteradas.push_back(id);
+                        continue;
+                    }
+
+                    crow::json::wvalue item;
+                    item["id"] = id;
+                    item["titulo"] = std::get<1>(receita);
+                    item["ingredientes"] = std::get<2>(receita);
+                    item["passos"] = std::get<3>(receita);
+                    item["image"] = std::get<4>(receita);
+                    item["etag"] = etag;
+                    lista.push_back(std::move(item));
+                }
+                resposta["recipes"] = std::move(lista);
+                resposta["unchanged"] = std::move(inalteradas);
+
+                return crow::response(200, resposta);
+            }
+            catch (const std::exception& e) {
+                return crow::response(500, std::string("Erro interno: ") + e.what());
+            }
+        });
+
         CROW_ROUTE(app, "/delete_recipe").methods("POST"_method)([this](const crow::request& req)
             {
                 try
@@ -1184,6 +1947,22 @@ public:
                 if (!db.utilizadorExiste(username)) return crow::response(404, "Erro: Utilizador não encontrado.");
 
                 int user_id = db.obterUtilizadorId(username);
+
+                if (body.has("limit"))
+                {
+                    int limite = std::max(1, std::min(static_cast<int>(body["limit"].i()), MAX_PAGE_SIZE));
+                    int cursor = (body.has("cursor") && body["cursor"].t() == crow::json::type::Number) ? static_cast<int>(body["cursor"].i()) : 0;
+                    auto pagina = db.obterReceitasSalvasPaginado(user_id, cursor, limite);
+
+                    crow::json::wvalue resposta;
+                    std::vector<crow::json::wvalue> lista;
+                    for (const auto& linha : pagina) lista.push_back(linha.second);
+                    resposta["saved_recipes"] = std::move(lista);
+                    if (static_cast<int>(pagina.size()) == limite) resposta["next_cursor"] = pagina.back().first;
+                    else resposta["next_cursor"] = nullptr;
+                    return crow::response(200, resposta);
+                }
+
                 auto receitas_salvas = db.obterReceitasSalvas(user_id);
 
                 crow::json::wvalue resposta;
@@ -1219,7 +1998,7 @@ public:
 
                 if (db.adicionarSeguidor(follower_id, followed_id))
                 {
-                    db.adicionarNotificacao(followed_id, follower_id, "Este utilizador começou a seguir-te!");
+                    notificar({ followed_id }, follower_id, "Este utilizador começou a seguir-te!");
                     return crow::response(200, "Seguiu utilizador com sucesso");
                 }
 
@@ -1315,6 +2094,59 @@ public:
                 }
             });
 
+        // Todos os utilizadores que "username" segue, para o cliente guardar numa lista local
+        CROW_ROUTE(app, "/list_following").methods("POST"_method)([this](const crow::request& req)
+            {
+                try
+                {
+                    auto body = crow::json::load(req.body);
+                    if (!body || !body.has("username"))
+                        return crow::response(400, "Erro: Dados inválidos.");
+
+                    std::string username = body["username"].s();
+                    if (!db.utilizadorExiste(username)) return crow::response(404, "Erro: Utilizador não encontrado.");
+
+                    crow::json::wvalue resposta;
+                    std::vector<crow::json::wvalue> lista;
+                    for (const auto& seguido : db.listarSeguidos(db.obterUtilizadorId(username))) lista.push_back(seguido);
+                    resposta["following"] = std::move(lista);
+                    return crow::response(200, resposta);
+                }
+                catch (const std::exception& e)
+                {
+                    return crow::response(500, std::string("Erro interno: ") + e.what());
+                }
+            });
+
+        // Versão em lote do /check_follow: quais de "usernames" o "follower_username" segue
+        CROW_ROUTE(app, "/check_follows").methods("POST"_method)([this](const crow::request& req)
+            {
+                try
+                {
+                    auto body = crow::json::load(req.body);
+                    if (!body || !body.has("follower_username") || !body.has("usernames") || body["usernames"].t() != crow::json::type::List)
+                        return crow::response(400, "Erro: Dados inválidos.");
+                    if (body["usernames"].size() > MAX_BATCH_IDS)
+                        return crow::response(400, "Erro: Demasiados utilizadores (máximo " + std::to_string(MAX_BATCH_IDS) + ").");
+
+                    std::string follower_username = body["follower_username"].s();
+                    if (!db.utilizadorExiste(follower_username)) return crow::response(404, "Erro: Utilizador não encontrado.");
+
+                    std::vector<std::string> usernames;
+                    for (const auto& username : body["usernames"]) usernames.push_back(username.s());
+
+                    crow::json::wvalue resposta;
+                    std::vector<crow::json::wvalue> lista;
+                    for (const auto& seguido : db.filtrarSeguidos(db.obterUtilizadorId(follower_username), usernames)) lista.push_back(seguido);
+                    resposta["following"] = std::move(lista);
+                    return crow::response(200, resposta);
+                }
+                catch (const std::exception& e)
+                {
+                    return crow::response(500, std::string("Erro interno: ") + e.what());
+                }
+            });
+
         CROW_ROUTE(app, "/search").methods("POST"_method)([this](const crow::request& req)
             {
                 try
@@ -1344,13 +2176,83 @@ public:
                 }
             });
     
+        // Pesquisa de receitas por título, ingredientes e passos, ordenada por relevância.
+        // "cursor" é o número de resultados já recebidos; "next_cursor" é null na última página.
+        CROW_ROUTE(app, "/search_recipes").methods("POST"_method)([this](const crow::request& req)
+            {
+                try
+                {
+                    auto body = crow::json::load(req.body);
+                    if (!body || !body.has("search"))
+                        return crow::response(400, "Erro: Dados inválidos.");
+
+                    int limite = body.has("limit") ? std::max(1, std::min(static_cast<int>(body["limit"].i()), MAX_PAGE_SIZE)) : SEARCH_PAGE_SIZE;
+                    int cursor = (body.has("cursor") && body["cursor"].t() == crow::json::type::Number) ? std::max(0, static_cast<int>(body["cursor"].i())) : 0;
+
+                    auto pagina = db.pesquisarReceitas(body["search"].s(), cursor, limite);
+
+                    crow::json::wvalue resposta;
+                    std::vector<crow::json::wvalue> lista;
+                    for (int id : pagina) lista.push_back(id);
+                    resposta["recipe_ids"] = std::move(lista);
+                    if (static_cast<int>(pagina.size()) == limite) resposta["next_cursor"] = cursor + limite;
+                    else resposta["next_cursor"] = nullptr;
+                    return crow::response(200, resposta);
+                }
+                catch (const std::exception& e)
+                {
+                    return crow::response(500, std::string("Erro interno: ") + e.what());
+                }
+            });
+
+        // "O que posso cozinhar": receitas que usam os ingredientes dados (texto separado por vírgulas),
+        // das que usam mais deles para as que usam menos. "cursor" é o número de resultados já recebidos.
+        CROW_ROUTE(app, "/cook_with").methods("POST"_method)([this](const crow::request& req)
+            {
+                try
+                {
+                    auto body = crow::json::load(req.body);
+                    if (!body || !body.has("ingredients"))
+                        return crow::response(400, "Erro: Dados inválidos.");
+
+                    int limite = body.has("limit") ? std::max(1, std::min(static_cast<int>(body["limit"].i()), MAX_PAGE_SIZE)) : SEARCH_PAGE_SIZE;
+                    int cursor = (body.has("cursor") && body["cursor"].t() == crow::json::type::Number) ? std::max(0, static_cast<int>(body["cursor"].i())) : 0;
+
+                    auto ingredientes = Database::normalizarIngredientes(body["ingredients"].s());
+                    if (static_cast<int>(ingredientes.size()) > MAX_INGREDIENTES_PESQUISA) ingredientes.resize(MAX_INGREDIENTES_PESQUISA);
+
+                    auto pagina = db.receitasComIngredientes(ingredientes, cursor, limite);
+
+                    crow::json::wvalue resposta;
+                    std::vector<crow::json::wvalue> lista;
+                    for (const auto& [id, encontrados, total] : pagina)
+                    {
+                        crow::json::wvalue resultado;
+                        resultado["id"] = id;
+                        resultado["matched"] = encontrados;
+                        resultado["total"] = total;
+                        lista.push_back(std::move(resultado));
+                    }
+                    resposta["results"] = std::move(lista);
+                    std::vector<crow::json::wvalue> termos;
+                    for (const auto& ingrediente : ingredientes) termos.push_back(ingrediente);
+                    resposta["ingredients"] = std::move(termos);  // Como o servidor entendeu o pedido
+                    if (static_cast<int>(pagina.size()) == limite) resposta["next_cursor"] = cursor + limite;
+                    else resposta["next_cursor"] = nullptr;
+                    return crow::response(200, resposta);
+                }
+                catch (const std::exception& e)
+                {
+                    return crow::response(500, std::string("Erro interno: ") + e.what());
+                }
+            });
+
         CROW_ROUTE(app, "/upload_image").methods("POST"_method)([this](const crow::request& req)
         {
             // Tenta interpretar o corpo como JSON
             auto body = crow::json::load(req.body);
             if (!body || !body.has("image") || !body.has("op")) return crow::response(400, "Erro: Dados inválidos.");
 
-            std::string op = body["op"].s();
             std::string image_base64 = body["image"].s();
 
             std::string image_data;
@@ -1363,64 +2265,153 @@ public:
                 return crow::response(400, "Erro ao descodificar a imagem");
             }
 
-            int file_counter = 0;
-            std::ifstream counter_file_in("file_counter.txt");
-            if (counter_file_in.is_open()) {
-                counter_file_in >> file_counter;
-                counter_file_in.close();
+            std::string file_name;
+            {
+                std::lock_guard<std::mutex> lock(uploadsMutex);
+                file_name = novoCaminhoImagem();
             }
-
-            std::string file_name = "images/i_" + std::to_string(file_counter++) + ".jpg";
             std::ofstream file(file_name, std::ios::binary);
             file.write(image_data.data(), image_data.size());
             file.close();
 
-            std::ofstream counter_file_out("file_counter.txt", std::ios::trunc);
-            counter_file_out << file_counter;
-            counter_file_out.close();
-
-            //guarda na database dependendo da op
-            if (op[0] == 'r')
+            return associarImagem(body, file_name);
+        });
+    
+        // Get_Profile_Images Route: caminhos das imagens de perfil, para descarregar com /download_image
+        CROW_ROUTE(app, "/get_profile_images").methods("POST"_method)([this](const crow::request& req)
+        {
+            try
             {
-                //ver se body tem id de receita
-                if (!body.has("id"))
-                    return crow::response(400, "Erro: id não fornecido");
-                int id = body["id"].i();
-                //verificar se tem id da receita
-                if (!db.idReceitaExiste(id))
-                    return crow::response(400, "Erro: id de receita não existe.");
-                //adicionar caminho à tabela de receitas
-                if (!db.atualizarImagemReceita(file_name, id))
-                    return crow::response(400, "Erro: interno");
+                auto body = crow::json::load(req.body);
+                if (!body || !body.has("username")) return crow::response(400, "Erro: Dados inválidos.");
+
+                std::string username = body["username"].s();
+                if (!db.utilizadorExiste(username)) return crow::response(404, "Erro: Utilizador não encontrado.");
+
+                auto imagens = db.obterImagensPerfil(db.obterUtilizadorId(username));
+
+                crow::json::wvalue resposta;
+                resposta["profile_pic"] = imagens.first;
+                resposta["banner"] = imagens.second;
+
+                return crow::response(200, resposta);
             }
-            else if (op[0] == 'p')
+            catch (const std::exception& e) {
+                return crow::response(500, std::string("Erro interno: ") + e.what());
+            }
+        });
+
+        // Upload_Init Route: começa um upload por partes e devolve o id a usar nas partes seguintes
+        CROW_ROUTE(app, "/upload_init").methods("POST"_method)([this](const crow::request& req)
+        {
+            try
             {
-                if (!body.has("username"))
-                    return crow::response(400, "Erro: username não fornecido");
-                std::string username = body["username"].s();
+                auto body = crow::json::load(req.body);
+                if (!body || !body.has("size")) return crow::response(400, "Erro: Dados inválidos.");
+                if (body["size"].i() < 0 || (uintmax_t)body["size"].i() > MAX_UPLOAD_SIZE)
+                    return crow::response(413, "Erro: Imagem demasiado grande.");
+
+                std::random_device rd;
+                std::ostringstream upload_id;
+                for (int i = 0; i < 4; i++)
+                    upload_id << std::hex << std::setw(8) << std::setfill('0') << rd();
+
+                std::lock_guard<std::mutex> lock(uploadsMutex);
+                std::filesystem::create_directories(UPLOADS_DIR);
+                std::ofstream(caminhoUpload(upload_id.str()), std::ios::binary).close();
+
+                crow::json::wvalue resposta;
+                resposta["upload_id"] = upload_id.str();
+                resposta["offset"] = 0;
+                return crow::response(200, resposta);
+            }
+            catch (const std::exception& e) {
+                return crow::response(500, std::string("Erro interno: ") + e.what());
+            }
+        });
+
+        // Upload_Status Route: quantos bytes do upload já foram recebidos, para retomar a partir daí
+        CROW_ROUTE(app, "/upload_status").methods("POST"_method)([this](const crow::request& req)
+        {
+            auto body = crow::json::load(req.body);
+            if (!body || !body.has("upload_id")) return crow::response(400, "Erro: Dados inválidos.");
 
-                if (!db.utilizadorExiste(username))
-                    return crow::response(400, "Erro: user não existe");
-                int id = db.obterUtilizadorId(username);
-                if (!db.atualizarPfp(file_name, id))
-                    return crow::response(400, "Erro: interno");
+            std::string upload_id = body["upload_id"].s();
+            std::lock_guard<std::mutex> lock(uploadsMutex);
+            if (!uploadIdValido(upload_id) || !std::filesystem::exists(caminhoUpload(upload_id)))
+                return crow::response(404, "Erro: Upload não encontrado.");
+
+            crow::json::wvalue resposta;
+            resposta["offset"] = (int64_t)std::filesystem::file_size(caminhoUpload(upload_id));
+            return crow::response(200, resposta);
+        });
+
+        // Upload_Chunk Route: corpo em binário; upload_id e offset vêm no URL.
+        // Só aceita a parte se começar exatamente onde o ficheiro parcial termina (409 com o offset certo caso contrário)
+        CROW_ROUTE(app, "/upload_chunk").methods("POST"_method)([this](const crow::request& req)
+        {
+            const char* upload_id_param = req.url_params.get("upload_id");
+            const char* offset_param = req.url_params.get("offset");
+            if (!upload_id_param || !offset_param) return crow::response(400, "Erro: Dados inválidos.");
+            if (req.body.size() > MAX_UPLOAD_CHUNK) return crow::response(413, "Erro: Parte demasiado grande.");
+
+            std::string upload_id = upload_id_param;
+            uintmax_t offset;
+            try {
+                offset = std::stoull(offset_param);
             }
-            else if (op[0] == 'b')
+            catch (const std::exception&) {
+                return crow::response(400, "Erro: offset inválido.");
+            }
+
+            std::lock_guard<std::mutex> lock(uploadsMutex);
+            if (!uploadIdValido(upload_id) || !std::filesystem::exists(caminhoUpload(upload_id)))
+                return crow::response(404, "Erro: Upload não encontrado.");
+
+            uintmax_t atual = std::filesystem::file_size(caminhoUpload(upload_id));
+            crow::json::wvalue resposta;
+            if (offset != atual)
             {
-                if (!body.has("username"))
-                    return crow::response(400, "Erro: username não fornecido");
-                std::string username = body["username"].s();
+                resposta["offset"] = (int64_t)atual;
+                return crow::response(409, resposta);
+            }
+            if (atual + req.body.size() > MAX_UPLOAD_SIZE)
+                return crow::response(413, "Erro: Imagem demasiado grande.");
+
+            std::ofstream file(caminhoUpload(upload_id), std::ios::binary | std::ios::app);
+            file.write(req.body.data(), req.body.size());
+            file.close();
 
-                if (!db.utilizadorExiste(username))
-                    return crow::response(400, "Erro: user não existe");
-                int id = db.obterUtilizadorId(username);
-                if (!db.atualizarBanner(file_name, id))
-                    return crow::response(400, "Erro: interno");
+            resposta["offset"] = (int64_t)(atual + req.body.size());
+            return crow::response(200, resposta);
+        });
+
+        // Upload_Finish Route: move o ficheiro completo para images/ e associa-o como /upload_image
+        CROW_ROUTE(app, "/upload_finish").methods("POST"_method)([this](const crow::request& req)
+        {
+            try
+            {
+                auto body = crow::json::load(req.body);
+                if (!body || !body.has("upload_id") || !body.has("op")) return crow::response(400, "Erro: Dados inválidos.");
+
+                std::string upload_id = body["upload_id"].s();
+                std::string file_name;
+                {
+                    std::lock_guard<std::mutex> lock(uploadsMutex);
+                    if (!uploadIdValido(upload_id) || !std::filesystem::exists(caminhoUpload(upload_id)))
+                        return crow::response(404, "Erro: Upload não encontrado.");
+
+                    file_name = novoCaminhoImagem();
+                    std::filesystem::rename(caminhoUpload(upload_id), file_name);
+                }
+
+                return associarImagem(body, file_name);
+            }
+            catch (const std::exception& e) {
+                return crow::response(500, std::string("Erro interno: ") + e.what());
             }
-            // Responde com sucesso e os campos adicionais
-            return crow::response(200, "Imagem guardada com sucesso");
         });
-    
+
         CROW_ROUTE(app, "/download_image").methods("POST"_method)([this](const crow::request& req)
         {
             auto body = crow::json::load(req.body);
@@ -1444,11 +2435,12 @@ public:
         CROW_ROUTE(app, "/adicionar_refeicao").methods("POST"_method)([this](const crow::request& req) {
             try {
                 auto body = crow::json::load(req.body);
-                if (!body || !body.has("user_id") || !body.has("recipe_id") || !body.has("meal_type") || !body.has("day_of_week")) {
+                if (!body || !(body.has("user_id") || body.has("username")) || !body.has("recipe_id") || !body.has("meal_type") || !body.has("day_of_week")) {
                     return crow::response(400, "Erro: Dados inválidos.");
                 }
 
-                int user_id = body["user_id"].i();
+                int user_id = idDoPedido(body);
+                if (user_id == -1) return crow::response(404, "Erro: Utilizador não encontrado.");
                 int recipe_id = body["recipe_id"].i();
                 std::string meal_type = body["meal_type"].s();
                 std::string day_of_week = body["day_of_week"].s();
@@ -1466,15 +2458,17 @@ public:
         CROW_ROUTE(app, "/remover_refeicao").methods("POST"_method)([this](const crow::request& req) {
             try {
                 auto body = crow::json::load(req.body);
-                if (!body || !body.has("user_id") || !body.has("recipe_id") || !body.has("day_of_week")) {
+                if (!body || !(body.has("user_id") || body.has("username")) || !body.has("recipe_id") || !body.has("day_of_week")) {
                     return crow::response(400, "Erro: Dados inválidos.");
                 }
 
-                int user_id = body["user_id"].i();
+                int user_id = idDoPedido(body);
+                if (user_id == -1) return crow::response(404, "Erro: Utilizador não encontrado.");
                 int recipe_id = body["recipe_id"].i();
                 std::string day_of_week = body["day_of_week"].s();
+                std::string meal_type = body.has("meal_type") ? std::string(body["meal_type"].s()) : "";
 
-                if (db.removerRefeicao(user_id, recipe_id, day_of_week)) {
+                if (db.removerRefeicao(user_id, recipe_id, day_of_week, meal_type)) {
                     return crow::response(200, "Refeição removida com sucesso!");
                 }
                 return crow::response(500, "Erro interno ao remover a refeição.");
@@ -1484,6 +2478,35 @@ public:
             }
             });
 
+        // Semana planeada de um utilizador; as receitas vêm depois num só /get_recipes
+        CROW_ROUTE(app, "/listar_refeicoes").methods("POST"_method)([this](const crow::request& req) {
+            try {
+                auto body = crow::json::load(req.body);
+                if (!body || !(body.has("user_id") || body.has("username"))) {
+                    return crow::response(400, "Erro: Dados inválidos.");
+                }
+
+                int user_id = idDoPedido(body);
+                if (user_id == -1) return crow::response(404, "Erro: Utilizador não encontrado.");
+
+                std::vector<crow::json::wvalue> lista;
+                for (const auto& linha : db.obterRefeicoes(user_id)) {
+                    crow::json::wvalue refeicao;
+                    refeicao["id"] = std::get<0>(linha);
+                    refeicao["recipe_id"] = std::get<1>(linha);
+                    refeicao["meal_type"] = std::get<2>(linha);
+                    refeicao["day_of_week"] = std::get<3>(linha);
+                    lista.push_back(std::move(refeicao));
+                }
+                crow::json::wvalue resposta;
+                resposta["refeicoes"] = std::move(lista);
+                return crow::response(200, resposta);
+            }
+            catch (const std::exception& e) {
+                return crow::response(500, std::string("Erro interno: ") + e.what());
+            }
+            });
+
         CROW_ROUTE(app, "/get_notifications").methods("POST"_method)([this](const crow::request& req)
         {
             try
@@ -1514,6 +2537,79 @@ public:
             }
         });
 
+        // Notificações de "username" com id > "cursor" (0 para todas), por ordem de id.
+        // O cliente guarda o maior id que já tem e só pede as que vieram depois.
+        CROW_ROUTE(app, "/notifications_since").methods("POST"_method)([this](const crow::request& req)
+            {
+                try
+                {
+                    auto body = crow::json::load(req.body);
+                    if (!body || !body.has("username"))
+                        return crow::response(400, "Erro: Dados inválidos.");
+
+                    std::string username = body["username"].s();
+                    if (!db.utilizadorExiste(username)) return crow::response(400, "Erro: Utilizador não existe.");
+
+                    int cursor = body.has("cursor") ? static_cast<int>(body["cursor"].i()) : 0;
+                    int limite = body.has("limit") ? std::max(1, std::min(static_cast<int>(body["limit"].i()), MAX_PAGE_SIZE)) : NOTIFS_PAGE_SIZE;
+
+                    auto notificacoes = db.obterNotifsDesde(db.obterUtilizadorId(username), cursor, limite);
+
+                    crow::json::wvalue resposta;
+                    std::vector<crow::json::wvalue> lista;
+                    for (const auto& linha : notificacoes)
+                    {
+                        crow::json::wvalue notificacao;
+                        notificacao["id"] = std::get<0>(linha);
+                        notificacao["origin_user_id"] = std::get<1>(linha);
+                        notificacao["origin_username"] = std::get<2>(linha);
+                        notificacao["message"] = std::get<3>(linha);
+                        lista.push_back(std::move(notificacao));
+                    }
+                    resposta["notifications"] = std::move(lista);
+                    if (static_cast<int>(notificacoes.size()) == limite) resposta["next_cursor"] = std::get<0>(notificacoes.back());
+                    else resposta["next_cursor"] = nullptr;
+                    return crow::response(200, resposta);
+                }
+                catch (const std::exception& e)
+                {
+                    return crow::response(500, std::string("Erro interno: ") + e.what());
+                }
+            });
+
+        // Notificações em tempo real: ws://.../ws/notifications?username=... recebe cada notificação nova
+        // (o mesmo JSON que /notifications_since) assim que é criada. O envio é feito pelo Crow na thread
+        // da ligação, por isso quem cria a notificação não fica à espera dos clientes.
+        CROW_WEBSOCKET_ROUTE(app, "/ws/notifications")
+            .onaccept([this](const crow::request& req, void** userdata)
+            {
+                try
+                {
+                    const char* username = req.url_params.get("username");
+                    if (!username || !db.utilizadorExiste(username)) return false;
+                    *userdata = reinterpret_cast<void*>(static_cast<intptr_t>(db.obterUtilizadorId(username)));
+                    return true;
+                }
+                catch (const std::exception&)
+                {
+                    return false;
+                }
+            })
+            .onopen([this](crow::websocket::connection& ligacao)
+            {
+                std::lock_guard<std::mutex> lock(notifsMutex);
+                ligacoesNotifs[utilizadorDaLigacao(ligacao)].insert(&ligacao);
+            })
+            // Também é chamado quando a ligação cai sem aviso; o resto dos argumentos muda entre versões do Crow
+            .onclose([this](crow::websocket::connection& ligacao, const std::string&, auto...)
+            {
+                std::lock_guard<std::mutex> lock(notifsMutex);
+                auto ligacoes = ligacoesNotifs.find(utilizadorDaLigacao(ligacao));
+                if (ligacoes == ligacoesNotifs.end()) return;
+                ligacoes->second.erase(&ligacao);
+                if (ligacoes->second.empty()) ligacoesNotifs.erase(ligacoes);
+            });
+
         CROW_ROUTE(app, "/get_notif").methods("POST"_method)([this](const crow::request& req)
             {
                 try
@@ -1,17 +1,82 @@
+import time
+
+STARTED = time.perf_counter()  # Origin of the startup trace, taken before any other import
+
+import importlib
+from collections import OrderedDict
+
 import flet as ft
-from components.sidebar import Sidebar
-from pages.home import home_page
-from pages.test_search import search_page
-from pages.own_recipes import own_recipes_page
-from pages.saved_recipes import saved_recipes_page
-from pages.notifications import notifications_page
-from pages.profile import profile_page
-from pages.settings import settings_page
+# Only what the login form needs is imported here; every other page is imported on first navigation
 from pages.login import login_page
 from pages.signup import signup_page
-from pages.logout import logout_dialog
-from pages.other_profile import other_profile_page
-from pages.meal_planner import meal_planner_page
+from services.health import health
+from services.metrics import metrics
+
+metrics.startup_origin = STARTED
+metrics.mark_startup("imports")
+
+PAGE_CACHE_MAX_CONTROLS = 20000  # Memory budget for kept-alive pages, measured in controls
+PAGE_STALE_AFTER = 60  # Seconds before a revisited page refreshes its data in the background
+
+
+def page_factory(module, name):
+    """Import pages.<module> (once) and return its page function."""
+    return getattr(importlib.import_module(f"pages.{module}"), name)
+
+
+def count_controls(control):
+    """Number of controls in a tree, used as a cheap estimate of its memory footprint."""
+    return 1 + sum(count_controls(child) for child in control._get_children())
+
+
+class PageCache:
+    """Keeps visited pages alive between sidebar clicks.
+
+    Cached pages stay in the content column and are only hidden, so their state
+    survives and build() / did_mount() don't run again. The least recently shown
+    pages are dropped once all of them together go over the control budget.
+    """
+
+    def __init__(self, max_controls=PAGE_CACHE_MAX_CONTROLS, stale_after=PAGE_STALE_AFTER):
+        self.max_controls = max_controls
+        self.stale_after = stale_after
+        self._pages = OrderedDict()  # section -> [control, last refreshed at]
+
+    def get(self, section):
+        entry = self._pages.get(section)
+        if entry is None:
+            return None
+        self._pages.move_to_end(section)
+        return entry[0]
+
+    def put(self, section, control):
+        self._pages[section] = [control, time.monotonic()]
+
+    def pop_stale(self, section):
+        """True (once) if the page's data is older than stale_after; the clock restarts."""
+        entry = self._pages[section]
+        if time.monotonic() - entry[1] < self.stale_after:
+            return False
+        entry[1] = time.monotonic()
+        return True
+
+    def evict(self, keep):
+        """Drop least recently shown pages until under budget. Returns the dropped controls."""
+        sizes = {section: count_controls(control) for section, (control, _) in self._pages.items()}
+        total = sum(sizes.values())
+        evicted = []
+        for section in list(self._pages):
+            if total <= self.max_controls:
+                break
+            if section == keep:
+                continue
+            total -= sizes[section]
+            evicted.append(self._pages.pop(section)[0])
+        return evicted
+
+    def clear(self):
+        self._pages.clear()
+
 
 class AppController:
     def __init__(self, page: ft.Page):
@@ -27,9 +92,14 @@ class AppController:
         self.sidebar = None  # Sidebar will be initialized later
         self.username = None  # Placeholder for the authenticated username
         self.SHOW_LOGIN_FIRST = True  # Flag to control login behavior
+        self.page_cache = PageCache()  # Sections kept alive while the user navigates
+        self.transient_page = None  # Page shown outside the cache (another user's profile)
+        self.notification_stream = None  # Live notifications of the logged-in user
+        self.sync = None  # Sends recipe changes made while the server was unreachable
 
     def run(self):
         """Entry point to start the application."""
+        health.start()  # Every page and the Sidebar read the server state from here
         if self.SHOW_LOGIN_FIRST:
             self.show_login_page()
         else:
@@ -38,8 +108,10 @@ class AppController:
     def show_login_page(self):
         """Displays the login page."""
         print("Showing login page...")
+        metrics.set_page("Login")
 
         def go_to_signup():
+            metrics.set_page("Signup")
             self.page.controls.clear()
             signup_content = ft.Column(expand=True)
             signup_content.controls.append(signup_page(self.show_signup_page, self.show_login_page))
@@ -51,14 +123,23 @@ class AppController:
             self.load_main_layout(username)
 
         self.page.controls.clear()
+        self.page_cache.clear()
+        if self.notification_stream is not None:
+            self.notification_stream.stop()
+            self.notification_stream = None
+        if self.sync is not None:
+            self.sync.stop()
+            self.sync = None
         self.content.controls.clear()
         self.content.controls.append(login_page(handle_successful_login, go_to_signup))
         self.page.add(self.content)
         self.page.update()
+        metrics.mark_startup("first_frame")
 
     def show_signup_page(self):
         """Displays the signup page."""
         print("Showing signup page...")
+        metrics.set_page("Signup")
         self.page.controls.clear()
         signup_content = ft.Column(expand=True)
         signup_content.controls.append(signup_page(self.show_signup_page, self.show_login_page))
@@ -68,14 +149,19 @@ class AppController:
     def open_full_profile(self, username):
         """Opens the full profile of another user."""
         print(f"Opening full profile of {username}")
-        self.content.controls.clear()  # Clear the content
-        self.content.controls.append(
-            other_profile_page(
-                page=self.page,
-                username=username,
-                back_to_search=lambda: self.load_main_layout(self.username)  # Return to the main layout
-            )
+        started = time.perf_counter()
+        metrics.set_page("Other Profile")
+        if self.transient_page in self.content.controls:
+            self.content.controls.remove(self.transient_page)
+        self.transient_page = page_factory("other_profile", "other_profile_page")(
+            page=self.page,
+            username=username,
+            back_to_search=lambda: self.show_section("Search", None)  # Back to the kept-alive search page
         )
+        # Hide the cached pages instead of clearing them, so the search results survive
+        for control in self.content.controls:
+            control.visible = False
+        self.content.controls.append(self.transient_page)
 
         # Ensure `self.content` is part of the page layout
         if self.content not in self.page.controls:
@@ -83,49 +169,100 @@ class AppController:
             self.page.add(ft.Row([self.sidebar, self.content], expand=True))
 
         self.page.update()  # Update the page
+        metrics.record_page_view("Other Profile", time.perf_counter() - started, built=True)
+
+    def show_section(self, section, factory):
+        """Show a section, reusing its page if it is still alive in the cache.
+
+        factory() builds the page on the first visit or after it was evicted.
+        """
+        started = time.perf_counter()
+        metrics.set_page(section)
+        if self.transient_page in self.content.controls:
+            self.content.controls.remove(self.transient_page)
+        self.transient_page = None
 
+        page_control = self.page_cache.get(section)
+        is_new = page_control is None
+        if is_new:
+            if factory is None:
+                return
+            page_control = factory()
+            self.page_cache.put(section, page_control)
+            self.content.controls.append(page_control)
+
+        for control in self.content.controls:
+            control.visible = control is page_control
+        for evicted in self.page_cache.evict(keep=section):
+            self.content.controls.remove(evicted)
+        self.page.update()
+
+        if not is_new:
+            # Flet drops hidden widgets on the client, so scrollable pages put their offset back
+            if hasattr(page_control, "restore_scroll"):
+                page_control.restore_scroll()
+            if hasattr(page_control, "refresh") and self.page_cache.pop_stale(section):
+                page_control.refresh()
+        metrics.record_page_view(section, time.perf_counter() - started, built=is_new)
 
     def load_main_layout(self, username):
         print("Loading main layout...")
+        # Not needed by the login form, so kept out of the startup path
+        from components.sidebar import Sidebar
+        from services.notifications import NotificationStream
+        from services.sync import sync_queue
+
+        # One connection per session; a previous user's stream is closed
+        if self.notification_stream is not None:
+            self.notification_stream.stop()
+        stream = self.notification_stream = NotificationStream(username)
+
+        sections = {
+            "Home": lambda: page_factory("home", "home_page")(),
+            "Search": lambda: page_factory("test_search", "search_page")(username, self.open_full_profile),
+            "Own Recipes": lambda: page_factory("own_recipes", "own_recipes_page")(self.page, username),
+            "Saved Recipes": lambda: page_factory("saved_recipes", "saved_recipes_page")(self.page, username),
+            "Meal Planner": lambda: page_factory("meal_planner", "meal_planner_page")(username),
+            "Notifications": lambda: page_factory("notifications", "notifications_page")(stream),
+            "Profile": lambda: page_factory("profile", "profile_page")(self.page, username, self.show_login_page),
+            "Settings": lambda: page_factory("settings", "settings_page")(self.page, self.username, self.show_login_page),
+        }
 
         def on_section_selected(section):
             print(f"Section selected: {section}")
-            self.content.controls.clear()
-
-            if section == "Home":
-                self.content.controls.append(home_page())
-            elif section == "Search":
-                self.content.controls.append(search_page(username, self.open_full_profile))
-            elif section == "Own Recipes":
-                self.content.controls.append(own_recipes_page(self.page, username))
-            elif section == "Saved Recipes":
-                self.content.controls.append(saved_recipes_page(self.page, username))
-            elif section == "Meal Planner":
-                self.content.controls.append(meal_planner_page(username))
-            elif section == "Notifications":
-                self.content.controls.append(notifications_page())
-            elif section == "Profile":
-                self.content.controls.append(profile_page(self.page, username, self.show_login_page))
-            elif section == "Settings":
-                self.content.controls.append(settings_page(self.page, self.username, self.show_login_page))
-            elif section == "Logout":
-                logout_dialog(self.page, self.show_login_page)
+            if section == "Logout":
+                page_factory("logout", "logout_dialog")(self.page, self.show_login_page)
+                self.page.update()
+            else:
+                self.show_section(section, sections[section])
+                if section == "Notifications":
+                    stream.mark_seen()
 
-            self.page.update()
+        # Pages of a previous session belong to another user
+        self.page_cache.clear()
+        self.content.controls.clear()
+        self.transient_page = None
 
-        self.sidebar = Sidebar(on_section_selected, username)
+        sidebar = self.sidebar = Sidebar(on_section_selected, username)
+        stream.subscribe(lambda new: sidebar.set_unread(stream.unread_count()))
         self.page.controls.clear()
         main_layout = ft.Row([self.sidebar, self.content], expand=True)
         self.page.add(main_layout)
         self.page.update()
 
         on_section_selected("Home")
+        stream.start()
+        # Changes queued in an earlier session are sent as soon as the server answers
+        self.sync = sync_queue(username)
+        self.sync.start()
 
 
 
 # Flet entry point
 def main(page: ft.Page):
+    metrics.mark_startup("window")
     app = AppController(page)
     app.run()
 
-ft.app(target=main)
+if __name__ == "__main__":
+    ft.app(target=main)
@@ -1,10 +1,29 @@
 import flet as ft
+from services.background import run_on_ui
+from services.health import DOWN, UP, health
+
+# Server state shown at the bottom of the sidebar: (dot color, label)
+SERVER_STATES = {
+    UP: ("green", "Server online"),
+    DOWN: ("red", "Server offline"),
+}
 
 class Sidebar(ft.UserControl):
     def __init__(self, on_section_selected, username):
         self.on_section_selected = on_section_selected
         self.username = username  # Store the username
         self.current_section = "Home"  # Track the current selected section
+        # Unread notifications count, hidden while there are none
+        self.notification_badge = ft.Container(
+            content=ft.Text("", size=11, weight="bold", color="white"),
+            bgcolor="red",
+            border_radius=10,
+            padding=ft.padding.symmetric(horizontal=6, vertical=1),
+            visible=False,
+        )
+        # Reachability of the server, kept current by the shared health monitor
+        self.server_dot = ft.Icon(name=ft.icons.CIRCLE, size=10, color="white54")
+        self.server_label = ft.Text("Checking server...", size=12, color="white54")
         super().__init__()
 
     def build(self):
@@ -53,10 +72,14 @@ class Sidebar(ft.UserControl):
                     self.create_list_tile(ft.icons.BOOK, "Own Recipes", "Own Recipes"),
                     self.create_list_tile(ft.icons.BOOKMARK, "Saved Recipes", "Saved Recipes"),
                     self.create_list_tile(ft.icons.FOOD_BANK, "Meal Planner", "Meal Planner"),
-                    self.create_list_tile(ft.icons.NOTIFICATIONS, "Notifications", "Notifications"),
+                    self.create_list_tile(ft.icons.NOTIFICATIONS, "Notifications", "Notifications", badge=self.notification_badge),
                     self.create_list_tile(ft.icons.SETTINGS, "Settings", "Settings"),
                     # Flexible space to push the logout button to the end
                     ft.Container(expand=True),
+                    ft.Container(
+                        content=ft.Row(controls=[self.server_dot, self.server_label], spacing=8),
+                        padding=ft.padding.symmetric(horizontal=12),
+                    ),
                     # Logout button
                     self.create_list_tile(ft.icons.LOGOUT, "Log Out", "Logout", highlight_color="red"),
                 ],
@@ -69,7 +92,7 @@ class Sidebar(ft.UserControl):
             border_radius=10,
         )
 
-    def create_list_tile(self, icon_name, title, section, highlight_color="white10"):
+    def create_list_tile(self, icon_name, title, section, highlight_color="white10", badge=None):
         # Check if the current section is the one selected
         is_selected = section == self.current_section
         bgcolor = "bluegrey700" if is_selected else None
@@ -93,7 +116,7 @@ class Sidebar(ft.UserControl):
                         size=14,
                         weight="bold",
                     ),
-                ],
+                ] + ([badge] if badge else []),
                 spacing=10,
                 alignment="start",
             ),
@@ -101,6 +124,26 @@ class Sidebar(ft.UserControl):
             bgcolor=bgcolor
         )
 
+    def set_unread(self, count):
+        """Show the number of unread notifications next to Notifications."""
+        self.notification_badge.content.value = "99+" if count > 99 else str(count)
+        self.notification_badge.visible = count > 0
+        if self.notification_badge.page:
+            self.notification_badge.update()
+
+    def did_mount(self):
+        health.subscribe(self.set_server_state)
+        run_on_ui(self.set_server_state, health.state)
+
+    def will_unmount(self):
+        health.unsubscribe(self.set_server_state)
+
+    def set_server_state(self, state):
+        """Show whether the server is reachable ("up", "down" or "unknown")."""
+        self.server_dot.color, self.server_label.value = SERVER_STATES.get(state, ("white54", "Checking server..."))
+        if self.server_label.page:
+            self.update()
+
     def on_section_selected_handler(self, section):
         # Update the current section to the selected one
         self.current_section = section
@@ -1,7 +1,10 @@
 import flet as ft
 import requests
+from services.api_client import api
+from services.background import run_in_background, run_on_ui
+from services.health import DOWN, UP, health
+from services.metrics import metrics
 
-BASE_URL = "http://127.0.0.1:18080"
 
 class LoginPage(ft.UserControl):
     def __init__(self, on_login, go_to_signup):
@@ -14,6 +17,8 @@ class LoginPage(ft.UserControl):
         self.username = ft.TextField(label="Username", width=250, autofocus=True)
         self.password = ft.TextField(label="Password", password=True, width=250)
         self.error_message = ft.Text(value="", color="red")
+        self.login_button = ft.ElevatedButton(text="Login", on_click=self.handle_login)
+        self.progress_ring = ft.ProgressRing(width=20, height=20, visible=False)
 
         # Server status indicator
         self.server_status_text = ft.Text(size=14, color="white")
@@ -32,7 +37,8 @@ class LoginPage(ft.UserControl):
                                     ft.Container(height=20),
                                     self.username,
                                     self.password,
-                                    ft.ElevatedButton(text="Login", on_click=self.handle_login),
+                                    self.login_button,
+                                    self.progress_ring,
                                     self.error_message,
                                     ft.TextButton(
                                         text="Don't have an account yet? Sign up now.",
@@ -66,59 +72,72 @@ class LoginPage(ft.UserControl):
 
     def did_mount(self):
         # Method to be called after the control is added to the UI
-        self.update_server_status()
+        metrics.mark_startup("interactive")  # The form is on screen and takes input; the status check doesn't block it
+        # The shared health monitor keeps the indicator current while the form is open
+        health.subscribe(self.update_server_status)
+        run_on_ui(self.update_server_status, health.state)
+        health.check_now()
 
-    def update_server_status(self):
-        # Check server status and update the text accordingly
-        try:
-            # Attempting to make a request to the server status endpoint
-            response = requests.get(f"{BASE_URL}/status", timeout=5)
-            if response.status_code == 200:
-                self.server_status_text.value = "Server Status: ON"
-            else:
-                self.server_status_text.value = "Server Status: OFF"
-        except requests.exceptions.ConnectionError:
-            self.server_status_text.value = "Server Status: OFF"
-        except requests.exceptions.Timeout:
+    def will_unmount(self):
+        health.unsubscribe(self.update_server_status)
+
+    def update_server_status(self, state):
+        # Update the text with the state reported by the health monitor
+        if state == UP:
+            self.server_status_text.value = "Server Status: ON"
+        elif state == DOWN:
             self.server_status_text.value = "Server Status: OFF"
-        except Exception as ex:
-            # For any other exceptions, set server status to OFF
-            self.server_status_text.value = f"Server Status: OFF ({str(ex)})"
+        else:
+            self.server_status_text.value = "Server Status: checking..."
 
         # Update the UI to reflect the server status
-        self.server_status_text.update()
+        if self.server_status_text.page:
+            self.server_status_text.update()
 
     def handle_login(self, e):
-        url = f"{BASE_URL}/login"
         payload = {
             "username": self.username.value,
             "password": self.password.value
         }
-        try:
-            response = requests.post(url, json=payload)
+        self.set_loading(True)
+        run_in_background(
+            api.post, "/login", payload,
+            on_success=self.handle_login_response,
+            on_error=self.handle_login_error,
+        )
 
-            if response.status_code == 200:
-                print("Login successful. Calling on_login...")
-                self.on_login(self.username.value)  # Pass username to the main layout
-            elif response.status_code == 404:  # User not found
-                self.error_message.value = "User does not exist. Please check the username."
-                self.error_message.update()
-            elif response.status_code == 401:  # Incorrect password
-                self.error_message.value = "Incorrect password. Please try again."
-                self.error_message.update()
-            else:  # Other unexpected errors
-                self.error_message.value = "An unexpected error occurred. Please try again later."
-                self.error_message.update()
-        except requests.exceptions.ConnectionError:
-            self.error_message.value = "Unable to connect to the server. Please try again later."
+    def handle_login_response(self, response):
+        self.set_loading(False)
+        if response.status_code == 200:
+            print("Login successful. Calling on_login...")
+            self.on_login(self.username.value)  # Pass username to the main layout
+        elif response.status_code == 404:  # User not found
+            self.error_message.value = "User does not exist. Please check the username."
             self.error_message.update()
-        except requests.exceptions.Timeout:
-            self.error_message.value = "Request timed out. Please try again."
+        elif response.status_code == 401:  # Incorrect password
+            self.error_message.value = "Incorrect password. Please try again."
             self.error_message.update()
-        except Exception as ex:
-            self.error_message.value = f"An error occurred: {str(ex)}"
+        else:  # Other unexpected errors
+            self.error_message.value = "An unexpected error occurred. Please try again later."
             self.error_message.update()
 
+    def handle_login_error(self, ex):
+        self.set_loading(False)
+        if isinstance(ex, requests.exceptions.ConnectionError):
+            self.error_message.value = "Unable to connect to the server. Please try again later."
+        elif isinstance(ex, requests.exceptions.Timeout):
+            self.error_message.value = "Request timed out. Please try again."
+        else:
+            self.error_message.value = f"An error occurred: {str(ex)}"
+        self.error_message.update()
+
+    def set_loading(self, loading):
+        # Disable the button and show a spinner while the login request is in flight
+        self.login_button.disabled = loading
+        self.progress_ring.visible = loading
+        self.error_message.value = ""
+        self.update()
+
 # Function to instantiate the login page
 def login_page(on_login, go_to_signup):
     return LoginPage(on_login, go_to_signup)
@@ -0,0 +1,317 @@
+import flet as ft
+from services.api_client import api
+from services.background import run_in_background
+from services.recipe_service import get_recipes, list_recipe_page
+from services.shopping_list import ShoppingList
+
+# Stored as the server and its unit tests write them; shown in English
+DAYS = [
+    ("Segunda-feira", "Monday"),
+    ("Terça-feira", "Tuesday"),
+    ("Quarta-feira", "Wednesday"),
+    ("Quinta-feira", "Thursday"),
+    ("Sexta-feira", "Friday"),
+    ("Sábado", "Saturday"),
+    ("Domingo", "Sunday"),
+]
+MEAL_TYPES = [("Almoço", "Lunch"), ("Jantar", "Dinner")]
+
+
+class MealPlannerPage(ft.UserControl):
+    """Week view of the planned meals, with the shopping list for the whole week.
+
+    The week is one /listar_refeicoes plus one batched get_recipes for every
+    recipe in it. Adding or removing a meal updates its slot and only the
+    shopping list rows of that recipe's ingredients; the request is sent in
+    the background and undone if the server refuses it.
+    """
+
+    def __init__(self, username):
+        super().__init__()
+        self.username = username
+        self.recipes = {}  # recipe id -> Recipe of every recipe in the week
+        self.slots = {}  # (day, meal type) -> Column holding that slot's meals
+        self.meal_controls = {}  # (day, meal type, recipe id) -> control in the slot
+        self.shopping_list = ShoppingList()
+        self.shopping_rows = {}  # ingredient key -> row on screen
+        self.shopping_column = ft.Column(spacing=2, scroll=ft.ScrollMode.AUTO, expand=True)
+        self.empty_list_text = ft.Text("Plan a meal to build the shopping list.", color="white54")
+        self.loading_bar = ft.ProgressBar(visible=False)
+        self.choices = None  # Own and saved recipes offered in the add dialog, reloaded every time it opens
+
+    def build(self):
+        columns = []
+        for day, day_label in DAYS:
+            meals = []
+            for meal_type, meal_label in MEAL_TYPES:
+                slot = ft.Column(spacing=4)
+                self.slots[(day, meal_type)] = slot
+                meals.append(
+                    ft.Container(
+                        content=ft.Column(
+                            controls=[
+                                ft.Row(
+                                    controls=[
+                                        ft.Text(meal_label, size=12, color="white70"),
+                                        ft.IconButton(
+                                            icon=ft.icons.ADD,
+                                            icon_size=16,
+                                            tooltip=f"Add to {day_label} {meal_label.lower()}",
+                                            on_click=lambda e, d=day, m=meal_type: self.open_add_meal_dialog(d, m),
+                                        ),
+                                    ],
+                                    alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                                ),
+                                slot,
+                            ],
+                            spacing=2,
+                        ),
+                        bgcolor="bluegrey800",
+                        border_radius=8,
+                        padding=6,
+                    )
+                )
+            columns.append(
+                ft.Container(
+                    content=ft.Column(
+                        controls=[ft.Text(day_label, weight=ft.FontWeight.BOLD)] + meals,
+                        spacing=6,
+                    ),
+                    width=130,
+                )
+            )
+
+        return ft.Container(
+            content=ft.Column(
+                controls=[
+                    ft.Text("Meal Planner", size=30, weight=ft.FontWeight.BOLD),
+                    self.loading_bar,
+                    ft.Row(
+                        controls=[
+                            ft.Row(controls=columns, spacing=8, scroll=ft.ScrollMode.AUTO, expand=True),
+                            ft.Container(
+                                content=ft.Column(
+                                    controls=[
+                                        ft.Text("Shopping List", size=20, weight=ft.FontWeight.BOLD),
+                                        ft.Divider(),
+                                        self.empty_list_text,
+                                        self.shopping_column,
+                                    ],
+                                ),
+                                width=260,
+                                height=550,
+                                bgcolor="bluegrey900",
+                                border_radius=10,
+                                padding=10,
+                            ),
+                        ],
+                        vertical_alignment=ft.CrossAxisAlignment.START,
+                        expand=True,
+                    ),
+                ],
+                expand=True,
+            ),
+            padding=20,
+            expand=True,
+        )
+
+    def did_mount(self):
+        self.set_loading(True)
+        run_in_background(self.load_week, on_success=self.show_week, on_error=self.show_load_error)
+
+    def load_week(self):
+        """Runs in the background: the planned meals, then all their recipes in one batched fetch."""
+        response = api.post("/listar_refeicoes", {"username": self.username})
+        if response.status_code != 200:
+            raise RuntimeError(response.text)
+        meals = response.json().get("refeicoes", [])
+        recipe_ids = list(dict.fromkeys(meal["recipe_id"] for meal in meals))
+        recipes = {recipe.id: recipe for recipe in get_recipes(recipe_ids)}
+        return meals, recipes
+
+    def show_week(self, result):
+        meals, recipes = result
+        self.recipes.update(recipes)
+        for meal in meals:
+            if meal["recipe_id"] in self.recipes:  # Recipes deleted since they were planned are skipped
+                self.show_meal(meal["day_of_week"], meal["meal_type"], meal["recipe_id"])
+        self.set_loading(False)
+        self.update()
+
+    def show_load_error(self, e):
+        self.set_loading(False)
+        self.show_snackbar(f"Could not load the meal plan: {e}")
+
+    def show_meal(self, day, meal_type, recipe_id):
+        """Put a meal in its slot and add its ingredients to the shopping list."""
+        key = (day, meal_type, recipe_id)
+        slot = self.slots.get((day, meal_type))
+        if slot is None or key in self.meal_controls:
+            return
+        recipe = self.recipes[recipe_id]
+        control = ft.Container(
+            content=ft.Row(
+                controls=[
+                    ft.Text(recipe.title, size=12, expand=True),
+                    ft.IconButton(
+                        icon=ft.icons.CLOSE,
+                        icon_size=14,
+                        tooltip="Remove",
+                        on_click=lambda e: self.remove_meal(day, meal_type, recipe_id),
+                    ),
+                ],
+                spacing=0,
+            ),
+            bgcolor="teal700",
+            border_radius=6,
+            padding=ft.padding.only(left=6),
+        )
+        self.meal_controls[key] = control
+        slot.controls.append(control)
+        self.update_shopping_rows(self.shopping_list.add(key, recipe.ingredient_list))
+
+    def hide_meal(self, day, meal_type, recipe_id):
+        key = (day, meal_type, recipe_id)
+        control = self.meal_controls.pop(key, None)
+        if control is None:
+            return
+        self.slots[(day, meal_type)].controls.remove(control)
+        self.update_shopping_rows(self.shopping_list.remove(key))
+
+    def update_shopping_rows(self, keys):
+        """Redraw only the shopping list rows whose count changed."""
+        for key in keys:
+            count = self.shopping_list.count(key)
+            row = self.shopping_rows.get(key)
+            if count == 0:
+                if row is not None:
+                    self.shopping_column.controls.remove(self.shopping_rows.pop(key))
+            elif row is None:
+                row = ft.Text(self.shopping_row_text(key, count), size=13)
+                self.shopping_rows[key] = row
+                # Keep the list alphabetical without re-sorting it
+                position = sum(1 for other in self.shopping_rows if other < key)
+                self.shopping_column.controls.insert(position, row)
+            else:
+                row.value = self.shopping_row_text(key, count)
+        self.empty_list_text.visible = not self.shopping_rows
+
+    def shopping_row_text(self, key, count):
+        name = self.shopping_list.name(key)
+        return f"• {name}" if count == 1 else f"• {name} (×{count} meals)"
+
+    def add_meal(self, day, meal_type, recipe):
+        """Show the meal at once; the server is told in the background."""
+        recipe_id = recipe.id
+        if (day, meal_type, recipe_id) in self.meal_controls:
+            return
+        self.recipes[recipe_id] = recipe
+        self.show_meal(day, meal_type, recipe_id)
+        self.update()
+
+        def on_response(response):
+            if response.status_code != 201:
+                undo(response.text)
+
+        def undo(error):
+            self.hide_meal(day, meal_type, recipe_id)
+            self.update()
+            self.show_snackbar(f"Could not add the meal: {error}")
+
+        payload = {"username": self.username, "recipe_id": recipe_id, "meal_type": meal_type, "day_of_week": day}
+        run_in_background(api.post, "/adicionar_refeicao", payload, on_success=on_response, on_error=undo)
+
+    def remove_meal(self, day, meal_type, recipe_id):
+        """Take the meal out at once; the server is told in the background."""
+        self.hide_meal(day, meal_type, recipe_id)
+        self.update()
+
+        def on_response(response):
+            if response.status_code != 200:
+                undo(response.text)
+
+        def undo(error):
+            self.show_meal(day, meal_type, recipe_id)
+            self.update()
+            self.show_snackbar(f"Could not remove the meal: {error}")
+
+        payload = {"username": self.username, "recipe_id": recipe_id, "meal_type": meal_type, "day_of_week": day}
+        run_in_background(api.post, "/remover_refeicao", payload, on_success=on_response, on_error=undo)
+
+    def open_add_meal_dialog(self, day, meal_type):
+        """Pick one of the user's own or saved recipes for a slot."""
+        dropdown = ft.Dropdown(label="Recipe", width=400, disabled=self.choices is None)
+        status = ft.Text("Loading your recipes..." if self.choices is None else "", color="white54")
+
+        def fill(choices):
+            self.choices = choices
+            dropdown.options = [ft.dropdown.Option(key=str(recipe.id), text=recipe.title) for recipe in choices]
+            dropdown.disabled = False
+            status.value = "" if choices else "You have no own or saved recipes yet."
+            if self.page:
+                self.page.update()
+
+        def show_error(e):
+            # The list shown (if any) stays; with none, the next open tries again
+            if self.choices is None:
+                status.value = f"Could not load your recipes: {e}"
+                if self.page:
+                    self.page.update()
+
+        def add(e):
+            recipe = next((recipe for recipe in self.choices or [] if str(recipe.id) == dropdown.value), None)
+            if recipe is None:
+                return
+            self.close_dialog()
+            self.add_meal(day, meal_type, recipe)
+
+        day_label = dict(DAYS)[day]
+        meal_label = dict(MEAL_TYPES)[meal_type]
+        self.page.dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Text(f"{day_label} {meal_label.lower()}", size=20, weight="bold"),
+            content=ft.Column(controls=[dropdown, status], tight=True),
+            actions=[
+                ft.TextButton("Add", on_click=add),
+                ft.TextButton("Cancel", on_click=lambda _: self.close_dialog()),
+            ],
+            actions_alignment="end",
+        )
+        self.page.dialog.open = True
+        self.page.update()
+
+        if self.choices is not None:
+            fill(self.choices)
+        # Reloaded on every open, so recipes added, saved or deleted since the last one show up
+        run_in_background(self.load_choices, on_success=fill, on_error=show_error)
+
+    def load_choices(self):
+        """Runs in the background: every own and saved recipe, page after page, in one batched fetch."""
+        recipe_ids = []
+        for saved in (False, True):
+            page = list_recipe_page(self.username, saved=saved)
+            while page is not None:
+                # Recipes still waiting in the sync queue have no server id to plan with yet
+                recipe_ids += [recipe_id for recipe_id in page[0] if recipe_id > 0 and recipe_id not in recipe_ids]
+                if page[1] is None:
+                    break
+                page = list_recipe_page(self.username, saved=saved, cursor=page[1])
+        return get_recipes(recipe_ids)
+
+    def set_loading(self, loading):
+        self.loading_bar.visible = loading
+        self.loading_bar.update()
+
+    def close_dialog(self):
+        if self.page.dialog:
+            self.page.dialog.open = False
+            self.page.update()
+
+    def show_snackbar(self, message):
+        self.page.snack_bar = ft.SnackBar(content=ft.Text(message))
+        self.page.snack_bar.open = True
+        self.page.update()
+
+
+def meal_planner_page(username):
+    return MealPlannerPage(username)
@@ -1,40 +1,85 @@
 import flet as ft
 
-def notifications_page():
-    return ft.Container(
-        content=ft.Column(
-            controls=[
-                ft.Text("Notifications", size=30, weight=ft.FontWeight.BOLD),
-                ft.Divider(),
-                ft.ListView(
-                    controls=[
-                        ft.ListTile(
-                            leading=ft.Icon(ft.icons.PERSON),
-                            title=ft.Text(""),
-                            subtitle=ft.Text(""),
-                        ),
-                        ft.ListTile(
-                            leading=ft.Icon(ft.icons.VIDEOCAM),
-                            title=ft.Text(""),
-                        ),
-                        ft.ListTile(
-                            leading=ft.Icon(ft.icons.PERSON),
-                            title=ft.Text(""),
-                            subtitle=ft.Text(""),
-                        ),
-                        ft.ListTile(
-                            leading=ft.Icon(ft.icons.SHIELD),
-                            title=ft.Text(""),
-                        ),
-                        ft.ListTile(
-                            leading=ft.Icon(ft.icons.BOLT),
-                            title=ft.Text(""),
-                            subtitle=ft.Text(""),
-                        ),
-                    ]
-                ),
-            ],
-            alignment=ft.MainAxisAlignment.START,
-        ),
-        padding=20,
-    )
+from services.background import run_in_background, run_on_ui
+
+
+class NotificationsPage(ft.UserControl):
+    """Notifications of the logged-in user, newest first, updated live by the NotificationStream.
+
+    Only the notifications the stream reports as new are turned into controls;
+    the ones already on screen are never rebuilt.
+    """
+
+    def __init__(self, stream):
+        super().__init__()
+        self.stream = stream
+        self.tiles = {}  # notification id -> ListTile on screen
+        self.list_view = ft.ListView(expand=True, spacing=5)
+        self.empty_text = ft.Text("No notifications yet.", color="white54")
+
+    def build(self):
+        return ft.Container(
+            content=ft.Column(
+                controls=[
+                    ft.Text("Notifications", size=30, weight=ft.FontWeight.BOLD),
+                    ft.Divider(),
+                    self.empty_text,
+                    self.list_view,
+                ],
+                alignment=ft.MainAxisAlignment.START,
+                expand=True,
+            ),
+            padding=20,
+            expand=True,
+        )
+
+    def did_mount(self):
+        self.stream.subscribe(self.on_stream_changed)
+        run_on_ui(self.on_stream_changed, self.stream.items())
+
+    def will_unmount(self):
+        self.stream.unsubscribe(self.on_stream_changed)
+
+    def on_stream_changed(self, new):
+        # New notifications go on top, oldest of the batch first so the newest ends up first
+        for notification in sorted(new, key=lambda n: n["id"]):
+            if notification["id"] not in self.tiles:
+                tile = self.create_tile(notification)
+                self.tiles[notification["id"]] = tile
+                self.list_view.controls.insert(0, tile)
+
+        # Dismissed ones (here or from another page) leave the list
+        current = {notification["id"] for notification in self.stream.items()}
+        for notification_id in [i for i in self.tiles if i not in current]:
+            self.list_view.controls.remove(self.tiles.pop(notification_id))
+
+        self.empty_text.visible = not self.tiles
+        if self.visible:
+            self.stream.mark_seen()
+        if self.page:
+            self.update()
+
+    def create_tile(self, notification):
+        username = notification["origin_username"]
+        return ft.ListTile(
+            leading=ft.CircleAvatar(content=ft.Text(username[:1].upper())),
+            title=ft.Text(username, weight=ft.FontWeight.BOLD),
+            subtitle=ft.Text(notification["message"]),
+            trailing=ft.IconButton(
+                icon=ft.icons.CLOSE,
+                tooltip="Dismiss",
+                on_click=lambda e: self.dismiss(notification["id"]),
+            ),
+        )
+
+    def dismiss(self, notification_id):
+        def on_response(response):
+            if response.status_code not in (200, 404):
+                print(f"Failed to dismiss notification: {response.text}")
+
+        # The stream drops it locally and tells every listener, this page included
+        run_in_background(self.stream.dismiss, notification_id, on_success=on_response)
+
+
+def notifications_page(stream):
+    return NotificationsPage(stream)
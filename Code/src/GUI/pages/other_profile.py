@@ -1,9 +1,8 @@
 import flet as ft
-import requests
+from services.assets import avatar_base64, banner_base64
+from services.background import run_in_background
+from services.image_cache import profile_images
 
-BASE_URL = "http://127.0.0.1:18080"
-PLACEHOLDER_PROFILE_PIC = "https://via.placeholder.com/150"
-PLACEHOLDER_BANNER = "https://via.placeholder.com/800x200"
 
 class OtherProfilePage(ft.UserControl):
     def __init__(self, page, username, back_to_search):
@@ -14,6 +13,9 @@ class OtherProfilePage(ft.UserControl):
         self.user_info = {}  # To store additional user info, e.g., connections
 
     def build(self):
+        # Bundled placeholders until (and unless) the user's own pictures are available
+        self.banner_image = ft.Image(src_base64=banner_base64(), fit=ft.ImageFit.COVER)
+        self.profile_image = ft.Image(src_base64=avatar_base64(self.username), fit=ft.ImageFit.COVER)
 
         return ft.Container(
             width=1080,
@@ -22,19 +24,13 @@ class OtherProfilePage(ft.UserControl):
                 controls=[
                     # Banner
                     ft.Container(
-                        content=ft.Image(
-                            src=PLACEHOLDER_BANNER,
-                            fit=ft.ImageFit.COVER,
-                        ),
+                        content=self.banner_image,
                         height=200,
                         width=1080,
                     ),
                     # Profile Picture
                     ft.Container(
-                        content=ft.Image(
-                            src=PLACEHOLDER_PROFILE_PIC,
-                            fit=ft.ImageFit.COVER,
-                        ),
+                        content=self.profile_image,
                         height=150,
                         width=150,
                         border_radius=ft.border_radius.all(75),
@@ -85,6 +81,21 @@ class OtherProfilePage(ft.UserControl):
             ),
         )
 
+    def did_mount(self):
+        # Pictures come from the local image cache; only missing ones are downloaded
+        run_in_background(profile_images, self.username, on_success=self.show_profile_images)
+
+    def show_profile_images(self, paths):
+        profile_pic, banner = paths
+        if profile_pic:
+            self.profile_image.src = profile_pic
+            self.profile_image.src_base64 = None
+        if banner:
+            self.banner_image.src = banner
+            self.banner_image.src_base64 = None
+        if profile_pic or banner:
+            self.update()
+
     def handle_back_click(self, e):
         """Handle the back button click."""
         print("Back button clicked, returning to search page...")
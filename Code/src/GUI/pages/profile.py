@@ -1,9 +1,9 @@
 import flet as ft
-import requests
+from services.api_client import api
+from services.assets import avatar_base64, banner_base64
+from services.background import run_in_background
+from services.image_cache import profile_images
 
-BASE_URL = "http://127.0.0.1:18080"
-PLACEHOLDER_PROFILE_PIC = "https://via.placeholder.com/150"
-PLACEHOLDER_BANNER = "https://via.placeholder.com/800x200"
 
 class ProfilePage(ft.UserControl):
     def __init__(self, page, username, show_login_page):
@@ -13,6 +13,9 @@ class ProfilePage(ft.UserControl):
         self.show_login_page = show_login_page
 
     def build(self):
+        # Bundled placeholders until (and unless) the user's own pictures are available
+        self.banner_image = ft.Image(src_base64=banner_base64(), fit=ft.ImageFit.COVER)
+        self.profile_image = ft.Image(src_base64=avatar_base64(self.username), fit=ft.ImageFit.COVER)
         return ft.Container(
             width=1080,
             height=650,
@@ -20,19 +23,13 @@ class ProfilePage(ft.UserControl):
                 controls=[
                     # Banner
                     ft.Container(
-                        content=ft.Image(
-                            src=PLACEHOLDER_BANNER,
-                            fit=ft.ImageFit.COVER,
-                        ),
+                        content=self.banner_image,
                         height=200,
                         width=1080,
                     ),
                     # Foto de perfil sobreposta
                     ft.Container(
-                        content=ft.Image(
-                            src=PLACEHOLDER_PROFILE_PIC,
-                            fit=ft.ImageFit.COVER,
-                        ),
+                        content=self.profile_image,
                         height=150,
                         width=150,
                         border_radius=ft.border_radius.all(75),
@@ -97,6 +94,21 @@ class ProfilePage(ft.UserControl):
             ),
         )
 
+    def did_mount(self):
+        # Pictures come from the local image cache; only missing ones are downloaded
+        run_in_background(profile_images, self.username, on_success=self.show_profile_images)
+
+    def show_profile_images(self, paths):
+        profile_pic, banner = paths
+        if profile_pic:
+            self.profile_image.src = profile_pic
+            self.profile_image.src_base64 = None
+        if banner:
+            self.banner_image.src = banner
+            self.banner_image.src_base64 = None
+        if profile_pic or banner:
+            self.update()
+
     def edit_profile(self, e):
         print("Edit Profile button clicked")
 
@@ -133,26 +145,43 @@ class ProfilePage(ft.UserControl):
             self.page.update()
 
     def process_delete_account(self, e):
-        url = f"{BASE_URL}/delete_user"
+        """Send a request to delete the account."""
+        def on_response(response):
+            self.set_dialog_busy(e.control, False)
+            if response.status_code == 200:
+                print("Account deleted successfully.")
+                self.close_delete_dialog(e)
+                self.show_login_page()
+            elif response.status_code == 404:
+                self.error_message.value = "User does not exist. Please check the username."
+                self.error_message.update()
+            elif response.status_code == 401:
+                self.error_message.value = "Incorrect password. Please try again."
+                self.error_message.update()
+            else:
+                self.error_message.value = "An unexpected error occurred. Please try again later."
+                self.error_message.update()
+
         payload = {
             "username": self.username,
             "password": self.password_field.value
         }
-        response = requests.post(url, json=payload)
+        self.set_dialog_busy(e.control, True)
+        run_in_background(
+            api.post, "/delete_user", payload,
+            on_success=on_response,
+            on_error=lambda ex: self.show_request_error(e.control, ex),
+        )
+
+    def set_dialog_busy(self, button, busy):
+        """Disable a dialog button while its request is in flight."""
+        button.disabled = busy
+        button.update()
 
-        if response.status_code == 200:
-            print("Account deleted successfully.")
-            self.close_delete_dialog(e)
-            self.show_login_page()
-        elif response.status_code == 404:
-            self.error_message.value = "User does not exist. Please check the username."
-            self.error_message.update()
-        elif response.status_code == 401:
-            self.error_message.value = "Incorrect password. Please try again."
-            self.error_message.update()
-        else:
-            self.error_message.value = "An unexpected error occurred. Please try again later."
-            self.error_message.update()
+    def show_request_error(self, button, ex):
+        self.set_dialog_busy(button, False)
+        self.error_message.value = f"Unable to reach the server: {ex}"
+        self.error_message.update()
 
 # Function to instantiate the profile page
 def profile_page(page, username, show_login_page):
@@ -0,0 +1,666 @@
+import flet as ft
+from services.assets import recipe_placeholder_base64, set_image_source
+from services.background import run_in_background
+from services.image_cache import CARD_SIZE, image_cache
+from services.paginator import WindowedPager
+from services.recipe_service import cached_recipes, get_recipes, list_recipe_page
+from services.sync import sync_queue
+
+MAX_MATERIALIZED_PAGES = 4  # Pages of cards kept in the grid; the farthest one is dropped while scrolling
+SCROLL_EDGE_PX = 300  # Distance from either end of the grid that moves the window
+
+# Collection pages currently mounted, so a local add, edit or delete shows on all of them
+_views = set()
+# Outbox seqs of conflicts already put to the user, so two mounted collections don't both ask
+_prompted_conflicts = set()
+
+
+class RecipeCollectionPage(ft.UserControl):
+    """Grid of one of the user's recipe collections: own (saved=False) or saved recipes.
+
+    Both collections are views over the same recipes: get_recipes returns the
+    one shared Recipe per id, a recipe that is both owned and saved is
+    downloaded once, and an edit or delete made in one view is applied to the
+    other at once.
+    """
+
+    def __init__(self, page, username, saved):
+        self.page = page
+        self.username = username
+        self.saved = saved
+        super().__init__()
+        self.recipes = []  # List to store recipes
+        self.recipe_grid = None  # Initialize as None; will be set up in build
+        self.recipe_cards = {}  # Recipe id -> (card, recipe and thumbnail it was rendered from)
+        self.thumbnails = {}  # Recipe id -> local thumbnail already on disk
+        self.pager = WindowedPager(
+            lambda cursor: list_recipe_page(self.username, saved=self.saved, cursor=cursor),
+            max_pages=MAX_MATERIALIZED_PAGES,
+        )
+        self.paging = False  # A page is being loaded; scroll events are ignored meanwhile
+        self.scroll_offset = 0  # Last known grid offset, restored when the page is shown again
+        self.sync = sync_queue(username)  # Sends add/edit/delete in the background
+
+    def build(self):
+        # Initialize GridView in the build method
+        self.recipe_grid = ft.GridView(
+            expand=True,
+            runs_count=4,
+            spacing=10,
+            run_spacing=10,
+            child_aspect_ratio=1.0,
+            on_scroll=self.handle_grid_scroll,
+            on_scroll_interval=100,
+        )
+        self.loading_bar = ft.ProgressBar(visible=False)
+        self.file_picker = ft.FilePicker(on_result=self.on_image_picked)
+        self.selected_image = None  # Local path of the image picked in the open dialog
+
+        # Return the layout of the page
+        return ft.Container(
+            width=1080,
+            height=650,
+            content=ft.Column(
+                controls=[
+                    ft.Text(value="Recipes", size=30, weight="bold"),
+                    self.loading_bar,
+                    self.recipe_grid,
+                    ft.Container(
+                        content=ft.FloatingActionButton(
+                            icon=ft.icons.ADD,
+                            bgcolor="blue",
+                            on_click=self.open_create_recipe_dialog,
+                        ),
+                        alignment=ft.alignment.bottom_right,
+                        padding=ft.padding.only(bottom=20, right=20),
+                    ),
+                ],
+                expand=True,
+                spacing=10,
+            ),
+            padding=20,
+            expand=True,
+        )
+
+    def did_mount(self):
+        """Executed every time the page is accessed."""
+        if self.file_picker not in self.page.overlay:
+            self.page.overlay.append(self.file_picker)
+            self.page.update()
+        self.sync.subscribe(self.on_sync_event)
+        _views.add(self)
+        self.fetch_recipes()  # Update recipes when the page is loaded
+        conflicts = self.sync.conflicts()
+        if conflicts:
+            self.show_conflict_dialog(conflicts[0])
+
+    def will_unmount(self):
+        self.sync.unsubscribe(self.on_sync_event)
+        _views.discard(self)
+
+    def fetch_recipes(self):
+        """Show cached recipes right away and refresh them from the server in the background."""
+        if not self.recipes:
+            cached = cached_recipes(self.username, saved=self.saved)
+            if cached:
+                self.recipes = cached
+                self.thumbnails.update(self.find_thumbnails(cached))
+                self.update_recipe_grid()
+
+        self.paging = True
+        self.set_loading(True)
+        run_in_background(self.load_first_page, on_success=self.show_recipes, on_error=self.show_fetch_error)
+
+    def refresh(self):
+        """Revalidate the recipes on screen, keeping the current pages and scroll position."""
+        if self.paging:
+            return
+        self.paging = True
+        self.set_loading(True)
+        run_in_background(self.load_window, on_success=self.show_recipes, on_error=self.show_fetch_error)
+
+    def restore_scroll(self):
+        """Put the grid back where it was when the page was hidden."""
+        if self.scroll_offset:
+            self.recipe_grid.scroll_to(offset=self.scroll_offset, duration=0)
+
+    def load_first_page(self):
+        """Runs in the background: the first page of ids, then one batched request for its recipes."""
+        if not self.pager.load_first():
+            return None
+        return self.load_window()
+
+    def load_window(self):
+        """Runs in the background: the recipes of the pages currently in the window, and their thumbnails on disk."""
+        recipes = get_recipes(self.pager.window_ids())
+        return recipes, self.find_thumbnails(recipes)
+
+    def handle_grid_scroll(self, e):
+        """Load the next page near the bottom of the grid, or bring back a dropped one near the top."""
+        self.scroll_offset = e.pixels
+        if self.paging or not self.recipes:
+            return
+        if e.pixels >= e.max_scroll_extent - SCROLL_EDGE_PX and self.pager.has_more_after:
+            self.shift_window(self.pager.advance, anchor_id=self.recipes[-1].id)
+        elif e.pixels <= e.min_scroll_extent + SCROLL_EDGE_PX and self.pager.has_more_before:
+            self.shift_window(self.pager.retreat, anchor_id=self.recipes[0].id)
+
+    def shift_window(self, move, anchor_id):
+        """Move the window of materialized pages, keeping the card at anchor_id in view."""
+        def work():
+            return self.load_window() if move() else None
+
+        def on_loaded(result):
+            first_id = self.recipes[0].id if self.recipes else None
+            self.show_recipes(result)
+            # Cards were added or dropped above the viewport: jump back to where the user was
+            if result and self.recipes and self.recipes[0].id != first_id and anchor_id in self.recipe_cards:
+                self.recipe_grid.scroll_to(key=str(anchor_id), duration=0)
+
+        self.paging = True
+        self.set_loading(True)
+        run_in_background(work, on_success=on_loaded, on_error=self.show_fetch_error)
+
+    def show_recipes(self, result):
+        """Apply freshly loaded recipes, rebuilding the grid only when something changed."""
+        self.paging = False
+        self.set_loading(False)
+        if result is None:
+            return
+        recipes, thumbnails = result
+        self.thumbnails.update(thumbnails)
+        if recipes != self.recipes:
+            self.recipes = recipes
+            self.update_recipe_grid()
+            self.load_images()
+
+    def load_images(self):
+        """Download the images that are not on disk yet, patching each card as its image arrives."""
+        for recipe in self.recipes:
+            if recipe.image and recipe.id not in self.thumbnails:
+                run_in_background(
+                    image_cache.get, recipe.image, CARD_SIZE,
+                    on_success=lambda path, recipe_id=recipe.id: self.show_image(recipe_id, path),
+                )
+
+    def show_image(self, recipe_id, path):
+        """Swap the placeholder of a card for its cached thumbnail."""
+        entry = self.recipe_cards.get(recipe_id)
+        if path is None or entry is None:
+            return
+        card, recipe, _ = entry
+        self.thumbnails[recipe_id] = path
+        self.recipe_cards[recipe_id] = (card, recipe, path)
+        set_image_source(card.data["image"], path, recipe_placeholder_base64())
+        card.update()
+
+    def show_fetch_error(self, e):
+        self.paging = False
+        self.set_loading(False)
+        print(f"Error fetching recipes: {e}")
+
+    def set_loading(self, loading):
+        """Show or hide the progress bar above the grid."""
+        self.loading_bar.visible = loading
+        self.loading_bar.update()
+
+    def find_thumbnails(self, recipes):
+        """Local thumbnails already on disk for these recipes, without any request."""
+        thumbnails = {}
+        for recipe in recipes:
+            path = image_cache.cached(recipe.image, CARD_SIZE)
+            if path:
+                thumbnails[recipe.id] = path
+        return thumbnails
+
+    def update_recipe_grid(self):
+        """Reconcile the grid with self.recipes, keyed by recipe id.
+
+        Cards are only built for new recipes and patched for changed ones; the
+        rest are reused as-is, so Flet only sends the difference to the client.
+        """
+        if not self.recipe_grid:
+            print("GridView has not been initialized yet.")
+            return
+
+        cards = {}
+        for recipe in self.recipes:
+            thumbnail = self.thumbnails.get(recipe.id)
+            existing = self.recipe_cards.get(recipe.id)
+            if existing is None:
+                card = self.create_recipe_card(recipe)
+            else:
+                card, shown, shown_thumbnail = existing
+                if shown != recipe or shown_thumbnail != thumbnail:
+                    self.patch_recipe_card(card, recipe)
+            # Recipes are never changed in place (an edit is a new Recipe), so no copy is needed
+            cards[recipe.id] = (card, recipe, thumbnail)
+        self.recipe_cards = cards  # Cards of removed recipes are dropped here
+
+        controls = [cards[recipe.id][0] for recipe in self.recipes]
+        if len(controls) != len(self.recipe_grid.controls) or any(
+            new is not old for new, old in zip(controls, self.recipe_grid.controls)
+        ):
+            self.recipe_grid.controls = controls
+        self.recipe_grid.update()
+
+    def patch_recipe_card(self, card, recipe):
+        """Update an existing card in place with the recipe's new data."""
+        set_image_source(card.data["image"], self.thumbnails.get(recipe.id), recipe_placeholder_base64())
+        card.data["title"].value = recipe.title
+        card.on_click = lambda _: self.open_recipe_details_dialog(recipe)
+
+    def create_recipe_card(self, recipe):
+        """Create a card for a recipe with an image and title."""
+        image = ft.Image(
+            fit=ft.ImageFit.COVER,
+            height=140,
+            width=140,
+        )
+        set_image_source(image, self.thumbnails.get(recipe.id), recipe_placeholder_base64())
+        title = ft.Text(
+            recipe.title,
+            weight="bold",
+            size=14,
+            color="black",
+            overflow=ft.TextOverflow.ELLIPSIS,
+        )
+        return ft.Container(
+            width=180,
+            height=230,
+            content=ft.Column(
+                controls=[
+                    ft.Container(
+                        content=image,
+                        alignment=ft.alignment.center,
+                        border_radius=ft.border_radius.all(70),
+                        bgcolor="#ADD8E6",
+                        margin=ft.margin.only(top=10),
+                    ),
+                    ft.Container(
+                        content=ft.Column(
+                            controls=[
+                                ft.Row(
+                                    controls=[
+                                        ft.Icon(
+                                            name=ft.icons.PERSON,
+                                            size=16,
+                                            color="black",
+                                        ),
+                                        title,
+                                    ],
+                                    alignment=ft.MainAxisAlignment.CENTER,
+                                    spacing=5,
+                                ),
+                            ],
+                            alignment=ft.MainAxisAlignment.END,
+                            spacing=0,
+                        ),
+                        bgcolor="#F4F4F4",
+                        padding=ft.padding.all(10),
+                        border_radius=ft.border_radius.only(
+                            bottom_left=10, bottom_right=10
+                        ),
+                        margin=ft.margin.only(top=10),
+                    ),
+                ],
+                spacing=0,
+                alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+            ),
+            border=ft.border.all(color=ft.colors.GREY, width=1),
+            border_radius=15,
+            bgcolor="#ADD8E6",
+            on_click=lambda _: self.open_recipe_details_dialog(recipe),
+            key=str(recipe.id),  # Scroll anchor when pages are added or dropped
+            data={"image": image, "title": title},  # Parts patched by patch_recipe_card
+        )
+
+    def open_recipe_details_dialog(self, recipe):
+        """Open a pop-up with the recipe details and enable scrolling."""
+        self.page.dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Text(
+                recipe.title,
+                size=24,
+                weight="bold",
+                text_align=ft.TextAlign.CENTER,
+            ),
+            content=ft.Container(
+                content=ft.Column(
+                    controls=[
+                        ft.Text(
+                            "Ingredients:",
+                            size=18,
+                            weight="bold",
+                            text_align=ft.TextAlign.LEFT,
+                        ),
+                        ft.Text(
+                            "\n".join(f"• {ingredient}" for ingredient in recipe.ingredient_list),
+                            size=14,
+                            text_align=ft.TextAlign.LEFT,
+                        ),
+                        ft.Container(
+                            content=ft.Text(
+                                "Steps:",
+                                size=18,
+                                weight="bold",
+                                text_align=ft.TextAlign.LEFT,
+                            ),
+                            margin=ft.margin.only(top=20),  # Usando `Container` para adicionar margem superior
+                        ),
+                        ft.Text(
+                            "\n".join(f"{i + 1}. {step}" for i, step in enumerate(recipe.step_list)),
+                            size=14,
+                            text_align=ft.TextAlign.LEFT,
+                        ),
+                    ],
+                    alignment=ft.MainAxisAlignment.START,
+                    spacing=10,
+                    scroll=ft.ScrollMode.AUTO,  # Adiciona rolagem
+                ),
+                width=600,
+                height=400,
+                bgcolor=ft.colors.BLACK87,
+                border_radius=10,
+                padding=ft.padding.all(20),
+            ),
+            # Only the user's own recipes can be changed
+            actions=([] if self.saved else [
+                ft.TextButton("Delete", on_click=lambda _: self.show_delete_confirmation(recipe)),
+                ft.TextButton("Edit", on_click=lambda _: self.open_edit_recipe_dialog(recipe)),
+            ]) + [
+                ft.TextButton("Close", on_click=lambda _: self.close_dialog())
+            ],
+            actions_alignment="end",
+        )
+        self.page.dialog.open = True
+        self.page.update()
+
+    def delete_recipe(self, recipe):
+        """Remove a recipe from the grids at once; the sync queue deletes it on the server."""
+        self.sync.delete_recipe(recipe.id)
+        # Remove the recipe from this collection and the other one, if it is there too
+        for view in _views | {self}:
+            view.drop_recipe(recipe.id)
+        # Close the dialog
+        self.close_dialog()
+
+    def drop_recipe(self, recipe_id):
+        """Take a deleted recipe out of this collection."""
+        self.pager.remove(recipe_id)
+        if any(r.id == recipe_id for r in self.recipes):
+            self.recipes = [r for r in self.recipes if r.id != recipe_id]
+            self.update_recipe_grid()
+
+    def show_edited_recipe(self, recipe):
+        """Swap in the new version of a recipe if this collection has it on screen."""
+        if any(r.id == recipe.id for r in self.recipes):
+            self.recipes = [recipe if r.id == recipe.id else r for r in self.recipes]
+            self.update_recipe_grid()
+
+    def show_delete_confirmation(self, recipe):
+        """Show a confirmation dialog before deleting a recipe."""
+        self.page.dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("Confirm Delete", size=20, weight="bold", text_align=ft.TextAlign.CENTER),
+            content=ft.Text(
+                f"Are you sure you want to delete the recipe '{recipe.title}'?",
+                text_align=ft.TextAlign.CENTER,
+            ),
+            actions=[
+                ft.TextButton("Yes", on_click=lambda _: self.delete_recipe(recipe)),
+                ft.TextButton("No", on_click=lambda _: self.close_dialog()),
+            ],
+            actions_alignment="end",
+        )
+        self.page.dialog.open = True
+        self.page.update()
+
+    def open_edit_recipe_dialog(self, recipe):
+        """Open a dialog to edit the selected recipe."""
+        # Fields pre-filled with the current recipe data
+        self.edit_recipe_name = ft.TextField(
+            label="Recipe Name", value=recipe.title, width=500
+        )
+        self.edit_ingredients = ft.TextField(
+            label="Ingredients (comma separated)", 
+            value=recipe.ingredients, 
+            multiline=True, 
+            width=500, 
+            height=150
+        )
+        self.edit_steps = ft.TextField(
+            label="Steps", 
+            value=recipe.steps, 
+            multiline=True, 
+            width=500, 
+            height=200
+        )
+        self.error_message = ft.Text(value="", color="red")
+        self.dialog_save_button = ft.ElevatedButton(
+            "Save", 
+            on_click=lambda _: self.save_edited_recipe(recipe)
+        )
+        image_picker_row = self.create_image_picker_row()
+
+        self.page.dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("Edit Recipe", size=20, weight="bold"),
+            content=ft.Container(
+                content=ft.Column(
+                    controls=[
+                        self.edit_recipe_name,
+                        self.edit_ingredients,
+                        self.edit_steps,
+                        image_picker_row,
+                        self.error_message,
+                    ],
+                    spacing=10,
+                    width=520,
+                ),
+                width=550,  # Standardized width
+                height=400,  # Standardized height
+                padding=ft.padding.all(20),
+            ),
+            actions=[
+                self.dialog_save_button,
+                ft.TextButton("Cancel", on_click=lambda _: self.close_dialog()),
+            ],
+            actions_alignment="end",
+        )
+        self.page.dialog.open = True
+        self.page.update()
+
+    def save_edited_recipe(self, recipe):
+        """Show the edited recipe at once; the sync queue sends it (and the new image) in the background."""
+        new_title = self.edit_recipe_name.value.strip()
+        new_ingredients = self.edit_ingredients.value.strip()
+        new_steps = self.edit_steps.value.strip()
+
+        if not new_title or not new_ingredients or not new_steps:
+            self.error_message.value = "All fields are required."
+            self.error_message.update()
+            return
+
+        edited = self.sync.edit_recipe(recipe.id, new_title, new_ingredients, new_steps, image=self.selected_image)
+        # Update the grids of both collections
+        for view in _views | {self}:
+            view.show_edited_recipe(edited)
+        self.close_dialog()
+
+    def open_create_recipe_dialog(self, e):
+        """Open the dialog to create a new recipe."""
+        self.page.dialog = self.create_recipe_dialog_component()
+        self.page.dialog.open = True
+        self.page.update()
+
+    def create_recipe_dialog_component(self):
+        """Create and return the recipe creation dialog component."""
+        self.recipe_name = ft.TextField(label="Recipe Name", width=500)
+        self.ingredients = ft.TextField(label="Ingredients (comma separated)", multiline=True, width=500, height=150)
+        self.steps = ft.TextField(label="Steps", multiline=True, width=500, height=200)
+        self.error_message = ft.Text(value="", color="red")
+        self.dialog_save_button = ft.ElevatedButton("Save", on_click=self.save_recipe)
+        image_picker_row = self.create_image_picker_row()
+
+        return ft.AlertDialog(
+            modal=True,
+            title=ft.Text("Add a New Recipe", size=20, weight="bold"),
+            content=ft.Container(
+                content=ft.Column(
+                    controls=[
+                        self.recipe_name,
+                        self.ingredients,
+                        self.steps,
+                        image_picker_row,
+                        self.error_message,
+                    ],
+                    spacing=10,
+                    width=520,
+                ),
+                padding=ft.padding.all(20),
+                width=550,
+            ),
+            actions=[
+                self.dialog_save_button,
+                ft.TextButton("Cancel", on_click=lambda _: self.close_dialog()),
+            ],
+            actions_alignment="end",
+        )
+
+    def save_recipe(self, e):
+        """Add a new recipe; the sync queue sends it (and its image) in the background."""
+        name = self.recipe_name.value.strip()
+        ingredients = self.ingredients.value.strip()
+        steps = self.steps.value.strip()
+
+        if not name or not ingredients or not steps:
+            self.error_message.value = "All fields are required."
+            self.error_message.update()
+            return
+
+        recipe = self.sync.add_recipe(name, ingredients, steps, image=self.selected_image)
+        # It goes to the user's own recipes, whichever collection it was created from
+        for view in _views | {self}:
+            view.show_added_recipe(recipe)
+        self.close_dialog()
+
+    def show_added_recipe(self, recipe):
+        """Show a new own recipe if the end of this collection is on screen; otherwise it comes with the last page."""
+        if not self.saved and self.pager.append(recipe.id):
+            self.recipes.append(recipe)
+            self.update_recipe_grid()
+
+    def create_image_picker_row(self):
+        """Image picker shared by the create and edit dialogs."""
+        self.selected_image = None
+        self.image_label = ft.Text("No image selected", size=12)
+        return ft.Row(
+            controls=[
+                ft.TextButton(
+                    "Choose image",
+                    icon=ft.icons.IMAGE,
+                    on_click=lambda _: self.file_picker.pick_files(
+                        allow_multiple=False, file_type=ft.FilePickerFileType.IMAGE
+                    ),
+                ),
+                self.image_label,
+            ],
+        )
+
+    def on_image_picked(self, e):
+        if e.files:
+            self.selected_image = e.files[0].path
+            self.image_label.value = e.files[0].name
+            self.image_label.update()
+
+    def close_dialog(self):
+        """Close the active dialog."""
+        if self.page.dialog:
+            self.page.dialog.open = False
+            self.page.update()
+
+    def on_sync_event(self, event, change):
+        """A queued change reached the server, was refused, or clashed with another edit."""
+        if event == "offline":
+            if self.visible:
+                self.show_snackbar("Server unreachable: your changes are kept on this device and sent when it is back.")
+            return
+        if change["op"] in ("follow", "unfollow"):
+            return
+        if event == "synced":
+            if change["op"] == "add_recipe" and "temp_id" in change:
+                self.replace_recipe_id(change["temp_id"], change["recipe_id"])
+            elif change["op"] == "upload_image":
+                self.refresh()  # Show the new picture
+            return
+        if event == "conflict":
+            self.show_conflict_dialog(change)
+            return
+
+        # Refused by the server: put back what it has
+        self.show_snackbar(f"Could not save your change: {change['error']}")
+        if change["op"] == "add_recipe":
+            self.pager.remove(change["recipe_id"])
+            self.recipes = [r for r in self.recipes if r.id != change["recipe_id"]]
+            self.update_recipe_grid()
+        elif change["op"] == "delete_recipe":
+            if not self.paging:
+                self.fetch_recipes()  # The deleted recipe comes back
+        else:
+            self.refresh()
+
+    def replace_recipe_id(self, temp_id, recipe_id):
+        """A recipe added offline reached the server: swap its temporary id for the real one."""
+        self.pager.replace(temp_id, recipe_id)
+        self.recipes = [r.replace(id=recipe_id) if r.id == temp_id else r for r in self.recipes]
+        if temp_id in self.thumbnails:
+            self.thumbnails[recipe_id] = self.thumbnails.pop(temp_id)
+        if temp_id in self.recipe_cards:
+            card, recipe, thumbnail = self.recipe_cards.pop(temp_id)
+            recipe = recipe.replace(id=recipe_id)
+            self.patch_recipe_card(card, recipe)  # Its dialogs must act on the new id
+            card.key = str(recipe_id)  # Scroll anchor
+            self.recipe_cards[recipe_id] = (card, recipe, thumbnail)
+        self.update_recipe_grid()
+
+    def show_conflict_dialog(self, change):
+        """Ask whether a queued change should overwrite the newer server copy (once, whichever collection sees it first)."""
+        if change["seq"] in _prompted_conflicts:
+            return
+        _prompted_conflicts.add(change["seq"])
+
+        def resolve(keep_mine):
+            if keep_mine:
+                self.sync.keep_mine(change)
+            else:
+                self.sync.discard(change)
+            _prompted_conflicts.discard(change["seq"])
+            self.close_dialog()
+            # Only one collection asked, so all of them reload, except any already loading a page
+            for view in _views | {self}:
+                if not view.paging:
+                    view.fetch_recipes()
+
+        what = "delete" if change["op"] == "delete_recipe" else "edit"
+        title = change["payload"].get("titulo")
+        self.page.dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("Sync Conflict", size=20, weight="bold"),
+            content=ft.Text(
+                f"{change['error']} Your {what}{f' of {title!r}' if title else ''} "
+                "would overwrite that version."
+            ),
+            actions=[
+                ft.TextButton("Keep mine", on_click=lambda _: resolve(True)),
+                ft.TextButton("Keep server version", on_click=lambda _: resolve(False)),
+            ],
+            actions_alignment="end",
+        )
+        self.page.dialog.open = True
+        self.page.update()
+
+    def show_snackbar(self, message):
+        self.page.snack_bar = ft.SnackBar(content=ft.Text(message))
+        self.page.snack_bar.open = True
+        self.page.update()
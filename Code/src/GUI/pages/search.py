@@ -1,9 +1,6 @@
 import flet as ft
-import requests
-
-BASE_URL = "http://127.0.0.1:18080"
-PLACEHOLDER_PROFILE_PIC = "https://via.placeholder.com/150"
-PLACEHOLDER_BANNER = "https://via.placeholder.com/900x200"
+from services.api_client import api
+from services.assets import avatar_base64, banner_base64
 
 
 class SearchPage(ft.UserControl):
@@ -89,9 +86,8 @@ class SearchPage(ft.UserControl):
 
         try:
             # Send a request to the `/search` endpoint
-            url = f"{BASE_URL}/search"
             payload = {"search": search_query}
-            response = requests.post(url, json=payload)
+            response = api.post("/search", payload)
 
             if response.status_code == 200:
                 user_ids = response.json().get("user_ids", [])
@@ -99,9 +95,8 @@ class SearchPage(ft.UserControl):
 
                 # Fetch usernames for each user_id
                 for user_id in user_ids:
-                    url = f"{BASE_URL}/get_user"
                     payload = {"user_id": user_id}
-                    user_response = requests.post(url, json=payload)
+                    user_response = api.post("/get_user", payload)
 
                     if user_response.status_code == 200:
                         username = user_response.json().get("username")
@@ -159,10 +154,9 @@ class SearchPage(ft.UserControl):
         """Follow the selected user."""
         try:
             print(f"Trying to follow: {username}")
-            url = f"{BASE_URL}/follow"
             payload = {"follower_username": self.current_user, "followed_username": username}
             print(f"Payload: {payload}")
-            response = requests.post(url, json=payload)
+            response = api.post("/follow", payload)
 
             if response.status_code == 200:
                 print(f"Successfully followed {username}")
@@ -190,7 +184,7 @@ class SearchPage(ft.UserControl):
                 # Banner
                 ft.Container(
                     content=ft.Image(
-                        src=PLACEHOLDER_BANNER,
+                        src_base64=banner_base64(),
                         fit=ft.ImageFit.COVER,
                     ),
                     height=150,
@@ -199,7 +193,7 @@ class SearchPage(ft.UserControl):
                 # Profile picture overlapping banner
                 ft.Container(
                     content=ft.Image(
-                        src=PLACEHOLDER_PROFILE_PIC,
+                        src_base64=avatar_base64(username),
                         fit=ft.ImageFit.COVER,
                     ),
                     height=120,
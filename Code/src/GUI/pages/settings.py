@@ -1,7 +1,7 @@
 import flet as ft
-import requests
+from services.api_client import api
+from services.background import run_in_background
 
-BASE_URL = "http://127.0.0.1:18080"
 
 
 class SettingsPage(ft.UserControl):
@@ -134,26 +134,32 @@ class SettingsPage(ft.UserControl):
 
     def process_delete_account(self, e):
         """Send a request to delete the account."""
-        url = f"{BASE_URL}/delete_user"
+        def on_response(response):
+            self.set_dialog_busy(e.control, False)
+            if response.status_code == 200:
+                print("Account deleted successfully.")
+                self.close_dialog(e)
+                self.show_login_page()
+            elif response.status_code == 404:
+                self.error_message.value = "User does not exist. Please check the username."
+                self.error_message.update()
+            elif response.status_code == 401:
+                self.error_message.value = "Incorrect password. Please try again."
+                self.error_message.update()
+            else:
+                self.error_message.value = "An unexpected error occurred. Please try again later."
+                self.error_message.update()
+
         payload = {
             "username": self.username,
             "password": self.password_field.value
         }
-        response = requests.post(url, json=payload)
-
-        if response.status_code == 200:
-            print("Account deleted successfully.")
-            self.close_dialog(e)
-            self.show_login_page()
-        elif response.status_code == 404:
-            self.error_message.value = "User does not exist. Please check the username."
-            self.error_message.update()
-        elif response.status_code == 401:
-            self.error_message.value = "Incorrect password. Please try again."
-            self.error_message.update()
-        else:
-            self.error_message.value = "An unexpected error occurred. Please try again later."
-            self.error_message.update()
+        self.set_dialog_busy(e.control, True)
+        run_in_background(
+            api.post, "/delete_user", payload,
+            on_success=on_response,
+            on_error=lambda ex: self.show_request_error(e.control, ex),
+        )
 
     def open_change_password_dialog(self, e):
         """Open the dialog to change the user's password."""
@@ -204,23 +210,39 @@ class SettingsPage(ft.UserControl):
             self.error_message.update()
             return
 
-        url = f"{BASE_URL}/change_password"
+        def on_response(response):
+            self.set_dialog_busy(e.control, False)
+            if response.status_code == 200:
+                print("Password changed successfully.")
+                self.close_dialog(e)
+            elif response.status_code == 401:
+                self.error_message.value = "Incorrect current password."
+                self.error_message.update()
+            else:
+                self.error_message.value = "An error occurred. Please try again later."
+                self.error_message.update()
+
         payload = {
             "username": self.username,
             "current_password": current_password,
             "new_password": new_password
         }
-        response = requests.post(url, json=payload)
+        self.set_dialog_busy(e.control, True)
+        run_in_background(
+            api.post, "/change_password", payload,
+            on_success=on_response,
+            on_error=lambda ex: self.show_request_error(e.control, ex),
+        )
 
-        if response.status_code == 200:
-            print("Password changed successfully.")
-            self.close_dialog(e)
-        elif response.status_code == 401:
-            self.error_message.value = "Incorrect current password."
-            self.error_message.update()
-        else:
-            self.error_message.value = "An error occurred. Please try again later."
-            self.error_message.update()
+    def set_dialog_busy(self, button, busy):
+        """Disable a dialog button while its request is in flight."""
+        button.disabled = busy
+        button.update()
+
+    def show_request_error(self, button, ex):
+        self.set_dialog_busy(button, False)
+        self.error_message.value = f"Unable to reach the server: {ex}"
+        self.error_message.update()
 
     def close_dialog(self, e):
         """Close the active dialog."""
@@ -1,8 +1,8 @@
 import flet as ft
-import requests
+from services.api_client import api
+from services.background import run_in_background
 import re
 
-BASE_URL = "http://127.0.0.1:18080"
 
 class SignupPage(ft.UserControl):
     def __init__(self, on_signup, show_login_page):
@@ -17,6 +17,7 @@ class SignupPage(ft.UserControl):
         self.password = ft.TextField(label="Password", password=True, width=250)
         self.confirm_password = ft.TextField(label="Confirm Password", password=True, width=250)
         self.success_message = ft.Text(value="", color="green")
+        self.signup_button = ft.ElevatedButton(text="Sign Up", on_click=self.handle_signup)
 
         # Layout of the signup page
         return ft.Container(
@@ -32,7 +33,7 @@ class SignupPage(ft.UserControl):
                                 self.password,
                                 self.confirm_password,
                                 ft.Container(height=20),  # Add space before the sign-up button
-                                ft.ElevatedButton(text="Sign Up", on_click=self.handle_signup),
+                                self.signup_button,
                                 self.success_message,
                                 ft.TextButton(
                                     text="Already have an account? Log in now.",
@@ -78,30 +79,43 @@ class SignupPage(ft.UserControl):
         if self.username.value and self.password.value:
             print(f"Creating user: {self.username.value}")
 
-            url = f"{BASE_URL}/add_user"
             payload = {
                 "username": self.username.value,
                 "password": self.password.value
             }
-            response = requests.post(url, json=payload)
-
-            if response.status_code == 201:  # User created successfully
-                print("User created successfully.")
-                self.success_message.value = "User created successfully! You can now log in."
-                self.success_message.update()
-                # Call the callback function to proceed to the next step, if needed
-                self.on_signup
-            elif response.status_code == 400:  # Username already in use or validation error
-                print("Signup failed: username already in use.")
-                self.show_snackbar("Username is already in use. Please choose another one.")
-            else:  # Other unexpected errors
-                print("Unexpected error during signup.")
-                self.show_snackbar("An unexpected error occurred. Please try again later.")
+            self.signup_button.disabled = True
+            self.signup_button.update()
+            run_in_background(
+                api.post, "/add_user", payload,
+                on_success=self.handle_signup_response,
+                on_error=self.handle_signup_error,
+            )
         else:
             # Error message if any field is empty
             print("Signup failed: fields are missing.")
             self.show_snackbar("All fields are required.")
 
+    def handle_signup_response(self, response):
+        self.signup_button.disabled = False
+        self.signup_button.update()
+        if response.status_code == 201:  # User created successfully
+            print("User created successfully.")
+            self.success_message.value = "User created successfully! You can now log in."
+            self.success_message.update()
+            # Call the callback function to proceed to the next step, if needed
+            self.on_signup
+        elif response.status_code == 400:  # Username already in use or validation error
+            print("Signup failed: username already in use.")
+            self.show_snackbar("Username is already in use. Please choose another one.")
+        else:  # Other unexpected errors
+            print("Unexpected error during signup.")
+            self.show_snackbar("An unexpected error occurred. Please try again later.")
+
+    def handle_signup_error(self, ex):
+        self.signup_button.disabled = False
+        self.signup_button.update()
+        self.show_snackbar("Unable to connect to the server. Please try again later.")
+
     def validate_username(self, username):
         if len(username) < 3:
             return "Username must be at least 3 characters long."
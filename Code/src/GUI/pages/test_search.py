@@ -1,11 +1,19 @@
 import flet as ft
-import requests
+from services.api_client import api
+from services.assets import avatar_base64, banner_base64
+from services.background import run_in_background
+from services.debounce import DebouncedRunner
+from services.follow_state import follow_state
+from services.sync import sync_queue
+from services.recipe_service import cook_with, search_recipes
 
 
-
-BASE_URL = "http://127.0.0.1:18080"
-PLACEHOLDER_PROFILE_PIC = "https://via.placeholder.com/150"
-PLACEHOLDER_BANNER = "https://via.placeholder.com/900x200"
+SEARCH_DEBOUNCE_SECONDS = 0.3  # Wait for typing to pause before querying the server
+SEARCH_LABELS = {
+    "users": "Search users...",
+    "recipes": "Search recipes...",
+    "ingredients": "What do you have? e.g. eggs, spinach, feta",
+}
 
 
 class SearchPage(ft.UserControl):
@@ -16,8 +24,22 @@ class SearchPage(ft.UserControl):
         self.user_list = None
         self.popup_container = None
         self.current_user = username
-        self.following_users = set()
+        self.follow_state = follow_state(username)  # Labels the Follow buttons without requests
+        self.sync = sync_queue(username)  # Sends follows and unfollows in the background
         self.open_full_profile = open_full_profile
+        self.usernames_by_id = {}
+        self.search_runner = DebouncedRunner(
+            self.search_users, self.show_search_results, delay=SEARCH_DEBOUNCE_SECONDS
+        )
+        self.mode = "users"  # "users", "recipes" or "ingredients"
+        self.search_field = None
+        self.recipes_found = []  # (recipe, note shown under the title or None)
+        self.recipe_query = None  # (mode, query) the recipe results belong to
+        self.recipe_cursor = None  # Cursor of the next page of recipe results, None when there is none
+        self.loading_more = False  # A "Load more" request is in flight; further clicks are ignored
+        self.recipe_runner = DebouncedRunner(
+            self.search_recipes, self.show_recipe_results, delay=SEARCH_DEBOUNCE_SECONDS
+        )
 
     def build(self):
         self.popup_container = ft.Container(
@@ -30,12 +52,16 @@ class SearchPage(ft.UserControl):
         self.user_list = ft.Column(
             controls=[],
             spacing=10,
+            scroll=ft.ScrollMode.AUTO,
         )
 
         return ft.Container(
             content=ft.Column(
                 controls=[
-                    self.create_search_bar(),
+                    ft.Row(
+                        controls=[self.create_search_bar(), self.create_mode_selector()],
+                        spacing=10,
+                    ),
                     ft.Row(
                         controls=[
                             ft.Container(
@@ -59,77 +85,234 @@ class SearchPage(ft.UserControl):
             expand=True,
         )
 
+    def did_mount(self):
+        # Fetch the followee list while the user is still typing the first query
+        run_in_background(self.follow_state.load)
+        self.sync.subscribe(self.on_sync_event)
+
+    def will_unmount(self):
+        self.sync.unsubscribe(self.on_sync_event)
+
     def create_search_bar(self):
+        self.search_field = ft.TextField(
+            label=SEARCH_LABELS[self.mode],
+            prefix_icon=ft.icons.SEARCH,
+            on_change=self.perform_search,
+        )
         return ft.Container(
-            content=ft.TextField(
-                label="Search users...",
-                prefix_icon=ft.icons.SEARCH,
-                on_change=self.perform_search,
-            ),
+            content=self.search_field,
             width=1200,
             height=50,
             expand=True,
         )
 
+    def create_mode_selector(self):
+        return ft.SegmentedButton(
+            segments=[
+                ft.Segment(value="users", label=ft.Text("Users"), icon=ft.Icon(ft.icons.PERSON)),
+                ft.Segment(value="recipes", label=ft.Text("Recipes"), icon=ft.Icon(ft.icons.RESTAURANT_MENU)),
+                ft.Segment(value="ingredients", label=ft.Text("Ingredients"), icon=ft.Icon(ft.icons.KITCHEN)),
+            ],
+            selected={self.mode},
+            allow_empty_selection=False,
+            on_change=self.change_mode,
+        )
+
+    def change_mode(self, e):
+        self.mode = next(iter(e.control.selected))
+        self.search_field.label = SEARCH_LABELS[self.mode]
+        self.search_field.update()
+        # Run the text already in the field in the new mode
+        self.clear_results()
+        self.run_search(self.search_field.value)
+
+    def clear_results(self):
+        self.search_runner.cancel()
+        self.recipe_runner.cancel()
+        self.search_results = []
+        self.usernames_found = []
+        self.recipes_found = []
+        self.recipe_query = None
+        self.recipe_cursor = None
+        self.close_popup()
+        self.update_user_list()
+
     def perform_search(self, e):
-        search_query = e.control.value.strip()
+        self.run_search(e.control.value)
+
+    def run_search(self, search_query):
+        search_query = (search_query or "").strip()
 
         if not search_query:
-            self.search_results = []
-            self.usernames_found = []
-            self.following_users.clear()
-            self.update_user_list()
+            self.clear_results()
+            return
+
+        # Debounced: only the query left in the field after a short pause hits the server
+        if self.mode == "users":
+            self.search_runner.submit(search_query)
+        else:
+            self.recipe_runner.submit(self.mode, search_query)
+
+    def search_users(self, search_query, check):
+        """Runs in the background; check() aborts as soon as a newer query is typed."""
+        payload = {"search": search_query}
+        response = api.post("/search", payload)
+
+        if response.status_code != 200:
+            print(f"Search failed: {response.text}")
+            return None
+
+        user_ids = response.json().get("user_ids", [])
+        usernames_found = []
+        for user_id in user_ids:
+            check()
+            username = self.get_username(user_id)
+            if username:
+                usernames_found.append(username)
+
+        # Loads the followee list on first use; after that it is answered from memory
+        check()
+        self.follow_state.following(usernames_found)
+        return usernames_found
+
+    def show_search_results(self, result):
+        """Render the results of the latest query only."""
+        if result is None:
+            return
+        self.usernames_found = result
+        self.update_user_list()
+
+    def search_recipes(self, mode, search_query, check):
+        """Runs in the background; ranked by the server, best match first."""
+        page = self.fetch_recipe_page(mode, search_query, None)
+        check()
+        return (mode, search_query), page
+
+    @staticmethod
+    def fetch_recipe_page(mode, search_query, cursor):
+        """One page of ([(recipe, note)], next_cursor) for a recipe or ingredient search, or None."""
+        if mode == "ingredients":
+            page = cook_with(search_query, cursor)
+            if page is None:
+                return None
+            results, next_cursor = page
+            return [
+                (recipe, f"Uses {matched} of your ingredients, needs {total - matched} more" if total > matched
+                 else f"Uses {matched} of your ingredients, nothing else needed")
+                for recipe, matched, total in results
+            ], next_cursor
+
+        page = search_recipes(search_query, cursor)
+        if page is None:
+            return None
+        recipes, next_cursor = page
+        return [(recipe, None) for recipe in recipes], next_cursor
+
+    def show_recipe_results(self, result):
+        query, page = result
+        if page is None:
             return
+        self.recipe_query = query
+        self.recipes_found, self.recipe_cursor = page
+        self.update_user_list()
 
-        try:
-            url = f"{BASE_URL}/search"
-            payload = {"search": search_query}
-            response = requests.post(url, json=payload)
-
-            if response.status_code == 200:
-                user_ids = response.json().get("user_ids", [])
-                self.usernames_found = []
-
-                for user_id in user_ids:
-                    url_user = f"{BASE_URL}/get_user"
-                    payload_user = {"user_id": user_id}
-                    user_response = requests.post(url_user, json=payload_user)
-
-                    if user_response.status_code == 200:
-                        username = user_response.json().get("username")
-                        if username:
-                            self.usernames_found.append(username)
-
-                # Verifica quem já é seguido
-                self.following_users.clear()
-                for usr in self.usernames_found:
-                    if self.check_follow(usr):
-                        self.following_users.add(usr)
-
-                self.update_user_list()
-            else:
-                print(f"Search failed: {response.text}")
-        except Exception as ex:
-            print(f"Error while searching: {ex}")
-
-    def check_follow(self, username):
-        if not self.current_user or self.current_user == username:
-            return False
-        url = f"{BASE_URL}/check_follow"
-        payload = {"follower_username": self.current_user, "followed_username": username}
-        response = requests.post(url, json=payload)
-        return response.status_code == 200
+    def load_more_recipes(self, e):
+        query, cursor = self.recipe_query, self.recipe_cursor
+        if cursor is None or self.loading_more:
+            return
+        self.loading_more = True
+
+        # The cursor is only moved once the page arrives, so after a failure "Load more" can be clicked again
+        def on_page(page):
+            self.loading_more = False
+            if page is None or query != self.recipe_query or cursor != self.recipe_cursor:
+                return  # Failed, or the query changed meanwhile
+            results, self.recipe_cursor = page
+            self.recipes_found.extend(results)
+            self.update_user_list()
+
+        def on_error(ex):
+            self.loading_more = False
+            print(f"Error while loading more recipes: {ex}")
+
+        run_in_background(self.fetch_recipe_page, *query, cursor, on_success=on_page, on_error=on_error)
+
+    def get_username(self, user_id):
+        # Usernames don't change while searching, so each id is only looked up once
+        if user_id not in self.usernames_by_id:
+            payload_user = {"user_id": user_id}
+            user_response = api.post("/get_user", payload_user)
+            if user_response.status_code != 200:
+                return None
+            self.usernames_by_id[user_id] = user_response.json().get("username")
+        return self.usernames_by_id[user_id]
 
     def update_user_list(self):
         self.user_list.controls.clear()
 
-        for username in self.usernames_found:
-            self.user_list.controls.append(self.create_user_card(username))
+        if self.mode != "users":
+            for recipe, note in self.recipes_found:
+                self.user_list.controls.append(self.create_recipe_card(recipe, note))
+            if self.recipe_query and not self.recipes_found:
+                self.user_list.controls.append(ft.Text("No recipes found.", color="grey"))
+            if self.recipe_cursor is not None:
+                self.user_list.controls.append(
+                    ft.TextButton("Load more", icon=ft.icons.EXPAND_MORE, on_click=self.load_more_recipes)
+                )
+        else:
+            for username in self.usernames_found:
+                self.user_list.controls.append(self.create_user_card(username))
 
         self.user_list.update()
 
+    def create_recipe_card(self, recipe, note=None):
+        controls = [ft.Text(recipe.title, size=14, weight="bold", color="white")]
+        if note:
+            controls.append(ft.Text(note, size=12, color="teal100"))
+        controls.append(
+            ft.Text(
+                recipe.ingredients,
+                size=12,
+                color="white70",
+                max_lines=1,
+                overflow=ft.TextOverflow.ELLIPSIS,
+            )
+        )
+        return ft.Container(
+            content=ft.Column(controls=controls, spacing=2),
+            bgcolor="bluegrey400",
+            border_radius=10,
+            padding=10,
+            width=250,
+            on_hover=lambda e, recipe=recipe: self.handle_recipe_hover(e, recipe),
+        )
+
+    def handle_recipe_hover(self, e, recipe):
+        if e.data == "true":
+            self.open_recipe_popup(recipe)
+        else:
+            self.close_popup()
+
+    def open_recipe_popup(self, recipe):
+        self.popup_container.bgcolor = "bluegrey900"
+        self.popup_container.content = ft.Container(
+            content=ft.Column(
+                controls=[
+                    ft.Text(recipe.title, size=24, weight="bold", color="white"),
+                    ft.Text("Ingredients", size=16, weight="bold", color="white"),
+                    ft.Text(recipe.ingredients, color="white"),
+                    ft.Text("Steps", size=16, weight="bold", color="white"),
+                    ft.Text(recipe.steps, color="white"),
+                ],
+                spacing=10,
+                scroll=ft.ScrollMode.AUTO,
+            ),
+            padding=30,
+        )
+        self.popup_container.update()
+
     def create_user_card(self, username):
-        is_following = username in self.following_users
+        is_following = self.follow_state.is_following(username)
         follow_button_text = "Followed" if is_following else "Follow"
         follow_button_action = self.unfollow_user if is_following else self.follow_user
 
@@ -170,39 +353,25 @@ class SearchPage(ft.UserControl):
         )
     
     def follow_user(self, username):
-        try:
-            print(f"Trying to follow: {username}")
-            url = f"{BASE_URL}/follow"
-            payload = {"follower_username": self.current_user, "followed_username": username}
-            response = requests.post(url, json=payload)
-
-            if response.status_code == 200:
-                print(f"Successfully followed {username}")
-                self.following_users.add(username)
-                self.update_user_list()
-            elif response.status_code == 404:
-                print("User not found!")
-            else:
-                print(f"Error: {response.status_code}, {response.text}")
-        except Exception as ex:
-            print(f"Error while following user: {ex}")
+        self.follow_state.follow(username)
+        self.update_user_list()
 
     def unfollow_user(self, username):
-        try:
-            print(f"Trying to unfollow: {username}")
-            url = f"{BASE_URL}/unfollow"
-            payload = {"follower_username": self.current_user, "followed_username": username}
-            response = requests.post(url, json=payload)
-
-            if response.status_code == 200:
-                print(f"Successfully unfollowed {username}")
-                if username in self.following_users:
-                    self.following_users.remove(username)
-                self.update_user_list()
-            else:
-                print(f"Failed to unfollow {username}: {response.text}")
-        except Exception as ex:
-            print(f"Error while unfollowing user: {ex}")
+        self.follow_state.unfollow(username)
+        self.update_user_list()
+
+    def on_sync_event(self, event, change):
+        """Undo a follow or unfollow the server refused."""
+        if event != "failed" or change["op"] not in ("follow", "unfollow"):
+            return
+        self.follow_state.rollback(change)
+        if self.mode == "users":
+            self.update_user_list()
+        self.page.snack_bar = ft.SnackBar(
+            content=ft.Text(f"Could not {change['op']} {change['payload']['followed_username']}: {change['error']}")
+        )
+        self.page.snack_bar.open = True
+        self.page.update()
 
     def handle_hover(self, e, username):
         if e.data == "true":
@@ -218,7 +387,7 @@ class SearchPage(ft.UserControl):
             controls=[
                 ft.Container(
                     content=ft.Image(
-                        src=PLACEHOLDER_BANNER,
+                        src_base64=banner_base64(),
                         fit=ft.ImageFit.COVER,
                     ),
                     height=150,
@@ -226,7 +395,7 @@ class SearchPage(ft.UserControl):
                 ),
                 ft.Container(
                     content=ft.Image(
-                        src=PLACEHOLDER_PROFILE_PIC,
+                        src_base64=avatar_base64(username),
                         fit=ft.ImageFit.COVER,
                     ),
                     height=120,
@@ -0,0 +1,139 @@
+import os
+import random
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from services.metrics import metrics
+
+# Single place to point the client at another server (e.g. LETHIMCOOK_BASE_URL=http://10.0.0.5:18080)
+BASE_URL = os.environ.get("LETHIMCOOK_BASE_URL", "http://127.0.0.1:18080")
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (3.05, 10)
+ENDPOINT_TIMEOUTS = {
+    "/status": (1, 2),
+    "/login": (3.05, 5),
+    "/search": (3.05, 5),
+    "/search_recipes": (3.05, 5),
+    "/cook_with": (3.05, 5),
+    "/get_user": (3.05, 5),
+    "/check_follow": (3.05, 5),
+    "/check_follows": (3.05, 5),
+    "/list_following": (3.05, 5),
+    "/upload_image": (3.05, 60),
+    "/upload_chunk": (3.05, 30),
+    "/download_image": (3.05, 30),
+}
+
+# Read-only endpoints that are safe to send again after a failure
+IDEMPOTENT_ENDPOINTS = {
+    "/status",
+    "/get_user",
+    "/get_profile_images",
+    "/get_recipe",
+    "/get_recipes",
+    "/list_recipes",
+    "/list_saved_recipes",
+    "/search",
+    "/search_recipes",
+    "/cook_with",
+    "/check_follow",
+    "/check_follows",
+    "/list_following",
+    "/count_followers",
+    "/get_notifications",
+    "/notifications_since",
+    "/get_notif",
+    "/download_image",
+}
+RETRY_STATUS_CODES = {502, 503, 504}
+
+
+class ServerUnavailable(requests.exceptions.ConnectionError):
+    """Raised without sending anything while the health monitor knows the server is down."""
+
+
+class ApiClient:
+    """HTTP client shared by every page, backed by one keep-alive connection pool."""
+
+    def __init__(self, base_url=BASE_URL, pool_size=10, max_retries=2, backoff=0.25, max_backoff=2.0):
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.monitor = None  # HealthMonitor told about every outcome; set when it starts
+
+        self.session = requests.Session()
+        # Retries are handled in request() so they can be limited to idempotent endpoints
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def url(self, endpoint):
+        """Build the absolute URL for an endpoint such as "/login"."""
+        return f"{self.base_url}{endpoint}"
+
+    def timeout_for(self, endpoint):
+        """Return the (connect, read) timeout configured for an endpoint."""
+        return ENDPOINT_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT)
+
+    def request(self, method, endpoint, retry=None, **kwargs):
+        """Send a request through the pooled session, retrying idempotent calls with jitter.
+
+        Raises ServerUnavailable at once while the server is known to be down;
+        only the monitor's own /status probes still go out.
+        """
+        monitor = self.monitor
+        if monitor is not None and monitor.is_down and endpoint != "/status":
+            raise ServerUnavailable(f"Server unreachable: {monitor.last_error}")
+        kwargs.setdefault("timeout", self.timeout_for(endpoint))
+        if retry is None:
+            retry = endpoint in IDEMPOTENT_ENDPOINTS
+        attempts = 1 + (self.max_retries if retry else 0)
+
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, self.url(endpoint), **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as ex:
+                metrics.record_request(endpoint, "error", time.perf_counter() - started)
+                # A slow answer (read timeout) still means the server is up
+                if monitor is not None and isinstance(ex, requests.exceptions.ConnectionError):
+                    monitor.report_failure(ex)
+                if last_attempt:
+                    raise
+            else:
+                self._record(endpoint, response, time.perf_counter() - started)
+                if monitor is not None:
+                    monitor.report_success()
+                if last_attempt or response.status_code not in RETRY_STATUS_CODES:
+                    return response
+            self._sleep_before_retry(attempt)
+
+    def post(self, endpoint, payload=None, **kwargs):
+        """POST a JSON payload to an endpoint."""
+        return self.request("POST", endpoint, json=payload, **kwargs)
+
+    def get(self, endpoint, **kwargs):
+        """GET an endpoint."""
+        return self.request("GET", endpoint, **kwargs)
+
+    @staticmethod
+    def _record(endpoint, response, seconds):
+        body = response.request.body
+        metrics.record_request(
+            endpoint, response.status_code, seconds,
+            request_bytes=len(body) if body else 0,
+            response_bytes=len(response.content),
+        )
+
+    def _sleep_before_retry(self, attempt):
+        # Exponential backoff with full jitter so many clients don't retry in lockstep
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+        time.sleep(random.uniform(0, delay))
+
+
+# Shared instance used by every page
+api = ApiClient()
@@ -0,0 +1,50 @@
+import base64
+import hashlib
+import os
+from functools import lru_cache
+
+# Bundled with the app, so placeholders never need the network
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+
+AVATAR_COLORS = ["#1E88E5", "#43A047", "#E53935", "#8E24AA", "#FB8C00", "#00897B", "#3949AB", "#6D4C41"]
+
+AVATAR_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="150" height="150" viewBox="0 0 150 150">'
+    '<rect width="150" height="150" fill="{color}"/>'
+    '<text x="75" y="75" dy="0.35em" text-anchor="middle" font-family="Arial, sans-serif" '
+    'font-size="72" font-weight="bold" fill="#FFFFFF">{letter}</text>'
+    "</svg>"
+)
+
+
+@lru_cache(maxsize=None)
+def asset_base64(name):
+    """Contents of a bundled asset, base64-encoded for ft.Image(src_base64=...). Read once."""
+    with open(os.path.join(ASSETS_DIR, name), "rb") as f:
+        return base64.b64encode(f.read()).decode("ascii")
+
+
+@lru_cache(maxsize=1024)
+def avatar_base64(username):
+    """Initial-letter avatar for a user, with a colour that stays the same for that username."""
+    username = username or "?"
+    color = AVATAR_COLORS[hashlib.md5(username.encode()).digest()[0] % len(AVATAR_COLORS)]
+    letter = username[0].upper()
+    if letter in "<>&\"'":
+        letter = "?"
+    svg = AVATAR_SVG.format(color=color, letter=letter)
+    return base64.b64encode(svg.encode()).decode("ascii")
+
+
+def banner_base64():
+    return asset_base64("banner.svg")
+
+
+def recipe_placeholder_base64():
+    return asset_base64("recipe.svg")
+
+
+def set_image_source(image, path, placeholder):
+    """Point an ft.Image at a local file, or at an in-memory placeholder when there is no file."""
+    image.src = path or None
+    image.src_base64 = None if path else placeholder
@@ -0,0 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_IO_WORKERS = 8  # Network calls that can be in flight at once, across all pages
+
+# Blocking I/O (HTTP, disk) runs here, never on the Flet event callback
+_io_executor = ThreadPoolExecutor(max_workers=MAX_IO_WORKERS, thread_name_prefix="lethimcook-io")
+# Results are handed back on one thread, so UI mutations happen in order and never interleave
+_ui_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lethimcook-ui")
+
+
+def run_in_background(work, *args, on_success=None, on_error=None):
+    """Run work(*args) on the shared I/O pool and pass the result (or exception) to the callbacks.
+
+    The callbacks run on the UI dispatch thread, one at a time.
+    Returns the Future of the background work.
+    """
+    def task():
+        try:
+            result = work(*args)
+        except Exception as ex:
+            if on_error:
+                run_on_ui(on_error, ex)
+            else:
+                print(f"Error in background task: {ex}")
+            raise
+        if on_success:
+            run_on_ui(on_success, result)
+        return result
+
+    return _io_executor.submit(task)
+
+
+def run_on_ui(callback, *args):
+    """Queue callback(*args) on the UI dispatch thread."""
+    def task():
+        try:
+            callback(*args)
+        except Exception as ex:
+            # Usually the control was removed from the page while the request was running
+            print(f"Error updating the UI: {ex}")
+
+    return _ui_executor.submit(task)
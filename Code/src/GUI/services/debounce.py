@@ -0,0 +1,69 @@
+import threading
+
+from services.background import run_on_ui
+
+
+class Superseded(Exception):
+    """Raised inside a debounced job when a newer call has replaced it."""
+
+
+class DebouncedRunner:
+    """Run a job only after input settles, and only deliver the result of the latest call.
+
+    `work(*args, check)` runs on a background thread. It should call `check()` between
+    slow steps; `check()` raises Superseded once a newer call was submitted, so stale
+    jobs stop early instead of finishing requests nobody will see.
+    `on_result(result)` is only called for the most recent submission, on the UI thread.
+    """
+
+    def __init__(self, work, on_result, delay=0.3):
+        self.work = work
+        self.on_result = on_result
+        self.delay = delay
+        self._generation = 0
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def submit(self, *args):
+        """Schedule a run with the given arguments, replacing any pending or running one."""
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            if self._timer:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self._run, args=(generation, args))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def cancel(self):
+        """Drop the pending run and ignore the result of the running one."""
+        with self._lock:
+            self._generation += 1
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+
+    def is_current(self, generation):
+        return generation == self._generation
+
+    def _run(self, generation, args):
+        def check():
+            if not self.is_current(generation):
+                raise Superseded()
+
+        try:
+            check()
+            result = self.work(*args, check)
+        except Superseded:
+            return
+        except Exception as ex:
+            print(f"Error in background job: {ex}")
+            return
+
+        if self.is_current(generation):
+            run_on_ui(self._deliver, generation, result)
+
+    def _deliver(self, generation, result):
+        # Checked again on the UI thread: a newer submit() or cancel() may have come in while it was queued
+        if self.is_current(generation):
+            self.on_result(result)
@@ -0,0 +1,108 @@
+import threading
+import time
+
+from services.api_client import api
+from services.sync import sync_queue
+
+RETRY_DELAY = 15.0  # Seconds before asking for the list again after a failure, doubled after every failure
+MAX_RETRY_DELAY = 300.0
+
+
+class FollowState:
+    """The users the logged-in user follows, loaded once and kept in memory.
+
+    Follow and unfollow update the set at once and leave the request to the
+    sync queue, so neither labelling nor pressing a Follow button waits for
+    the server; rollback() undoes one the server refused. If the full list
+    can't be loaded, following() falls back to one bulk /check_follows per call
+    until a later attempt, after a growing delay, gets it.
+    """
+
+    def __init__(self, username):
+        self.username = username
+        self._following = None  # set of usernames; None until loaded
+        self._known = {}  # username -> bool, from bulk checks while the set is not loaded
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()  # Concurrent callers wait for one request instead of each sending one
+        self._retry_at = 0.0  # monotonic time before which a failed load is not retried; bulk checks take over
+        self._retry_delay = RETRY_DELAY
+
+    def load(self):
+        """Fetch the whole followee list. Blocking; True if it is now in memory."""
+        with self._load_lock:
+            if self._following is not None:
+                return True
+            if time.monotonic() < self._retry_at:
+                return False
+            response = api.post("/list_following", {"username": self.username})
+            if response.status_code != 200:
+                print(f"Failed to load followed users: {response.text}")
+                self._retry_at = time.monotonic() + self._retry_delay
+                self._retry_delay = min(self._retry_delay * 2, MAX_RETRY_DELAY)
+                return False
+            with self._lock:
+                self._following = set(response.json().get("following", []))
+            # Follows still queued are not on the server yet
+            for username, followed in sync_queue(self.username).pending_follows().items():
+                self._record(username, followed)
+            return True
+
+    def is_following(self, username):
+        """Known state only; never blocks."""
+        with self._lock:
+            if self._following is not None:
+                return username in self._following
+            return self._known.get(username, False)
+
+    def following(self, usernames):
+        """The subset of usernames that are followed. Blocking the first time only."""
+        if not self.load():
+            with self._lock:
+                unknown = [name for name in usernames if name not in self._known]
+            if unknown:
+                self._check_bulk(unknown)
+        return {name for name in usernames if self.is_following(name)}
+
+    def follow(self, username):
+        """Follow a user. Never blocks: the sync queue sends the request."""
+        self._record(username, True)
+        sync_queue(self.username).follow(username)
+
+    def unfollow(self, username):
+        """Unfollow a user. Never blocks: the sync queue sends the request."""
+        self._record(username, False)
+        sync_queue(self.username).unfollow(username)
+
+    def rollback(self, change):
+        """The server refused a queued follow or unfollow: put back the previous state."""
+        self._record(change["payload"]["followed_username"], change["op"] == "unfollow")
+
+    def _record(self, username, followed):
+        with self._lock:
+            self._known[username] = followed
+            if self._following is not None:
+                if followed:
+                    self._following.add(username)
+                else:
+                    self._following.discard(username)
+
+    def _check_bulk(self, usernames):
+        response = api.post("/check_follows", {"follower_username": self.username, "usernames": usernames})
+        if response.status_code != 200:
+            print(f"Failed to check followed users: {response.text}")
+            return
+        followed = set(response.json().get("following", []))
+        with self._lock:
+            for name in usernames:
+                self._known[name] = name in followed
+
+
+_current = None
+
+
+def follow_state(username):
+    """The FollowState of the logged-in user, shared by every page."""
+    global _current
+    if _current is None or _current.username != username:
+        _current = FollowState(username)
+    return _current
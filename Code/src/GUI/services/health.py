@@ -0,0 +1,107 @@
+import random
+import threading
+import time
+
+import requests
+from services.api_client import api
+from services.background import run_on_ui
+
+CHECK_INTERVAL = 30.0  # Seconds between checks while the server answers; skipped if other requests just did
+PROBE_DELAY = 1.0  # Seconds before probing a server found down again, doubled after every failed probe
+MAX_PROBE_DELAY = 15.0  # Kept short: requests fail fast until a probe sees the server back
+
+UNKNOWN, UP, DOWN = "unknown", "up", "down"
+
+
+class HealthMonitor:
+    """Whether the server is reachable, shared by every page and the Sidebar.
+
+    A background thread probes /status: every CHECK_INTERVAL while the server
+    answers, and with jittered exponential backoff while it doesn't. Every other
+    request reports its outcome as well, so a lost connection is noticed at once.
+    While the server is known to be down the ApiClient raises ServerUnavailable
+    without sending anything, instead of each request waiting out its own
+    connect timeout. Listeners get the new state on the UI thread.
+    """
+
+    def __init__(self, client=api):
+        self.client = client
+        self.state = UNKNOWN
+        self.last_error = None
+        self._last_success = 0.0  # monotonic time of the last answer from the server
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start probing; from now on the client fails fast while the server is down."""
+        if self._thread is None:
+            self.client.monitor = self
+            self._thread = threading.Thread(target=self._run, name="lethimcook-health", daemon=True)
+            self._thread.start()
+
+    def subscribe(self, listener):
+        """Call listener(state) on the UI thread whenever the state changes."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    @property
+    def is_down(self):
+        return self.state == DOWN
+
+    def check_now(self):
+        """Probe right away instead of waiting for the next check."""
+        self._wake.set()
+
+    def report_success(self):
+        """The server answered a request (whatever the status code)."""
+        self._last_success = time.monotonic()
+        self._set(UP)
+
+    def report_failure(self, error):
+        """A request could not reach the server."""
+        self.last_error = str(error)
+        if self._set(DOWN):
+            self._wake.set()  # Leave the CHECK_INTERVAL wait and start backing off
+
+    def _run(self):
+        delay = PROBE_DELAY
+        while True:
+            if self.state == DOWN:
+                # Jitter, so clients cut off by a server restart don't all come back at once
+                self._wake.wait(random.uniform(delay / 2, delay))
+                delay = min(delay * 2, MAX_PROBE_DELAY)
+            else:
+                delay = PROBE_DELAY
+                self._wake.wait(CHECK_INTERVAL if self.state == UP else 0)
+            self._wake.clear()
+            if self.state != UP or time.monotonic() - self._last_success >= CHECK_INTERVAL:
+                self._probe()
+
+    def _probe(self):
+        try:
+            response = self.client.get("/status", retry=False)
+        except requests.RequestException as ex:
+            self.report_failure(ex)  # A read timeout too: the server took the connection but can't answer
+            return
+        if response.status_code != 200:
+            self.report_failure(f"/status answered {response.status_code}")
+
+    def _set(self, state):
+        """Change the state and tell the listeners. Returns True if it changed."""
+        with self._lock:
+            if self.state == state:
+                return False
+            self.state = state
+        print(f"Server is {state}" + (f": {self.last_error}" if state == DOWN else ""))
+        for listener in list(self._listeners):
+            run_on_ui(listener, state)
+        return True
+
+
+# Shared by every page; started by the app
+health = HealthMonitor()
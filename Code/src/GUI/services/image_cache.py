@@ -0,0 +1,224 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from services.api_client import api
+
+try:  # Optional (pip install Pillow): without it images are cached and shown at their original size
+    from PIL import Image
+except ImportError:
+    Image = None
+
+CACHE_DIR = os.environ.get(
+    "LETHIMCOOK_IMAGE_CACHE", os.path.join(os.path.expanduser("~"), ".lethimcook", "images")
+)
+MAX_CACHE_BYTES = 200 * 1024 * 1024  # Disk budget; least recently used files go first
+
+# Thumbnail sizes in pixels, twice the size they are drawn at so they stay sharp on HiDPI screens
+CARD_SIZE = (280, 280)
+AVATAR_SIZE = (300, 300)
+BANNER_SIZE = (2160, 400)
+
+
+class ImageCache:
+    """On-disk cache of server images, addressed by the hash of their content.
+
+    The server names every upload uniquely (images/i_<n>.jpg), so a server path
+    always maps to the same bytes and the mapping is kept for good in index.json.
+    Thumbnails are generated once per size and served to ft.Image as local paths.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._index_path = os.path.join(directory, "index.json")
+        self._lock = threading.Lock()
+        self._inflight = {}  # server path -> [lock, callers using it], so one image is only downloaded once at a time
+        self._index = None  # server path -> content hash, loaded on first use
+        self._files = None  # local path -> size, least recently used first; the directory is listed once
+        self._total = 0  # Bytes of all the files in self._files
+
+    def cached(self, source, size):
+        """Local path of the thumbnail if it is already on disk, without any request."""
+        if not source:
+            return None
+        with self._lock:
+            digest = self._load_index().get(source)
+        if digest is None:
+            return None
+        path = self._thumbnail_path(digest, size)
+        if not os.path.exists(path):
+            return None
+        self._touch(path)
+        return path
+
+    def get(self, source, size):
+        """Local path of the thumbnail, downloading and resizing the image if needed.
+
+        Blocking; call it from a background thread. Returns None if the server has no such image.
+        """
+        path = self.cached(source, size)
+        if path or not source:
+            return path
+
+        with self._lock:
+            inflight = self._inflight.setdefault(source, [threading.Lock(), 0])
+            inflight[1] += 1
+        try:
+            with inflight[0]:
+                path = self.cached(source, size)  # Another thread may have just fetched it
+                if path:
+                    return path
+                path = self._fetch(source, size)
+        finally:
+            with self._lock:
+                inflight[1] -= 1
+                if inflight[1] == 0:  # Nobody else is waiting for this image
+                    del self._inflight[source]
+
+        if path:
+            self._evict()
+        return path
+
+    def _fetch(self, source, size):
+        with self._lock:
+            digest = self._load_index().get(source)
+        original = self._original_path(digest) if digest else None
+        if original is None or not os.path.exists(original):
+            digest = self._download(source)
+            if digest is None:
+                return None
+        return self._make_thumbnail(digest, size)
+
+    def _download(self, source):
+        response = api.post("/download_image", {"path": source})
+        if response.status_code != 200:
+            print(f"Failed to download image {source}: {response.status_code}")
+            return None
+
+        data = response.content
+        digest = hashlib.sha256(data).hexdigest()
+        original = self._original_path(digest)
+        if not os.path.exists(original):  # Same picture uploaded twice is stored once
+            self._write(original, data)
+            self._track(original)
+        with self._lock:
+            self._load_index()[source] = digest
+            self._write(self._index_path, json.dumps(self._index).encode())
+        return digest
+
+    def _make_thumbnail(self, digest, size):
+        path = self._thumbnail_path(digest, size)
+        if os.path.exists(path):
+            return path
+        original = self._original_path(digest)
+        if Image is None:
+            return original
+        try:
+            with Image.open(original) as image:
+                image.thumbnail(size)
+                image.convert("RGB").save(path + ".tmp", "JPEG", quality=85)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            print(f"Could not create thumbnail for {digest}: {e}")
+            return original
+        self._track(path)
+        return path
+
+    def _evict(self):
+        """Delete least recently used files until the cache fits in max_bytes."""
+        with self._lock:
+            files = self._load_files()
+            for path in list(files):
+                if self._total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass  # Already gone; just stop counting it
+                except OSError:
+                    continue  # Still in use on Windows; try again next time
+                self._total -= files.pop(path)
+
+    def _track(self, path):
+        """Count a file that was just written as the most recently used."""
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        with self._lock:
+            files = self._load_files()
+            self._total += size - files.pop(path, 0)
+            files[path] = size
+
+    def _load_files(self):
+        # Callers hold self._lock
+        if self._files is None:
+            os.makedirs(self.directory, exist_ok=True)
+            found = []
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                # Skip files still being written by another thread (*.tmp); they are renamed when done
+                if name == "index.json" or name.endswith(".tmp") or not os.path.isfile(path):
+                    continue
+                stat = os.stat(path)
+                found.append((stat.st_mtime, path, stat.st_size))
+            self._files = OrderedDict((path, size) for _, path, size in sorted(found))
+            self._total = sum(self._files.values())
+        return self._files
+
+    def _load_index(self):
+        # Callers hold self._lock
+        if self._index is None:
+            os.makedirs(self.directory, exist_ok=True)
+            try:
+                with open(self._index_path) as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _original_path(self, digest):
+        return os.path.join(self.directory, digest)
+
+    def _thumbnail_path(self, digest, size):
+        if Image is None:
+            return self._original_path(digest)
+        return os.path.join(self.directory, f"{digest}_{size[0]}x{size[1]}.jpg")
+
+    def _touch(self, path):
+        # The modification time doubles as the last access time, so the order survives restarts
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            files = self._load_files()
+            if path in files:
+                files.move_to_end(path)
+
+    @staticmethod
+    def _write(path, data):
+        # Write then rename, so a crash never leaves a truncated image behind
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+# Shared by every page
+image_cache = ImageCache()
+
+
+def profile_images(username):
+    """Local paths of a user's (profile picture, banner), None for each one they don't have.
+
+    Blocking; call it from a background thread.
+    """
+    response = api.post("/get_profile_images", {"username": username})
+    if response.status_code != 200:
+        return None, None
+    data = response.json()
+    return image_cache.get(data.get("profile_pic"), AVATAR_SIZE), image_cache.get(data.get("banner"), BANNER_SIZE)
@@ -0,0 +1,192 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Set LETHIMCOOK_LOCAL_DB to keep the offline copy somewhere else (":memory:" disables it)
+LOCAL_DB = os.environ.get(
+    "LETHIMCOOK_LOCAL_DB", os.path.join(os.path.expanduser("~"), ".lethimcook", "local.db")
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recipes (
+    id INTEGER PRIMARY KEY,
+    record TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS pages (
+    username TEXT NOT NULL,
+    saved INTEGER NOT NULL,
+    cursor TEXT NOT NULL,
+    ids TEXT NOT NULL,
+    next_cursor TEXT NOT NULL,
+    PRIMARY KEY (username, saved, cursor));
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    op TEXT NOT NULL,
+    recipe_id INTEGER,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    error TEXT,
+    created_at REAL NOT NULL);
+"""
+
+
+class LocalStore:
+    """On-disk mirror of the user's own and saved recipes, plus the outbox of unsent changes.
+
+    Collections are stored as the server's pages, keyed by the cursor that
+    requested them, so paging works offline exactly as it does online. Only
+    records of recipes that appear in a stored page (or in the outbox) are kept.
+    """
+
+    def __init__(self, path=LOCAL_DB):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # One connection shared by every thread, serialized by the lock
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL;")
+            self._db.executescript(SCHEMA)
+        self._mirrored = None  # Ids in any stored page, rebuilt after pages change
+
+    # Pages of a collection
+
+    def page(self, username, saved, cursor):
+        """(ids, next_cursor) stored for this cursor, or None if that page was never loaded."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT ids, next_cursor FROM pages WHERE username = ? AND saved = ? AND cursor = ?;",
+                (username, int(saved), json.dumps(cursor)),
+            ).fetchone()
+        return (json.loads(row[0]), json.loads(row[1])) if row else None
+
+    def put_page(self, username, saved, cursor, ids, next_cursor):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages (username, saved, cursor, ids, next_cursor) VALUES (?, ?, ?, ?, ?);",
+                (username, int(saved), json.dumps(cursor), json.dumps(list(ids)), json.dumps(next_cursor)),
+            )
+            self._mirrored = None
+
+    def remove_from_pages(self, recipe_id):
+        """Drop a deleted recipe from every stored page."""
+        with self._lock, self._db:
+            rows = self._db.execute("SELECT rowid, ids FROM pages;").fetchall()
+            for rowid, ids in rows:
+                ids = json.loads(ids)
+                if recipe_id in ids:
+                    ids.remove(recipe_id)
+                    self._db.execute("UPDATE pages SET ids = ? WHERE rowid = ?;", (json.dumps(ids), rowid))
+            self._db.execute("DELETE FROM recipes WHERE id = ?;", (recipe_id,))
+            self._mirrored = None
+
+    # Recipe records
+
+    def records(self, recipe_ids):
+        """{id: record} for the ids that are stored."""
+        recipe_ids = list(recipe_ids)
+        if not recipe_ids:
+            return {}
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT record FROM recipes WHERE id IN ({', '.join('?' * len(recipe_ids))});", recipe_ids
+            ).fetchall()
+        records = (json.loads(row[0]) for row in rows)
+        return {record["id"]: record for record in records}
+
+    def put_records(self, records, force=False):
+        """Store server records of mirrored recipes; force stores them regardless (local changes)."""
+        with self._lock, self._db:
+            keep = None if force else self._mirrored_ids()
+            self._db.executemany(
+                "INSERT OR REPLACE INTO recipes (id, record) VALUES (?, ?);",
+                [(record["id"], json.dumps(record)) for record in records if keep is None or record["id"] in keep],
+            )
+
+    def put_new_record(self, record):
+        """Store a recipe created offline under a new temporary id. Returns the record with its id.
+
+        The id is negative, so it never clashes with a server id, and it is
+        claimed in the same step as the record is stored, so two recipes added
+        at once never get the same one.
+        """
+        with self._lock, self._db:
+            lowest = self._db.execute("SELECT MIN(id) FROM recipes;").fetchone()[0]
+            record = dict(record, id=min(lowest or 0, 0) - 1)
+            self._db.execute("INSERT INTO recipes (id, record) VALUES (?, ?);", (record["id"], json.dumps(record)))
+        return record
+
+    def replace_id(self, temp_id, recipe_id):
+        """The server created an offline recipe: move the record and the queued changes to its real id."""
+        with self._lock, self._db:
+            row = self._db.execute("SELECT record FROM recipes WHERE id = ?;", (temp_id,)).fetchone()
+            self._db.execute("DELETE FROM recipes WHERE id = ?;", (temp_id,))
+            if row:
+                record = dict(json.loads(row[0]), id=recipe_id)
+                self._db.execute("INSERT OR REPLACE INTO recipes (id, record) VALUES (?, ?);", (recipe_id, json.dumps(record)))
+            for seq, payload in self._db.execute("SELECT seq, payload FROM outbox WHERE recipe_id = ?;", (temp_id,)).fetchall():
+                payload = {key: recipe_id if value == temp_id else value for key, value in json.loads(payload).items()}
+                self._db.execute(
+                    "UPDATE outbox SET recipe_id = ?, payload = ? WHERE seq = ?;", (recipe_id, json.dumps(payload), seq)
+                )
+
+    def prune(self):
+        """Forget records that no stored page or queued change refers to."""
+        with self._lock, self._db:
+            keep = self._mirrored_ids() | {
+                row[0] for row in self._db.execute("SELECT recipe_id FROM outbox WHERE recipe_id IS NOT NULL;")
+            }
+            stored = [row[0] for row in self._db.execute("SELECT id FROM recipes;")]
+            self._db.executemany("DELETE FROM recipes WHERE id = ?;", [(i,) for i in stored if i not in keep])
+
+    def _mirrored_ids(self):
+        # Call with the lock held
+        if self._mirrored is None:
+            self._mirrored = set()
+            for (ids,) in self._db.execute("SELECT ids FROM pages;"):
+                self._mirrored.update(json.loads(ids))
+        return self._mirrored
+
+    # Outbox
+
+    def enqueue(self, username, op, payload, recipe_id=None):
+        """Persist a change to send later. Returns its sequence number."""
+        with self._lock, self._db:
+            return self._db.execute(
+                "INSERT INTO outbox (username, op, recipe_id, payload, created_at) VALUES (?, ?, ?, ?, ?);",
+                (username, op, recipe_id, json.dumps(payload), time.time()),
+            ).lastrowid
+
+    def outbox(self, username, status="pending"):
+        """Queued changes of a user, oldest first, as dicts."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT seq, op, recipe_id, payload, error FROM outbox WHERE username = ? AND status = ? ORDER BY seq;",
+                (username, status),
+            ).fetchall()
+        return [
+            {"seq": seq, "op": op, "recipe_id": recipe_id, "payload": json.loads(payload), "error": error}
+            for seq, op, recipe_id, payload, error in rows
+        ]
+
+    def pending_recipe_ids(self):
+        """Recipes with a change waiting to be sent, whatever the user."""
+        with self._lock:
+            rows = self._db.execute("SELECT DISTINCT recipe_id FROM outbox WHERE status = 'pending';").fetchall()
+        return {row[0] for row in rows if row[0] is not None}
+
+    def set_status(self, seq, status, error=None, payload=None):
+        with self._lock, self._db:
+            self._db.execute("UPDATE outbox SET status = ?, error = ? WHERE seq = ?;", (status, error, seq))
+            if payload is not None:
+                self._db.execute("UPDATE outbox SET payload = ? WHERE seq = ?;", (json.dumps(payload), seq))
+
+    def remove(self, seq):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM outbox WHERE seq = ?;", (seq,))
+
+
+# Shared by the recipe service and the sync queue
+local_store = LocalStore()
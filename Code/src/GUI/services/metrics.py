@@ -0,0 +1,262 @@
+import atexit
+import json
+import os
+import threading
+import time
+
+# Set LETHIMCOOK_METRICS=/path/metrics.json (or .prom for Prometheus text) to save the session's metrics on exit
+EXPORT_PATH = os.environ.get("LETHIMCOOK_METRICS")
+
+# Histogram upper bounds, as in Prometheus: seconds for latencies, bytes for payloads
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+NO_PAGE = "-"  # Requests made before any page was shown (login, signup)
+
+# Cold start budget: seconds from the first line of app.py to a login form that accepts input
+STARTUP_BUDGET = float(os.environ.get("LETHIMCOOK_STARTUP_BUDGET", "1.5"))
+STARTUP_PHASES = ("imports", "window", "first_frame", "interactive")
+
+
+class Histogram:
+    """Fixed-bucket histogram: constant memory however many values are observed."""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                break
+        else:
+            i = len(self.bounds)
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Estimate a quantile by interpolating inside its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                if i == len(self.bounds):
+                    return self.bounds[-1]  # Only known to be above the last bound
+                lower = self.bounds[i - 1] if i else 0.0
+                return lower + (self.bounds[i] - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.bounds[-1]
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip([str(b) for b in self.bounds] + ["+Inf"], self.counts)),
+        }
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.response_bytes = Histogram(SIZE_BUCKETS)
+        self.request_bytes = 0
+        self.statuses = {}  # status code (or "error" for no response) -> count
+
+    def to_dict(self):
+        return {
+            "calls": self.latency.count,
+            "statuses": dict(self.statuses),
+            "latency_seconds": self.latency.to_dict(),
+            "response_bytes": self.response_bytes.to_dict(),
+            "request_bytes_total": self.request_bytes,
+        }
+
+
+class PageStats:
+    def __init__(self):
+        self.views = 0
+        self.builds = 0  # Views that had to create the page (not served from the page cache)
+        self.show_time = Histogram(LATENCY_BUCKETS)
+        self.calls = {}  # endpoint -> requests made while this page was shown
+
+    def to_dict(self):
+        total = sum(self.calls.values())
+        return {
+            "views": self.views,
+            "builds": self.builds,
+            "show_seconds": self.show_time.to_dict(),
+            "calls": dict(self.calls),
+            # A high ratio for one endpoint is usually an N+1 loop in the page
+            "calls_per_view": {endpoint: count / max(1, self.views) for endpoint, count in self.calls.items()},
+            "calls_total": total,
+        }
+
+
+class Metrics:
+    """Request and page-view metrics for the current session.
+
+    ApiClient reports every HTTP attempt (retries included) and AppController
+    every page shown. Requests are attributed to the page on screen when they
+    start, so a background load that outlives its page counts for the next one.
+
+    The cold start is traced too: each of STARTUP_PHASES is stamped once, in
+    seconds since app.py started, and checked against STARTUP_BUDGET.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.current_page = NO_PAGE
+        self.endpoints = {}  # endpoint -> EndpointStats
+        self.pages = {}  # page -> PageStats
+        self.startup_origin = time.perf_counter()  # Replaced by app.py with its own first timestamp
+        self.startup = {}  # phase -> seconds since startup_origin
+
+    def set_page(self, page):
+        with self._lock:
+            self.current_page = page
+            self.pages.setdefault(page, PageStats())
+
+    def record_request(self, endpoint, status, seconds, request_bytes=0, response_bytes=0):
+        with self._lock:
+            stats = self.endpoints.setdefault(endpoint, EndpointStats())
+            stats.latency.observe(seconds)
+            stats.response_bytes.observe(response_bytes)
+            stats.request_bytes += request_bytes
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+            page = self.pages.setdefault(self.current_page, PageStats())
+            page.calls[endpoint] = page.calls.get(endpoint, 0) + 1
+
+    def record_page_view(self, page, seconds, built):
+        with self._lock:
+            stats = self.pages.setdefault(page, PageStats())
+            stats.views += 1
+            stats.builds += built
+            stats.show_time.observe(seconds)
+
+    def mark_startup(self, phase):
+        """Stamp a startup phase the first time it is reached; later calls (a second login) are ignored."""
+        with self._lock:
+            if phase in self.startup:
+                return
+            self.startup[phase] = time.perf_counter() - self.startup_origin
+        if phase == STARTUP_PHASES[-1]:
+            print(self.startup_summary())
+
+    def startup_report(self):
+        with self._lock:
+            phases = dict(self.startup)
+        interactive = phases.get(STARTUP_PHASES[-1])
+        return {
+            "phases_seconds": phases,
+            "budget_seconds": STARTUP_BUDGET,
+            "within_budget": None if interactive is None else interactive <= STARTUP_BUDGET,
+        }
+
+    def startup_summary(self):
+        report = self.startup_report()
+        phases = ", ".join(f"{phase} {seconds * 1000:.0f} ms" for phase, seconds in report["phases_seconds"].items())
+        verdict = "within" if report["within_budget"] else "OVER"
+        return f"Startup: {phases} ({verdict} the {STARTUP_BUDGET * 1000:.0f} ms budget)"
+
+    def snapshot(self):
+        startup = self.startup_report()
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "duration_seconds": time.time() - self.started_at,
+                "startup": startup,
+                "endpoints": {name: stats.to_dict() for name, stats in sorted(self.endpoints.items())},
+                "pages": {name: stats.to_dict() for name, stats in sorted(self.pages.items())},
+            }
+
+    def to_prometheus(self):
+        """The metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP lethimcook_client_startup_seconds Seconds from launch to each startup phase.",
+            "# TYPE lethimcook_client_startup_seconds gauge",
+        ]
+        with self._lock:
+            for phase, seconds in self.startup.items():
+                lines.append(f'lethimcook_client_startup_seconds{{phase="{phase}"}} {seconds}')
+            lines += _histogram_lines(
+                "lethimcook_client_request_duration_seconds", "HTTP request latency per endpoint.",
+                {name: stats.latency for name, stats in self.endpoints.items()}, "endpoint",
+            )
+            lines += _histogram_lines(
+                "lethimcook_client_response_bytes", "Response body size per endpoint.",
+                {name: stats.response_bytes for name, stats in self.endpoints.items()}, "endpoint",
+            )
+            lines += [
+                "# HELP lethimcook_client_request_bytes_total Request body bytes sent per endpoint.",
+                "# TYPE lethimcook_client_request_bytes_total counter",
+            ]
+            for name, stats in sorted(self.endpoints.items()):
+                lines.append(f'lethimcook_client_request_bytes_total{{endpoint="{name}"}} {stats.request_bytes}')
+            lines += [
+                "# HELP lethimcook_client_requests_total Requests per endpoint and status.",
+                "# TYPE lethimcook_client_requests_total counter",
+            ]
+            for name, stats in sorted(self.endpoints.items()):
+                for status, count in sorted(stats.statuses.items(), key=str):
+                    lines.append(f'lethimcook_client_requests_total{{endpoint="{name}",status="{status}"}} {count}')
+            lines += [
+                "# HELP lethimcook_client_page_requests_total Requests per page and endpoint.",
+                "# TYPE lethimcook_client_page_requests_total counter",
+            ]
+            for page, stats in sorted(self.pages.items()):
+                for name, count in sorted(stats.calls.items()):
+                    lines.append(f'lethimcook_client_page_requests_total{{page="{page}",endpoint="{name}"}} {count}')
+            lines += [
+                "# HELP lethimcook_client_page_views_total Times each page was shown.",
+                "# TYPE lethimcook_client_page_views_total counter",
+            ]
+            for page, stats in sorted(self.pages.items()):
+                lines.append(f'lethimcook_client_page_views_total{{page="{page}"}} {stats.views}')
+            lines += _histogram_lines(
+                "lethimcook_client_page_show_seconds", "Time to build or reveal a page.",
+                {page: stats.show_time for page, stats in self.pages.items()}, "page",
+            )
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """Write the metrics to path: Prometheus text for .prom/.txt, JSON otherwise."""
+        if path.endswith((".prom", ".txt")):
+            data = self.to_prometheus()
+        else:
+            data = json.dumps(self.snapshot(), indent=2)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Write then rename, so a reader never sees a half-written file
+        with open(path + ".tmp", "w") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+
+
+def _histogram_lines(name, help_text, histograms, label):
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for key, histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip(list(histogram.bounds) + ["+Inf"], histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{label}="{key}",le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_sum{{{label}="{key}"}} {histogram.sum}')
+        lines.append(f'{name}_count{{{label}="{key}"}} {histogram.count}')
+    return lines
+
+
+# Shared by the HTTP client and the app controller
+metrics = Metrics()
+
+if EXPORT_PATH:
+    atexit.register(lambda: metrics.export(EXPORT_PATH))
@@ -0,0 +1,168 @@
+import json
+import os
+import random
+import threading
+from urllib.parse import urlencode
+
+from services.api_client import api
+from services.background import run_on_ui
+
+try:  # Optional: without websockets new notifications are polled every POLL_INTERVAL
+    from websockets.sync.client import connect
+except ImportError:
+    connect = None
+
+RECONNECT_DELAY = 1.0  # Seconds before the first reconnect, doubled after every failure
+MAX_RECONNECT_DELAY = 60.0
+POLL_INTERVAL = 30.0  # Seconds between catch-ups when there is no WebSocket
+
+# Newest notification already shown to each user, so the badge survives restarts
+SEEN_FILE = os.path.join(os.path.expanduser("~"), ".lethimcook", "notifications.json")
+
+_seen_lock = threading.Lock()
+
+
+class NotificationStream:
+    """Live notifications of the logged-in user over one WebSocket.
+
+    The server pushes each notification as it is created. After every
+    (re)connect, /notifications_since fetches the ones created while the socket
+    was down, starting after the newest id already known, so no row is sent twice.
+    Listeners get the new notifications on the UI thread.
+    """
+
+    def __init__(self, username):
+        self.username = username
+        self.notifications = {}  # id -> notification, in id order
+        self.cursor = 0  # Newest id received
+        self.seen = _load_seen(username)  # Newest id the user has looked at
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._socket = None
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="lethimcook-notifications", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Close the connection; no listener is called afterwards."""
+        self._stop.set()
+        socket = self._socket
+        if socket is not None:
+            socket.close()
+
+    def subscribe(self, listener):
+        """Call listener(new_notifications) on the UI thread whenever the list changes."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def items(self):
+        """Notifications received so far, newest first."""
+        with self._lock:
+            return sorted(self.notifications.values(), key=lambda n: n["id"], reverse=True)
+
+    def unread_count(self):
+        with self._lock:
+            return sum(1 for notification_id in self.notifications if notification_id > self.seen)
+
+    def mark_seen(self):
+        """Everything received so far has been shown; clears the unread badge."""
+        with self._lock:
+            if self.cursor <= self.seen:
+                return
+            self.seen = self.cursor
+        _save_seen(self.username, self.seen)
+        self._notify([])
+
+    def dismiss(self, notification_id):
+        """Delete a notification on the server (/read_notif) and locally. Blocking; returns the response."""
+        response = api.post("/read_notif", {"id": notification_id})
+        if response.status_code in (200, 404):  # 404: already gone on the server
+            with self._lock:
+                self.notifications.pop(notification_id, None)
+            self._notify([])
+        return response
+
+    def _run(self):
+        delay = RECONNECT_DELAY
+        while not self._stop.is_set():
+            try:
+                if connect is None:
+                    self._catch_up()
+                    self._stop.wait(POLL_INTERVAL)
+                    continue
+                self._listen()
+                delay = RECONNECT_DELAY  # The connection worked; it was closed by the server or network
+            except Exception as ex:
+                print(f"Notification stream error: {ex}")
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+            # Jitter, so clients dropped together by a server restart don't reconnect together
+            self._stop.wait(random.uniform(delay / 2, delay))
+
+    def _listen(self):
+        url = api.base_url.replace("http", "ws", 1) + "/ws/notifications?" + urlencode({"username": self.username})
+        with connect(url, open_timeout=5, close_timeout=2) as socket:
+            self._socket = socket
+            try:
+                if self._stop.is_set():
+                    return
+                # Connect first, then catch up: anything created in between arrives twice and is dropped by id
+                self._catch_up()
+                for message in socket:
+                    self._add([json.loads(message)])
+            finally:
+                self._socket = None
+
+    def _catch_up(self):
+        cursor = self.cursor
+        while cursor is not None and not self._stop.is_set():
+            response = api.post("/notifications_since", {"username": self.username, "cursor": cursor})
+            if response.status_code != 200:
+                raise RuntimeError(f"could not fetch notifications: {response.text}")
+            data = response.json()
+            self._add(data["notifications"])
+            cursor = data.get("next_cursor")
+
+    def _add(self, notifications):
+        with self._lock:
+            new = [n for n in notifications if n["id"] not in self.notifications and n["id"] > self.cursor]
+            for notification in new:
+                self.notifications[notification["id"]] = notification
+            if new:
+                self.cursor = max(self.cursor, max(n["id"] for n in new))
+        if new:
+            self._notify(new)
+
+    def _notify(self, new):
+        if self._stop.is_set():
+            return
+        for listener in list(self._listeners):
+            run_on_ui(listener, new)
+
+
+def _load_seen(username):
+    try:
+        with open(SEEN_FILE) as f:
+            return json.load(f).get(username, 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def _save_seen(username, seen):
+    with _seen_lock:
+        try:
+            with open(SEEN_FILE) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        state[username] = seen
+        os.makedirs(os.path.dirname(SEEN_FILE), exist_ok=True)
+        with open(SEEN_FILE + ".tmp", "w") as f:
+            json.dump(state, f)
+        os.replace(SEEN_FILE + ".tmp", SEEN_FILE)
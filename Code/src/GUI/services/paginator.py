@@ -0,0 +1,100 @@
+import threading
+
+DEFAULT_MAX_PAGES = 4  # Pages kept materialized at once
+
+
+class WindowedPager:
+    """Cursor-paginated list of ids with a bounded window of materialized pages.
+
+    `fetch_page(cursor)` returns (ids, next_cursor), with next_cursor None on the
+    last page, or None when the request failed. The ids of every page loaded so
+    far are kept so the window can move back without refetching the listing, but
+    only the pages in [window_start, window_end) are meant to be on screen.
+    """
+
+    def __init__(self, fetch_page, max_pages=DEFAULT_MAX_PAGES):
+        self.fetch_page = fetch_page
+        self.max_pages = max_pages
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.pages = []
+        self.next_cursor = None
+        self.exhausted = False
+        self.window_start = 0
+        self.window_end = 0
+
+    @property
+    def has_more_after(self):
+        return self.window_end < len(self.pages) or not self.exhausted
+
+    @property
+    def has_more_before(self):
+        return self.window_start > 0
+
+    def load_first(self):
+        """Start over from the first page. Returns False if it could not be fetched."""
+        with self._lock:
+            self._reset()
+            return self._advance()
+
+    def advance(self):
+        """Move the window one page forward, fetching the page if it was never loaded."""
+        with self._lock:
+            return self._advance()
+
+    def retreat(self):
+        """Move the window one page back (those ids are already known)."""
+        with self._lock:
+            if self.window_start == 0:
+                return False
+            self.window_start -= 1
+            if self.window_end - self.window_start > self.max_pages:
+                self.window_end -= 1
+            return True
+
+    def window_ids(self):
+        """Ids of the materialized pages, in order."""
+        with self._lock:
+            return [recipe_id for page in self.pages[self.window_start:self.window_end] for recipe_id in page]
+
+    def remove(self, item_id):
+        """Forget an id that was deleted."""
+        with self._lock:
+            for page in self.pages:
+                if item_id in page:
+                    page.remove(item_id)
+                    return
+
+    def append(self, item_id):
+        """Add a new id at the end of the list. True if it landed in the window (the last page is on screen)."""
+        with self._lock:
+            if not self.exhausted or not self.pages:
+                return False  # It will come with the last page when that is fetched
+            self.pages[-1].append(item_id)
+            return self.window_end == len(self.pages)
+
+    def replace(self, old_id, new_id):
+        """An id changed (a recipe created offline got its server id)."""
+        with self._lock:
+            for page in self.pages:
+                if old_id in page:
+                    page[page.index(old_id)] = new_id
+                    return
+
+    def _advance(self):
+        if self.window_end == len(self.pages):
+            if self.exhausted:
+                return False
+            result = self.fetch_page(self.next_cursor)
+            if result is None:
+                return False
+            ids, self.next_cursor = result
+            self.exhausted = self.next_cursor is None
+            self.pages.append(list(ids))
+
+        self.window_end += 1
+        if self.window_end - self.window_start > self.max_pages:
+            self.window_start += 1
+        return True
@@ -0,0 +1,75 @@
+import sys
+
+
+def split_items(text):
+    """Split a comma-separated ingredients or steps field into its trimmed, non-empty items."""
+    return [item.strip() for item in text.split(",") if item.strip()]
+
+
+class Recipe:
+    """A recipe as the client keeps it: parsed once when it arrives, shared by every page.
+
+    Ingredients and steps are split into tuples here, so no page splits them
+    again, and ingredient names are interned: "salt" in ten thousand recipes is
+    one string. Recipes are treated as immutable; a local edit builds a new one
+    with replace(). to_record() gives back the server's record (Portuguese
+    keys) for the local store and the sync queue.
+    """
+
+    __slots__ = ("id", "title", "ingredient_list", "step_list", "image", "etag")
+
+    def __init__(self, id, title, ingredient_list, step_list, image="", etag=None):
+        self.id = id
+        self.title = title
+        self.ingredient_list = ingredient_list
+        self.step_list = step_list
+        self.image = image  # Path on the server ("" if the recipe has no picture)
+        self.etag = etag  # None for a local copy the server has not versioned yet
+
+    @classmethod
+    def from_record(cls, record):
+        """Build a Recipe from a server record ({"id", "titulo", "ingredientes", "passos", ...})."""
+        return cls(
+            record["id"],
+            record.get("titulo") or "Untitled",
+            tuple(sys.intern(item) for item in split_items(record.get("ingredientes", ""))),
+            tuple(split_items(record.get("passos", ""))),
+            record.get("image") or "",
+            record.get("etag"),
+        )
+
+    def to_record(self):
+        return {
+            "id": self.id,
+            "titulo": self.title,
+            "ingredientes": self.ingredients,
+            "passos": self.steps,
+            "image": self.image,
+            "etag": self.etag,
+        }
+
+    @property
+    def ingredients(self):
+        """Ingredients as one comma-separated text, as typed in the recipe dialogs."""
+        return ", ".join(self.ingredient_list)
+
+    @property
+    def steps(self):
+        return ", ".join(self.step_list)
+
+    def replace(self, **fields):
+        """Copy with some fields changed (a new id after sync, a local edit)."""
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(fields)
+        return Recipe(**values)
+
+    def __eq__(self, other):
+        if not isinstance(other, Recipe):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return f"Recipe(id={self.id!r}, title={self.title!r})"
@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 2000  # Recipes kept in memory before the least recently used are evicted
+DEFAULT_TTL = 60  # Seconds a cached recipe is trusted before it is revalidated with the server
+
+
+class RecipeCache:
+    """Bounded in-memory cache of Recipe objects keyed by recipe id.
+
+    Entries older than the TTL are not dropped: they are returned as "stale" so the
+    caller can revalidate them with their ETag and only download what changed.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # id -> (recipe, fetched_at)
+        self._lock = threading.Lock()
+
+        # Counters used to size the cache
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.revalidated = 0
+        self.evictions = 0
+
+    def lookup(self, recipe_ids):
+        """Split ids into (fresh recipes, stale recipes, missing ids)."""
+        fresh, stale, missing = {}, {}, []
+        now = time.monotonic()
+        with self._lock:
+            for recipe_id in recipe_ids:
+                entry = self._entries.get(recipe_id)
+                if entry is None:
+                    self.misses += 1
+                    missing.append(recipe_id)
+                    continue
+
+                self._entries.move_to_end(recipe_id)
+                recipe, fetched_at = entry
+                if now - fetched_at <= self.ttl:
+                    self.hits += 1
+                    fresh[recipe_id] = recipe
+                else:
+                    self.stale_hits += 1
+                    stale[recipe_id] = recipe
+        return fresh, stale, missing
+
+    def peek(self, recipe_id):
+        """Return a cached recipe regardless of age, without touching the counters."""
+        with self._lock:
+            entry = self._entries.get(recipe_id)
+            return entry[0] if entry else None
+
+    def put(self, recipe):
+        """Store (or replace) a recipe fetched from the server."""
+        with self._lock:
+            self._store(recipe)
+
+    def mark_fresh(self, recipe):
+        """The server confirmed this copy is still current.
+
+        It may not be cached yet (a copy read from the local store after a
+        restart); it is stored either way, so the next lookup is a fresh hit.
+        """
+        with self._lock:
+            self._store(recipe)
+            self.revalidated += 1
+
+    def _store(self, recipe):
+        # Call with the lock held
+        self._entries[recipe.id] = (recipe, time.monotonic())
+        self._entries.move_to_end(recipe.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, recipe_id):
+        with self._lock:
+            self._entries.pop(recipe_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "evictions": self.evictions,
+                "hit_ratio": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            }
+
+
+# Shared by every page
+recipe_cache = RecipeCache()
@@ -0,0 +1,304 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import requests
+from services.api_client import api
+from services.local_store import local_store
+from services.recipe import Recipe
+from services.recipe_cache import recipe_cache
+
+BATCH_SIZE = 200  # Ids per /get_recipes call (the server accepts up to 500)
+MAX_CONCURRENT_FETCHES = 8  # Parallel /get_recipe calls when the batch endpoint is missing
+PAGE_SIZE = 48  # Ids per page of a paginated collection
+SEARCH_PAGE_SIZE = 30  # Recipes per page of search results
+IN_FLIGHT_WAIT = 60  # Seconds to wait for a download another caller already started
+
+# None until the first batch call tells us whether the server has /get_recipes
+_batch_supported = None
+
+# Last known ids of each collection, so a revisited page can render before the server answers
+_collections = {}  # (username, saved) -> [recipe ids]
+
+# Recipes being downloaded right now, so two views asking at once share one download
+_in_flight = {}  # recipe id -> Future of its Recipe (None if it could not be fetched)
+_in_flight_lock = threading.Lock()
+
+
+def list_recipe_ids(username, saved=False):
+    """Return the ids of the user's own (or saved) recipes, or None if the request failed."""
+    endpoint, key = ("/list_saved_recipes", "saved_recipes") if saved else ("/list_recipes", "recipes")
+    response = api.post(endpoint, {"username": username})
+    if response.status_code != 200:
+        print(f"Failed to fetch recipes: {response.text}")
+        return None
+    recipe_ids = response.json().get(key, [])
+    _collections[(username, saved)] = recipe_ids
+    return recipe_ids
+
+
+def list_recipe_page(username, saved=False, cursor=None, limit=PAGE_SIZE):
+    """Return (ids, next_cursor) for one page of the user's own (or saved) recipes.
+
+    next_cursor is None on the last page. Returns None if the request failed.
+    Servers without pagination answer with the whole list; it is then paged
+    locally, and the cursor is the offset into that list.
+
+    Pages are kept in the local store, which answers instead when the server
+    can't be reached. Changes still queued in the outbox are applied on top.
+    """
+    key = (username, saved)
+    if isinstance(cursor, LocalCursor):
+        recipe_ids = _collections.get(key, [])
+        return _local_page(recipe_ids, cursor.offset, limit)
+
+    endpoint, field = ("/list_saved_recipes", "saved_recipes") if saved else ("/list_recipes", "recipes")
+    payload = {"username": username, "limit": limit}
+    if cursor is not None:
+        payload["cursor"] = cursor
+    try:
+        response = api.post(endpoint, payload)
+    except requests.RequestException as e:
+        print(f"Server unreachable, using the offline copy: {e}")
+        response = None
+    if response is None or response.status_code >= 500:
+        return _with_local_changes(username, saved, local_store.page(username, saved, cursor))
+    if response.status_code != 200:
+        print(f"Failed to fetch recipes: {response.text}")
+        return None
+
+    data = response.json()
+    recipe_ids = data.get(field, [])
+    if "next_cursor" not in data:  # Older server: it ignored the limit and sent everything
+        _collections[key] = recipe_ids
+        return _local_page(recipe_ids, 0, limit)
+
+    local_store.put_page(username, saved, cursor, recipe_ids, data["next_cursor"])
+    recipe_ids, next_cursor = _with_local_changes(username, saved, (recipe_ids, data["next_cursor"]))
+    if cursor is None:
+        _collections[key] = recipe_ids  # Only the first page is kept for instant re-renders
+    return recipe_ids, next_cursor
+
+
+def _with_local_changes(username, saved, page):
+    """Hide recipes whose delete is still queued and append queued new ones to the last page of own recipes."""
+    if page is None:
+        return None
+    recipe_ids, next_cursor = page
+    changes = local_store.outbox(username)
+    deleted = {change["recipe_id"] for change in changes if change["op"] == "delete_recipe"}
+    recipe_ids = [recipe_id for recipe_id in recipe_ids if recipe_id not in deleted]
+    if next_cursor is None and not saved:
+        recipe_ids += [change["recipe_id"] for change in changes if change["op"] == "add_recipe"]
+    return recipe_ids, next_cursor
+
+
+class LocalCursor:
+    """Cursor into a collection that was downloaded in full."""
+
+    def __init__(self, offset):
+        self.offset = offset
+
+
+def _local_page(recipe_ids, offset, limit):
+    end = offset + limit
+    return recipe_ids[offset:end], (LocalCursor(end) if end < len(recipe_ids) else None)
+
+
+def cached_recipes(username, saved=False):
+    """Recipes from the last time the collection was loaded, without any request (None if never loaded).
+
+    After a restart they come from the local store, so even the first visit renders from disk.
+    """
+    recipe_ids = _collections.get((username, saved))
+    if recipe_ids is None:
+        page = _with_local_changes(username, saved, local_store.page(username, saved, None))
+        if page is None:
+            return None
+        recipe_ids = page[0]
+    recipe_ids = recipe_ids[:PAGE_SIZE]
+    recipes = {recipe_id: recipe_cache.peek(recipe_id) for recipe_id in recipe_ids}
+    recipes.update(_stored(recipe_id for recipe_id, recipe in recipes.items() if recipe is None))
+    return [recipes[recipe_id] for recipe_id in recipe_ids if recipes.get(recipe_id) is not None]
+
+
+def get_recipes(recipe_ids):
+    """Fetch many recipes with as few round trips as possible.
+
+    Fresh cache entries cost nothing, stale ones are revalidated by ETag and only
+    missing or changed recipes are downloaded. Returns Recipe objects in the
+    order of recipe_ids, skipping ids the server could not return.
+
+    Copies in the local store count as stale entries, and are used as they are
+    when the server is unreachable. Recipes with queued changes are always
+    read from the local store. A recipe that another call is already
+    downloading (the same recipe owned and saved, say) is not requested
+    again: this call waits for that download and returns the same Recipe.
+    """
+    recipe_ids = list(recipe_ids)
+    changed = local_store.pending_recipe_ids()
+    local_only = [recipe_id for recipe_id in recipe_ids if recipe_id in changed or recipe_id < 0]
+    recipes, stale, missing = recipe_cache.lookup([i for i in recipe_ids if i not in local_only])
+    stored = _stored(local_only + missing)
+    recipes.update((recipe_id, stored[recipe_id]) for recipe_id in local_only if recipe_id in stored)
+    stale.update((recipe_id, stored[recipe_id]) for recipe_id in missing if recipe_id in stored)
+    missing = [recipe_id for recipe_id in missing if recipe_id not in stored]
+    to_fetch = list(dict.fromkeys(list(stale) + missing))
+
+    if to_fetch:
+        mine, theirs = _claim(to_fetch)
+        fetched = {}
+        try:
+            if mine:
+                fetched = _download(mine, stale)
+        finally:
+            _release(mine, fetched)
+        recipes.update(fetched)
+        for recipe_id, future in theirs.items():
+            try:
+                recipe = future.result(timeout=IN_FLIGHT_WAIT)
+            except FutureTimeout:
+                recipe = stale.get(recipe_id)
+            if recipe is not None:
+                recipes[recipe_id] = recipe
+
+    return [recipes[recipe_id] for recipe_id in recipe_ids if recipe_id in recipes]
+
+
+def _download(recipe_ids, stale):
+    """Fetch or revalidate recipes; the stale copies are used as they are if the server is unreachable."""
+    global _batch_supported
+
+    fetched = None
+    try:
+        if _batch_supported is not False:
+            fetched = _get_recipes_batched(recipe_ids, stale)
+            _batch_supported = fetched is not None
+        if fetched is None:
+            fetched = _get_recipes_concurrently(recipe_ids)
+            for recipe in fetched.values():
+                recipe_cache.put(recipe)
+    except requests.RequestException as e:
+        print(f"Server unreachable, using the offline copy: {e}")
+        fetched = {recipe_id: stale[recipe_id] for recipe_id in recipe_ids if recipe_id in stale}
+    local_store.put_records([recipe.to_record() for recipe in fetched.values()])
+    return fetched
+
+
+def _claim(recipe_ids):
+    """Split ids into the ones this call downloads and {id: Future} of downloads already under way."""
+    mine, theirs = [], {}
+    with _in_flight_lock:
+        for recipe_id in recipe_ids:
+            if recipe_id in _in_flight:
+                theirs[recipe_id] = _in_flight[recipe_id]
+            else:
+                _in_flight[recipe_id] = Future()
+                mine.append(recipe_id)
+    return mine, theirs
+
+
+def _release(recipe_ids, fetched):
+    """Hand the result of a download to the callers waiting for it."""
+    with _in_flight_lock:
+        futures = [_in_flight.pop(recipe_id) for recipe_id in recipe_ids]
+    for recipe_id, future in zip(recipe_ids, futures):
+        future.set_result(fetched.get(recipe_id))
+
+
+def _get_recipes_batched(recipe_ids, stale):
+    """Fetch recipes through /get_recipes, revalidating stale cache entries by ETag.
+
+    Returns None if the server has no batch endpoint.
+    """
+    recipes = {}
+    for start in range(0, len(recipe_ids), BATCH_SIZE):
+        chunk = recipe_ids[start:start + BATCH_SIZE]
+        etags = {
+            str(recipe_id): stale[recipe_id].etag
+            for recipe_id in chunk
+            if recipe_id in stale and stale[recipe_id].etag
+        }
+        response = api.post("/get_recipes", {"ids": chunk, "etags": etags})
+
+        if response.status_code in (404, 405):  # Older server without the batch route
+            return None
+        if response.status_code != 200:
+            print(f"Failed to fetch recipes in batch: {response.text}")
+            continue
+
+        data = response.json()
+        for record in data.get("recipes", []):
+            recipe = Recipe.from_record(record)  # Parsed once here, never again by the pages
+            recipe_cache.put(recipe)
+            recipes[recipe.id] = recipe
+        for recipe_id in data.get("unchanged", []):
+            recipe_cache.mark_fresh(stale[recipe_id])  # Also caches copies that came from the local store
+            recipes[recipe_id] = stale[recipe_id]
+        for recipe_id in chunk:
+            if recipe_id not in recipes:
+                recipe_cache.invalidate(recipe_id)  # Deleted on the server
+                local_store.remove_from_pages(recipe_id)
+    return recipes
+
+
+def _get_recipes_concurrently(recipe_ids):
+    """Fallback: one /get_recipe per id, with a bounded number of requests in flight."""
+    def fetch_one(recipe_id):
+        try:
+            response = api.post("/get_recipe", {"id": recipe_id})
+        except Exception as e:
+            print(f"Error fetching recipe {recipe_id}: {e}")
+            return recipe_id, None
+        if response.status_code != 200:
+            return recipe_id, None
+        return recipe_id, Recipe.from_record(dict(response.json(), id=recipe_id))
+
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_FETCHES) as executor:
+        results = executor.map(fetch_one, recipe_ids)
+        return {recipe_id: recipe for recipe_id, recipe in results if recipe is not None}
+
+
+def search_recipes(query, cursor=None, limit=SEARCH_PAGE_SIZE):
+    """Return (recipes, next_cursor) for recipes whose title, ingredients or steps match query.
+
+    Best matches come first; next_cursor is None on the last page. Returns None
+    if the request failed.
+    """
+    payload = {"search": query, "limit": limit}
+    if cursor is not None:
+        payload["cursor"] = cursor
+    response = api.post("/search_recipes", payload)
+    if response.status_code != 200:
+        print(f"Recipe search failed: {response.text}")
+        return None
+
+    data = response.json()
+    return get_recipes(data.get("recipe_ids", [])), data.get("next_cursor")
+
+
+def cook_with(ingredients, cursor=None, limit=SEARCH_PAGE_SIZE):
+    """Return (results, next_cursor) for recipes using the given comma-separated ingredients.
+
+    results is a list of (recipe, matched, total): the Recipe, how many of
+    the ingredients it uses and how many it needs in all. Recipes using more of
+    them come first. Returns None if the request failed.
+    """
+    payload = {"ingredients": ingredients, "limit": limit}
+    if cursor is not None:
+        payload["cursor"] = cursor
+    response = api.post("/cook_with", payload)
+    if response.status_code != 200:
+        print(f"Ingredient search failed: {response.text}")
+        return None
+
+    data = response.json()
+    hits = data.get("results", [])
+    recipes = {recipe.id: recipe for recipe in get_recipes([hit["id"] for hit in hits])}
+    results = [(recipes[hit["id"]], hit["matched"], hit["total"]) for hit in hits if hit["id"] in recipes]
+    return results, data.get("next_cursor")
+
+
+def _stored(recipe_ids):
+    """{id: Recipe} for the ids kept in the local store."""
+    return {recipe_id: Recipe.from_record(record) for recipe_id, record in local_store.records(recipe_ids).items()}
@@ -0,0 +1,57 @@
+from collections import Counter
+
+
+def ingredient_key(name):
+    """Key that groups the same ingredient written in different case or spacing."""
+    return " ".join(name.lower().split())
+
+
+class ShoppingList:
+    """Ingredients of the planned meals, aggregated across the week.
+
+    Each meal adds its recipe's ingredients and removing it subtracts exactly
+    what it added, so a change costs one recipe's ingredients and never a pass
+    over the whole week. add() and remove() return the keys whose count
+    changed, so the page only redraws those rows.
+    """
+
+    def __init__(self):
+        self._counts = Counter()  # ingredient key -> number of planned meals that need it
+        self._names = {}  # ingredient key -> name as first written
+        self._meals = {}  # meal key -> ingredient keys it added
+
+    def add(self, meal_key, ingredients):
+        """Add the ingredient names of a planned meal. Returns the changed ingredient keys."""
+        if meal_key in self._meals:
+            return []
+        keys = []
+        for name in ingredients:
+            key = ingredient_key(name)
+            if key in keys:  # Written twice in the same recipe: still one meal needing it
+                continue
+            keys.append(key)
+            self._names.setdefault(key, name)
+            self._counts[key] += 1
+        self._meals[meal_key] = keys
+        return keys
+
+    def remove(self, meal_key):
+        """Subtract a meal's ingredients. Returns the changed ingredient keys."""
+        keys = self._meals.pop(meal_key, [])
+        for key in keys:
+            self._counts[key] -= 1
+            if self._counts[key] <= 0:
+                del self._counts[key]
+                del self._names[key]
+        return keys
+
+    def count(self, key):
+        """Planned meals that need this ingredient (0 if it is no longer on the list)."""
+        return self._counts.get(key, 0)
+
+    def name(self, key):
+        return self._names.get(key)
+
+    def items(self):
+        """(key, name, count) for every ingredient, alphabetically."""
+        return [(key, self._names[key], self._counts[key]) for key in sorted(self._counts)]
@@ -0,0 +1,362 @@
+import random
+import threading
+
+import requests
+from services.api_client import api
+from services.background import run_on_ui
+from services.health import UP, health
+from services.local_store import local_store
+from services.recipe import Recipe
+from services.recipe_cache import recipe_cache
+from services.uploader import UploadError, UploadRejected, upload_image
+
+RETRY_DELAY = 2.0  # Seconds before retrying an unreachable server, doubled after every failure
+MAX_RETRY_DELAY = 120.0
+
+
+class Offline(Exception):
+    """The server could not be reached; the change stays queued."""
+
+
+class SyncQueue:
+    """Write-behind queue for the user's recipe and follow changes.
+
+    Every change is written to the outbox in local.db and applied locally at
+    once, so the UI never waits for the server and nothing is lost if the app
+    closes or the server is unreachable. One background writer sends the
+    changes in order; changes not sent yet are folded together (two edits of
+    a recipe become one request, a follow and an unfollow cancel out).
+
+    Edits and deletes remember the ETag of the version they were made on; if
+    the server copy changed meanwhile, the change is parked as a conflict for
+    the user to keep or discard instead of silently overwriting the other edit.
+
+    Listeners get (event, change) on the UI thread, event being "synced",
+    "conflict" or "failed" (the server refused it: undo it on screen), or
+    "offline" with change None when the server stops answering.
+    """
+
+    def __init__(self, username, store=local_store):
+        self.username = username
+        self.store = store
+        self._listeners = []
+        self._lock = threading.Lock()  # Folding a change into a queued one vs. the writer picking it up
+        self._in_flight = None  # seq of the change being sent; never modified meanwhile
+        self._offline = False
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self.store.prune()
+            self._thread = threading.Thread(target=self._run, name="lethimcook-sync", daemon=True)
+            self._thread.start()
+            health.subscribe(self._on_health)
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        health.unsubscribe(self._on_health)
+
+    @property
+    def stopped(self):
+        return self._stop.is_set()
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def conflicts(self):
+        return self.store.outbox(self.username, status="conflict")
+
+    def pending_follows(self):
+        """{username: followed} for follows and unfollows not sent yet, the latest one winning."""
+        return {
+            change["payload"]["followed_username"]: change["op"] == "follow"
+            for change in self.store.outbox(self.username)
+            if change["op"] in ("follow", "unfollow")
+        }
+
+    # Queueing changes (each is applied to the local copy right away)
+
+    def add_recipe(self, titulo, ingredientes, passos, image=None):
+        """Queue a new recipe. Returns its local Recipe, with a temporary negative id."""
+        record = {"titulo": titulo, "ingredientes": ingredientes, "passos": passos, "image": "", "etag": None}
+        payload = {"username": self.username, "titulo": titulo, "ingredientes": ingredientes, "passos": passos}
+        with self._lock:  # Its queued add and upload refer to the id it was just given
+            recipe = Recipe.from_record(self.store.put_new_record(record))
+            recipe_cache.put(recipe)
+            self._enqueue("add_recipe", payload, recipe.id)
+            if image:
+                self._queue_upload(image, recipe.id)
+        return recipe
+
+    def edit_recipe(self, recipe_id, titulo, ingredientes, passos, image=None):
+        """Queue an edit. Returns the edited local Recipe."""
+        current = self._local_record(recipe_id)
+        recipe = self._save_locally(
+            dict(current, id=recipe_id, titulo=titulo, ingredientes=ingredientes, passos=passos, etag=None)
+        )
+
+        fields = {"titulo": titulo, "ingredientes": ingredientes, "passos": passos}
+        with self._lock:
+            queued = self._queued(recipe_id, "add_recipe") or self._queued(recipe_id, "edit_recipe")
+            if queued is not None:  # Not sent yet: send the final version instead
+                self.store.set_status(queued["seq"], "pending", payload=dict(queued["payload"], **fields))
+            else:
+                self._enqueue("edit_recipe", dict(fields, id=recipe_id, base_etag=current.get("etag")), recipe_id)
+            if image:
+                self._queue_upload(image, recipe_id)
+        return recipe
+
+    def delete_recipe(self, recipe_id):
+        """Queue a delete; the recipe disappears from the local lists at once."""
+        recipe_cache.invalidate(recipe_id)
+        with self._lock:
+            if self._queued(recipe_id, "add_recipe") is not None:  # Never sent: forget it altogether
+                for change in self._queued_all(recipe_id):
+                    self.store.remove(change["seq"])
+                self.store.remove_from_pages(recipe_id)
+                return
+
+            base_etag = self._local_record(recipe_id).get("etag")
+            for change in self._queued_all(recipe_id):  # Unsent edits and uploads are moot now
+                if change["op"] == "edit_recipe" and base_etag is None:
+                    base_etag = change["payload"]["base_etag"]  # The version the first of them was made on
+                self.store.remove(change["seq"])
+            self._enqueue("delete_recipe", {"recipe_id": recipe_id, "username": self.username, "base_etag": base_etag}, recipe_id)
+
+    def follow(self, username):
+        self._queue_follow(username, True)
+
+    def unfollow(self, username):
+        self._queue_follow(username, False)
+
+    # Conflicts
+
+    def keep_mine(self, change):
+        """Send a conflicting change anyway, overwriting the server copy."""
+        payload = dict(change["payload"], base_etag=None)
+        if change["op"] == "edit_recipe":
+            self._save_locally(dict(
+                self._local_record(change["recipe_id"]), id=change["recipe_id"], etag=None,
+                titulo=payload["titulo"], ingredientes=payload["ingredientes"], passos=payload["passos"],
+            ))
+        self.store.set_status(change["seq"], "pending", payload=payload)
+        self._wake.set()
+
+    def discard(self, change):
+        """Drop a conflicting change; the server copy stays."""
+        self.store.remove(change["seq"])
+
+    # Replay
+
+    def flush(self):
+        """Send every pending change in order. Raises Offline when the server is unreachable."""
+        while not self._stop.is_set():
+            with self._lock:
+                pending = self.store.outbox(self.username)
+                change = pending[0] if pending else None
+                self._in_flight = change["seq"] if change else None
+            if change is None:
+                return
+            try:
+                event = self._replay(change)
+            except requests.RequestException as ex:
+                raise Offline(str(ex))
+            finally:
+                with self._lock:
+                    self._in_flight = None
+            if event:
+                self._notify(event, change)
+
+    def _run(self):
+        delay = RETRY_DELAY
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                self.flush()
+                self._offline = False
+                delay, timeout = RETRY_DELAY, None  # Nothing left: sleep until the next change
+            except Offline as ex:
+                print(f"Server unreachable, {len(self.store.outbox(self.username))} change(s) kept for later: {ex}")
+                if not self._offline:
+                    self._offline = True
+                    self._notify("offline", None)
+                timeout = random.uniform(delay / 2, delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+            self._wake.wait(timeout)
+
+    def _on_health(self, state):
+        # The server is back: send now instead of waiting out the retry delay
+        if state == UP:
+            self._wake.set()
+
+    def _replay(self, change):
+        op, payload, seq = change["op"], change["payload"], change["seq"]
+        recipe_id = change["recipe_id"]
+
+        if op in ("edit_recipe", "delete_recipe") and payload.get("base_etag"):
+            server_record = self._server_version(recipe_id, payload["base_etag"])
+            if server_record is False:  # Deleted on the server
+                self.store.remove(seq)
+                self.store.remove_from_pages(recipe_id)
+                recipe_cache.invalidate(recipe_id)
+                if op == "delete_recipe":
+                    return "synced"
+                change["error"] = "The recipe was deleted on the server."
+                return "failed"
+            if server_record is not None:  # Changed on the server since this edit was made
+                error = "The recipe was changed on the server after you opened it."
+                self.store.set_status(seq, "conflict", error)
+                self._save_locally(server_record)
+                change["error"] = error
+                return "conflict"
+
+        if op == "add_recipe":
+            response = self._send("/add_recipe", payload, seq, change)
+            if response is None:
+                return "failed"
+            new_id = response.json().get("id")
+            self.store.remove(seq)
+            recipe_cache.invalidate(recipe_id)
+            if new_id is not None:
+                with self._lock:  # Queued edits of the new recipe are moved to its id
+                    self.store.replace_id(recipe_id, new_id)
+                change["temp_id"], change["recipe_id"] = recipe_id, new_id
+        elif op == "edit_recipe":
+            fields = {key: payload[key] for key in ("id", "titulo", "ingredientes", "passos")}
+            if self._send("/edit_recipe", fields, seq, change) is None:
+                return "failed"
+            self.store.remove(seq)
+            recipe_cache.invalidate(recipe_id)  # The server has a new ETag for it
+        elif op == "delete_recipe":
+            fields = {"recipe_id": recipe_id, "username": payload["username"]}
+            if self._send("/delete_recipe", fields, seq, change, gone_ok=True) is None:
+                return "failed"
+            self.store.remove(seq)
+            self.store.remove_from_pages(recipe_id)
+        elif op == "upload_image":
+            return self._replay_upload(change)
+        elif op == "follow":
+            # An earlier attempt may have arrived before the connection dropped; following twice is an error
+            if api.post("/check_follow", payload).status_code != 200:
+                if self._send("/follow", payload, seq, change) is None:
+                    return "failed"
+            self.store.remove(seq)
+        elif op == "unfollow":
+            if self._send("/unfollow", payload, seq, change) is None:
+                return "failed"
+            self.store.remove(seq)
+        return "synced"
+
+    def _replay_upload(self, change):
+        try:
+            upload_image(change["payload"]["path"], "r", id=change["recipe_id"])
+        except (UploadRejected, OSError) as ex:  # Refused, or the file is gone
+            self.store.remove(change["seq"])
+            change["error"] = f"the image could not be uploaded: {ex}"
+            return "failed"
+        except UploadError as ex:  # Resumes from the last chunk on the next attempt
+            raise Offline(str(ex))
+        self.store.remove(change["seq"])
+        recipe_cache.invalidate(change["recipe_id"])
+        return "synced"
+
+    def _send(self, endpoint, payload, seq, change, gone_ok=False):
+        """POST a queued change. Returns the response, or None if the server refused it (dropped)."""
+        response = api.post(endpoint, payload)
+        if response.status_code >= 500:
+            raise Offline(f"{endpoint} answered {response.status_code}")
+        if response.status_code in (200, 201) or (gone_ok and response.status_code == 404):
+            return response
+        self.store.remove(seq)
+        if change["recipe_id"] is not None:
+            recipe_cache.invalidate(change["recipe_id"])  # The next read shows the server copy again
+        change["error"] = response.text
+        return None
+
+    def _server_version(self, recipe_id, etag):
+        """None if the server copy still has this ETag, the new record if it changed, False if it is gone."""
+        response = api.post("/get_recipes", {"ids": [recipe_id], "etags": {str(recipe_id): etag}})
+        if response.status_code in (404, 405):  # Older server without /get_recipes: no way to tell
+            return None
+        if response.status_code != 200:
+            raise Offline(f"/get_recipes answered {response.status_code}")
+        data = response.json()
+        if recipe_id in data.get("unchanged", []):
+            return None
+        for record in data.get("recipes", []):
+            if record["id"] == recipe_id:
+                return None if record.get("etag") == etag else record
+        return False
+
+    # Helpers (call the _queued ones and _queue_* with self._lock held)
+
+    def _enqueue(self, op, payload, recipe_id):
+        self.store.enqueue(self.username, op, payload, recipe_id)
+        self._wake.set()
+
+    def _queued_all(self, recipe_id):
+        """Pending changes of a recipe that the writer has not picked up."""
+        return [
+            change for change in self.store.outbox(self.username)
+            if change["recipe_id"] == recipe_id and change["seq"] != self._in_flight
+        ]
+
+    def _queued(self, recipe_id, op):
+        for change in self._queued_all(recipe_id):
+            if change["op"] == op:
+                return change
+        return None
+
+    def _queue_upload(self, image, recipe_id):
+        queued = self._queued(recipe_id, "upload_image")
+        if queued is not None:  # Only the last picture picked matters
+            self.store.set_status(queued["seq"], "pending", payload=dict(queued["payload"], path=image))
+        else:
+            self._enqueue("upload_image", {"id": recipe_id, "path": image}, recipe_id)
+
+    def _queue_follow(self, followed_username, follow):
+        with self._lock:
+            for change in self.store.outbox(self.username):
+                if (change["op"] == ("unfollow" if follow else "follow")
+                        and change["payload"]["followed_username"] == followed_username
+                        and change["seq"] != self._in_flight):
+                    self.store.remove(change["seq"])  # Never sent: the two cancel out
+                    return
+            payload = {"follower_username": self.username, "followed_username": followed_username}
+            self._enqueue("follow" if follow else "unfollow", payload, None)
+
+    def _local_record(self, recipe_id):
+        """Server record of the local copy ({} if there is none)."""
+        recipe = recipe_cache.peek(recipe_id)
+        if recipe is not None:
+            return recipe.to_record()
+        return self.store.records([recipe_id]).get(recipe_id, {})
+
+    def _save_locally(self, record):
+        """Store a record in the local store and the cache. Returns it as a Recipe."""
+        self.store.put_records([record], force=True)
+        recipe = Recipe.from_record(record)
+        recipe_cache.put(recipe)
+        return recipe
+
+    def _notify(self, event, change):
+        for listener in list(self._listeners):
+            run_on_ui(listener, event, change)
+
+
+_current = None
+
+
+def sync_queue(username):
+    """The SyncQueue of the logged-in user, shared by every page."""
+    global _current
+    if _current is None or _current.username != username or _current.stopped:
+        _current = SyncQueue(username)
+    return _current
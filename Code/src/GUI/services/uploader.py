@@ -0,0 +1,135 @@
+import json
+import os
+import threading
+import time
+
+import requests
+from services.api_client import api
+
+CHUNK_SIZE = 256 * 1024  # Bytes per /upload_chunk; only one chunk is in memory at a time
+MAX_CHUNK_ATTEMPTS = 5  # Tries per chunk before giving up (the upload can still be resumed later)
+RETRY_DELAY = 1.0  # Seconds before the first retry, doubled on each failure
+
+# Unfinished uploads survive restarts here, so the same file picks up where it stopped
+STATE_FILE = os.path.join(os.path.expanduser("~"), ".lethimcook", "uploads.json")
+
+_state_lock = threading.Lock()
+
+
+class UploadError(Exception):
+    """The upload could not be completed; what was sent is kept for the next attempt."""
+
+
+class UploadRejected(UploadError):
+    """The server refused the upload; trying again won't help."""
+
+
+def upload_image(file_path, op, on_progress=None, **target):
+    """Upload an image in chunks and attach it to a recipe or profile.
+
+    op is "r" (recipe, pass id=...), "p" (profile picture) or "b" (banner),
+    both with username=..., as in /upload_image. on_progress(sent, total) is
+    called after every chunk. Raises UploadError on failure (UploadRejected if
+    the server refused it).
+    """
+    total = os.path.getsize(file_path)
+    key = _upload_key(file_path)
+
+    upload_id, offset = _resume(key)
+    if upload_id is None:
+        response = api.post("/upload_init", {"size": total})
+        if response.status_code != 200:
+            raise _failure(response, "Could not start the upload")
+        upload_id, offset = response.json()["upload_id"], 0
+        _save_state(key, upload_id)
+
+    if on_progress:
+        on_progress(offset, total)
+
+    with open(file_path, "rb") as f:
+        while offset < total:
+            f.seek(offset)
+            chunk = f.read(CHUNK_SIZE)
+            offset = _send_chunk(upload_id, offset, chunk)
+            if on_progress:
+                on_progress(offset, total)
+
+    response = api.post("/upload_finish", dict(target, upload_id=upload_id, op=op))
+    if response.status_code != 200:
+        raise _failure(response, "Could not attach the image")
+    _save_state(key, None)
+
+
+def _send_chunk(upload_id, offset, chunk):
+    """Send one chunk and return the server's new offset, retrying with backoff on network errors."""
+    delay = RETRY_DELAY
+    for attempt in range(MAX_CHUNK_ATTEMPTS):
+        try:
+            response = api.request(
+                "POST", "/upload_chunk",
+                retry=False,  # Retried here, so the offset can be re-checked in between
+                params={"upload_id": upload_id, "offset": offset},
+                data=chunk,
+                headers={"Content-Type": "application/octet-stream"},
+            )
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            response = None
+
+        if response is not None:
+            if response.status_code in (200, 409):
+                # 409: the server has a different offset (e.g. our last chunk did arrive); continue from there
+                return response.json()["offset"]
+            if response.status_code not in (500, 502, 503, 504):
+                raise UploadRejected(f"Upload rejected: {response.text}")
+
+        if attempt < MAX_CHUNK_ATTEMPTS - 1:
+            time.sleep(delay)
+            delay *= 2
+    raise UploadError("Connection lost while uploading; try again to resume.")
+
+
+def _failure(response, message):
+    error = UploadError if response.status_code >= 500 else UploadRejected
+    return error(f"{message}: {response.text}")
+
+
+def _resume(key):
+    """(upload_id, offset) of an unfinished upload of the same file, or (None, 0)."""
+    with _state_lock:
+        upload_id = _load_state().get(key)
+    if upload_id is None:
+        return None, 0
+    try:
+        response = api.post("/upload_status", {"upload_id": upload_id})
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+        raise UploadError("Server unreachable.")
+    if response.status_code != 200:  # Finished or cleaned up on the server: start over
+        _save_state(key, None)
+        return None, 0
+    return upload_id, response.json()["offset"]
+
+
+def _upload_key(file_path):
+    # A file edited since the interrupted upload must not be resumed
+    stat = os.stat(file_path)
+    return f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+
+
+def _load_state():
+    try:
+        with open(STATE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(key, upload_id):
+    with _state_lock:
+        state = _load_state()
+        if upload_id is None:
+            state.pop(key, None)
+        else:
+            state[key] = upload_id
+        os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+        with open(STATE_FILE, "w") as f:
+            json.dump(state, f)
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The client imports its modules as "services..." from Code/src/GUI; under test it keeps no offline copy on disk
+os.environ.setdefault("LETHIMCOOK_LOCAL_DB", ":memory:")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
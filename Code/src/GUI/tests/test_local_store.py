@@ -0,0 +1,113 @@
+import threading
+
+import pytest
+from services.local_store import LocalStore
+
+
+def record(recipe_id, titulo="Omelete", etag="v1"):
+    return {"id": recipe_id, "titulo": titulo, "ingredientes": "ovos, sal", "passos": "bater", "image": "", "etag": etag}
+
+
+@pytest.fixture
+def store():
+    return LocalStore(":memory:")
+
+
+def test_pages_are_kept_per_cursor(store):
+    store.put_page("cook", False, None, [1, 2], 2)
+    store.put_page("cook", False, 2, [3], None)
+
+    assert store.page("cook", False, None) == ([1, 2], 2)
+    assert store.page("cook", False, 2) == ([3], None)
+    assert store.page("cook", True, None) is None
+
+
+def test_only_records_of_mirrored_recipes_are_kept(store):
+    store.put_page("cook", False, None, [1], None)
+    store.put_records([record(1), record(2)])
+
+    assert set(store.records([1, 2])) == {1}
+
+    store.put_records([record(2)], force=True)  # A local change is kept regardless
+    assert set(store.records([1, 2])) == {1, 2}
+
+
+def test_remove_from_pages_forgets_the_recipe(store):
+    store.put_page("cook", False, None, [1, 2], None)
+    store.put_page("cook", True, None, [2], None)
+    store.put_records([record(1), record(2)])
+
+    store.remove_from_pages(2)
+
+    assert store.page("cook", False, None) == ([1], None)
+    assert store.page("cook", True, None) == ([], None)
+    assert store.records([2]) == {}
+
+
+def test_new_records_get_distinct_negative_ids(store):
+    store.put_records([record(7)], force=True)
+    first = store.put_new_record(record(None))
+    second = store.put_new_record(record(None))
+
+    assert first["id"] == -1
+    assert second["id"] == -2
+    assert store.records([-1, -2]) == {-1: first, -2: second}
+
+
+def test_concurrent_new_records_never_share_an_id(store):
+    barrier = threading.Barrier(8)
+    ids = []
+
+    def add(i):
+        barrier.wait()
+        ids.append(store.put_new_record(record(None, titulo=f"Receita {i}"))["id"])
+
+    threads = [threading.Thread(target=add, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(ids)) == 8
+    assert {stored["titulo"] for stored in store.records(ids).values()} == {f"Receita {i}" for i in range(8)}
+
+
+def test_outbox_is_kept_in_order_per_user(store):
+    first = store.enqueue("cook", "follow", {"followed_username": "ana"})
+    store.enqueue("other", "follow", {"followed_username": "ana"})
+    second = store.enqueue("cook", "edit_recipe", {"id": 1}, recipe_id=1)
+
+    assert [change["seq"] for change in store.outbox("cook")] == [first, second]
+
+    store.set_status(first, "conflict", "changed", payload={"followed_username": "rui"})
+    assert [change["seq"] for change in store.outbox("cook")] == [second]
+    conflict, = store.outbox("cook", status="conflict")
+    assert conflict["error"] == "changed"
+    assert conflict["payload"] == {"followed_username": "rui"}
+
+    store.remove(second)
+    assert store.outbox("cook") == []
+    assert store.pending_recipe_ids() == set()
+
+
+def test_replace_id_moves_the_record_and_queued_changes(store):
+    temp = store.put_new_record(record(None))
+    upload = store.enqueue("cook", "upload_image", {"id": temp["id"], "path": "bolo.png"}, recipe_id=temp["id"])
+
+    store.replace_id(temp["id"], 41)
+
+    assert store.records([temp["id"], 41]) == {41: dict(temp, id=41)}
+    change, = store.outbox("cook")
+    assert change["seq"] == upload
+    assert change["recipe_id"] == 41
+    assert change["payload"] == {"id": 41, "path": "bolo.png"}
+
+
+def test_prune_keeps_mirrored_and_queued_recipes(store):
+    store.put_page("cook", False, None, [1], None)
+    store.put_records([record(1), record(2), record(3)], force=True)
+    store.enqueue("cook", "edit_recipe", {"id": 2}, recipe_id=2)
+
+    store.prune()
+
+    assert set(store.records([1, 2, 3])) == {1, 2}
@@ -0,0 +1,205 @@
+import threading
+
+import pytest
+import requests
+from services import recipe_service, sync
+from services.local_store import LocalStore
+from services.recipe_cache import recipe_cache
+from services.sync import Offline, SyncQueue
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, data=None):
+        self.status_code = status_code
+        self._data = data or {}
+        self.text = str(self._data)
+
+    def json(self):
+        return self._data
+
+
+class FakeApi:
+    """Answers each endpoint with its handler (payload -> FakeResponse) and records every request."""
+
+    def __init__(self, **handlers):
+        self.handlers = handlers
+        self.requests = []
+
+    def post(self, endpoint, payload=None, **kwargs):
+        self.requests.append((endpoint, payload))
+        handler = self.handlers.get(endpoint.lstrip("/"))
+        if handler is None:
+            raise requests.ConnectionError(f"no handler for {endpoint}")
+        return handler(payload)
+
+    def endpoints(self):
+        return [endpoint for endpoint, _ in self.requests]
+
+
+def record(recipe_id, titulo="Omelete", etag="v1"):
+    return {"id": recipe_id, "titulo": titulo, "ingredientes": "ovos, sal", "passos": "bater", "image": "", "etag": etag}
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    recipe_cache.clear()
+    yield
+    recipe_cache.clear()
+
+
+@pytest.fixture
+def store():
+    return LocalStore(":memory:")
+
+
+@pytest.fixture
+def queue(store):
+    return SyncQueue("cook", store=store)
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    fake = FakeApi()
+    monkeypatch.setattr(sync, "api", fake)
+    return fake
+
+
+def test_edit_of_an_unsent_add_is_folded_into_it(queue, store):
+    recipe = queue.add_recipe("Bolo", "farinha", "cozer")
+    queue.edit_recipe(recipe.id, "Bolo de laranja", "farinha, laranja", "cozer")
+
+    change, = store.outbox("cook")
+    assert change["op"] == "add_recipe"
+    assert change["recipe_id"] == recipe.id
+    assert change["payload"]["titulo"] == "Bolo de laranja"
+    assert change["payload"]["ingredientes"] == "farinha, laranja"
+
+
+def test_two_edits_keep_the_version_the_first_was_made_on(queue, store):
+    store.put_records([record(5, etag="v1")], force=True)
+    queue.edit_recipe(5, "Omelete simples", "ovos", "bater")
+    queue.edit_recipe(5, "Omelete final", "ovos, sal", "bater")
+
+    change, = store.outbox("cook")
+    assert change["op"] == "edit_recipe"
+    assert change["payload"]["titulo"] == "Omelete final"
+    assert change["payload"]["base_etag"] == "v1"
+    assert store.records([5])[5]["titulo"] == "Omelete final"
+
+
+def test_follow_and_unfollow_cancel_out(queue, store):
+    queue.follow("ana")
+    queue.unfollow("ana")
+
+    assert store.outbox("cook") == []
+    assert queue.pending_follows() == {}
+
+
+def test_delete_of_an_unsent_add_forgets_it(queue, store):
+    recipe = queue.add_recipe("Bolo", "farinha", "cozer", image="bolo.png")
+    queue.delete_recipe(recipe.id)
+
+    assert store.outbox("cook") == []
+    assert store.records([recipe.id]) == {}
+
+
+def test_concurrent_adds_get_their_own_ids(queue, store):
+    barrier = threading.Barrier(8)
+    recipes = []
+
+    def add(i):
+        barrier.wait()
+        recipes.append(queue.add_recipe(f"Receita {i}", "sal", "provar"))
+
+    threads = [threading.Thread(target=add, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ids = {recipe.id for recipe in recipes}
+    assert len(ids) == 8
+    assert {change["recipe_id"] for change in store.outbox("cook")} == ids
+    assert {stored["titulo"] for stored in store.records(ids).values()} == {f"Receita {i}" for i in range(8)}
+
+
+def test_sent_add_moves_queued_changes_to_the_server_id(queue, store, fake_api, monkeypatch):
+    uploads = []
+    monkeypatch.setattr(sync, "upload_image", lambda path, kind, id: uploads.append((path, id)))
+    fake_api.handlers["add_recipe"] = lambda payload: FakeResponse(201, {"id": 41})
+
+    recipe = queue.add_recipe("Bolo", "farinha", "cozer", image="bolo.png")
+    queue.flush()
+
+    assert fake_api.endpoints() == ["/add_recipe"]
+    assert uploads == [("bolo.png", 41)]
+    assert store.outbox("cook") == []
+    assert set(store.records([recipe.id, 41])) == {41}
+
+
+def test_edit_of_a_changed_server_copy_is_parked_as_a_conflict(queue, store, fake_api):
+    store.put_records([record(5, etag="v1")], force=True)
+    server_copy = record(5, titulo="Omelete do servidor", etag="v2")
+    fake_api.handlers["get_recipes"] = lambda payload: FakeResponse(200, {"recipes": [server_copy]})
+    fake_api.handlers["edit_recipe"] = lambda payload: FakeResponse(200)
+
+    queue.edit_recipe(5, "Omelete minha", "ovos", "bater")
+    queue.flush()
+
+    assert "/edit_recipe" not in fake_api.endpoints()
+    assert store.outbox("cook") == []
+    conflict, = queue.conflicts()
+    assert conflict["error"]
+    assert store.records([5])[5]["titulo"] == "Omelete do servidor"
+
+    queue.keep_mine(conflict)
+    queue.flush()
+
+    assert fake_api.endpoints()[-1] == "/edit_recipe"
+    assert fake_api.requests[-1][1]["titulo"] == "Omelete minha"
+    assert queue.conflicts() == []
+    assert store.outbox("cook") == []
+
+
+def test_edit_of_an_unchanged_server_copy_is_sent(queue, store, fake_api):
+    store.put_records([record(5, etag="v1")], force=True)
+    fake_api.handlers["get_recipes"] = lambda payload: FakeResponse(200, {"recipes": [], "unchanged": [5]})
+    fake_api.handlers["edit_recipe"] = lambda payload: FakeResponse(200)
+
+    queue.edit_recipe(5, "Omelete minha", "ovos", "bater")
+    queue.flush()
+
+    assert fake_api.endpoints() == ["/get_recipes", "/edit_recipe"]
+    assert queue.conflicts() == []
+    assert store.outbox("cook") == []
+
+
+def test_refused_change_is_dropped(queue, store, fake_api):
+    fake_api.handlers["add_recipe"] = lambda payload: FakeResponse(400, {"error": "Dados inválidos"})
+
+    queue.add_recipe("Bolo", "farinha", "cozer")
+    queue.flush()
+
+    assert store.outbox("cook") == []
+
+
+def test_change_is_kept_while_the_server_is_unreachable(queue, store, fake_api):
+    queue.add_recipe("Bolo", "farinha", "cozer")
+
+    with pytest.raises(Offline):
+        queue.flush()
+
+    change, = store.outbox("cook")
+    assert change["op"] == "add_recipe"
+
+
+def test_queued_delete_is_hidden_from_the_offline_pages(queue, store, monkeypatch):
+    monkeypatch.setattr(recipe_service, "local_store", store)
+    monkeypatch.setattr(recipe_service, "api", FakeApi())  # Unreachable: pages come from the local store
+    store.put_page("cook", False, None, [1, 2], None)
+    store.put_records([record(1), record(2)])
+
+    queue.delete_recipe(2)
+    new = queue.add_recipe("Bolo", "farinha", "cozer")
+
+    assert recipe_service.list_recipe_page("cook") == ([1, new.id], None)
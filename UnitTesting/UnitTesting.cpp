@@ -126,6 +126,24 @@ namespace UnitTests
             Logger::WriteMessage("Receitas obtidas com sucesso, para o utilizador.");
         }
 
+        TEST_METHOD(TesteObterReceitasPorUtilizadorPaginado)
+        {
+            Logger::WriteMessage("Iniciando Teste: TestObterReceitasPorUtilizadorPaginado");
+            Database db(":memory:");
+            db.inserirUtilizador(6, "user6", "password6");
+            int user_id = db.obterUtilizadorId("user6");
+            db.inserirReceita(3, "Titulo3", "Ingredientes3", "Passos3", user_id);
+            db.inserirReceita(4, "Titulo4", "Ingredientes4", "Passos4", user_id);
+            db.inserirReceita(5, "Titulo5", "Ingredientes5", "Passos5", user_id);
+
+            auto primeira = db.obterReceitasPorUtilizadorPaginado(user_id, 0, 2);
+            Assert::AreEqual((int)primeira.size(), 2);
+            auto segunda = db.obterReceitasPorUtilizadorPaginado(user_id, primeira.back(), 2); // cursor = último id da página anterior
+            Assert::AreEqual((int)segunda.size(), 1);
+            Assert::AreEqual(segunda[0], 5);
+            Logger::WriteMessage("Receitas paginadas obtidas com sucesso.");
+        }
+
         TEST_METHOD(TesteApagarReceita)
         {
             Logger::WriteMessage("Iniciando Teste: TestApagarReceita");
@@ -155,6 +173,103 @@ namespace UnitTests
             Logger::WriteMessage("Receita obtida com sucesso, por ID.");
         }
 
+        TEST_METHOD(TesteObterReceitasPorIds)
+        {
+            Logger::WriteMessage("Iniciando Teste: TestObterReceitasPorIds");
+            Database db(":memory:");
+            db.inserirUtilizador(8, "user8", "password8");
+            int user_id = db.obterUtilizadorId("user8");
+            db.inserirReceita(6, "Titulo6", "Ingredientes6", "Passos6", user_id);
+            db.inserirReceita(7, "Titulo7", "Ingredientes7", "Passos7", user_id);
+
+            auto receitas = db.obterReceitasPorIds({ 6, 7, 99 }); // 99 não existe e é ignorado
+            Assert::AreEqual((int)receitas.size(), 2);
+            Assert::IsTrue(db.obterReceitasPorIds({}).empty());
+            Logger::WriteMessage("Receitas obtidas com sucesso, em lote.");
+        }
+
+        TEST_METHOD(TesteConsultaPesquisa)
+        {
+            Logger::WriteMessage("Iniciando Teste: TesteConsultaPesquisa");
+            Assert::AreEqual(Database::consultaPesquisa("bolo de  chocolate"), std::string("\"bolo\"* \"de\"* \"chocolate\"*"));
+            Assert::AreEqual(Database::consultaPesquisa("\"ovo\" OR (NEAR"), std::string("\"ovo\"* \"OR\"* \"NEAR\"*")); // Sintaxe FTS5 é tratada como texto
+            Assert::AreEqual(Database::consultaPesquisa(" -*- "), std::string(""));
+            Logger::WriteMessage("Consulta de pesquisa construída com sucesso.");
+        }
+
+        TEST_METHOD(TestePesquisarReceitas)
+        {
+            Logger::WriteMessage("Iniciando Teste: TestePesquisarReceitas");
+            Database db(":memory:");
+            db.inserirUtilizador(1, "user1", "password1");
+            db.inserirReceita(1, "Bolo de chocolate", "farinha, ovos, açúcar, chocolate", "Misturar e cozer", 1);
+            db.inserirReceita(2, "Arroz doce", "arroz, leite, açúcar, canela", "Cozer o arroz no leite", 1);
+            db.inserirReceita(3, "Omelete", "ovos, sal", "Bater os ovos; servir com chocolate quente", 1);
+
+            auto resultados = db.pesquisarReceitas("chocolate", 0, 10);
+            Assert::AreEqual((int)resultados.size(), 2);
+            Assert::AreEqual(resultados[0], 1); // No título pesa mais do que nos passos
+
+            Assert::AreEqual((int)db.pesquisarReceitas("acucar", 0, 10).size(), 2); // Sem acentos
+            Assert::AreEqual((int)db.pesquisarReceitas("choc", 0, 10).size(), 2); // Prefixo
+            Assert::AreEqual((int)db.pesquisarReceitas("chocolate", 1, 10).size(), 1); // Segunda página
+
+            db.editarReceita(2, "Arroz de pato", "arroz, pato", "Assar");
+            Assert::AreEqual((int)db.pesquisarReceitas("leite", 0, 10).size(), 0); // Triggers atualizam o índice
+            db.apagarReceita(1, 1);
+            Assert::AreEqual((int)db.pesquisarReceitas("chocolate", 0, 10).size(), 1);
+            Logger::WriteMessage("Pesquisa de receitas concluída com sucesso.");
+        }
+
+        TEST_METHOD(TesteNormalizarIngrediente)
+        {
+            Logger::WriteMessage("Iniciando Teste: TesteNormalizarIngrediente");
+            Assert::AreEqual(Database::normalizarIngrediente("200 g de Açúcar"), std::string("acucar"));
+            Assert::AreEqual(Database::normalizarIngrediente("Ovos"), std::string("ovo"));
+            Assert::AreEqual(Database::normalizarIngrediente("2 limões"), std::string("limao"));
+            Assert::AreEqual(Database::normalizarIngrediente(" Queijo  FETA "), std::string("queijo feta"));
+            Assert::AreEqual(Database::normalizarIngrediente("1/2 cup of eggs"), std::string("egg"));
+
+            auto ingredientes = Database::normalizarIngredientes("ovos, Ovo; farinha\n, ,");
+            Assert::AreEqual((int)ingredientes.size(), 2); // Repetidos e vazios são ignorados
+            Logger::WriteMessage("Ingredientes normalizados com sucesso.");
+        }
+
+        TEST_METHOD(TesteReceitasComIngredientes)
+        {
+            Logger::WriteMessage("Iniciando Teste: TesteReceitasComIngredientes");
+            Database db(":memory:");
+            db.inserirUtilizador(1, "user1", "password1");
+            db.inserirReceita(1, "Omelete", "ovos, espinafres, queijo feta, sal", "Bater e cozinhar", 1);
+            db.inserirReceita(2, "Bolo", "farinha, ovos, açúcar, leite, manteiga", "Misturar e cozer", 1);
+            db.inserirReceita(3, "Ovo cozido", "ovo, água", "Cozer", 1);
+
+            auto resultados = db.receitasComIngredientes(Database::normalizarIngredientes("ovo, espinafre, feta"), 0, 10);
+            Assert::AreEqual((int)resultados.size(), 3);
+            Assert::AreEqual(std::get<0>(resultados[0]), 1); // Usa os três
+            Assert::AreEqual(std::get<1>(resultados[0]), 3);
+            Assert::AreEqual(std::get<0>(resultados[1]), 3); // Usa um e só falta um
+            Assert::AreEqual(std::get<0>(resultados[2]), 2); // Usa um e faltam quatro
+
+            db.editarReceita(3, "Batatas", "batata, sal", "Cozer");
+            db.apagarReceita(2, 1);
+            resultados = db.receitasComIngredientes({ "ovo" }, 0, 10);
+            Assert::AreEqual((int)resultados.size(), 1); // O índice acompanha edições e remoções
+
+            // Vários termos do mesmo ingrediente contam uma só vez
+            db.inserirReceita(4, "Salada", "queijo feta", "Misturar", 1);
+            resultados = db.receitasComIngredientes(Database::normalizarIngredientes("queijo, feta"), 0, 10);
+            Assert::AreEqual((int)resultados.size(), 2);
+            Assert::AreEqual(std::get<0>(resultados[0]), 4);
+            Assert::AreEqual(std::get<1>(resultados[0]), 1);
+            Assert::AreEqual(std::get<2>(resultados[0]), 1);
+            resultados = db.receitasComIngredientes(Database::normalizarIngredientes("queijo feta, feta, queijo"), 0, 10);
+            Assert::AreEqual(std::get<0>(resultados[1]), 1); // Ainda faltam os ovos e os espinafres
+            Assert::AreEqual(std::get<1>(resultados[1]), 1);
+            Assert::AreEqual(std::get<2>(resultados[1]), 4);
+            Logger::WriteMessage("Receitas por ingredientes obtidas com sucesso.");
+        }
+
         TEST_METHOD(TesteObterUsername)
         {
             Logger::WriteMessage("Iniciando Teste: TestObterUsername");
@@ -189,6 +304,22 @@ namespace UnitTests
             Logger::WriteMessage("Banner atualizado com sucesso.");
         }
 
+        TEST_METHOD(TesteObterImagensPerfil)
+        {
+            Logger::WriteMessage("Iniciando Teste: TesteObterImagensPerfil");
+            Database db(":memory:");
+            db.inserirUtilizador(1, "user1", "password1");
+
+            auto imagens = db.obterImagensPerfil(1);
+            Assert::AreEqual(imagens.first, std::string(""));
+            Assert::AreEqual(imagens.second, std::string(""));
+
+            db.atualizarBanner("images/i_1.jpg", 1);
+            imagens = db.obterImagensPerfil(1);
+            Assert::AreEqual(imagens.second, std::string("images/i_1.jpg"));
+            Logger::WriteMessage("Imagens de perfil obtidas com sucesso.");
+        }
+
         TEST_METHOD(TesteProcurarUtilizadores)
         {
             Logger::WriteMessage("Iniciando Teste: TestProcurarUtilizadores");
@@ -241,6 +372,29 @@ namespace UnitTests
             Assert::IsTrue(result);
             Logger::WriteMessage("Refeição removida com sucesso do Meal Planner.");
         }
+
+        TEST_METHOD(TesteObterRefeicoes)
+        {
+            Logger::WriteMessage("Iniciando Teste: TesteObterRefeicoes");
+            Database db(":memory:");
+            db.inserirUtilizador(1, "user1", "password1");
+            db.inserirUtilizador(2, "user2", "password2");
+            db.inserirReceita(1, "Receita1", "Ingredientes1", "Passos1", 1);
+            db.adicionarRefeicao(1, 1, "Almoço", "Segunda-feira");
+            db.adicionarRefeicao(1, 1, "Jantar", "Segunda-feira");
+            db.adicionarRefeicao(2, 1, "Almoço", "Terça-feira");
+
+            auto refeicoes = db.obterRefeicoes(1);
+            Assert::AreEqual(2, (int)refeicoes.size()); // Só as do user1
+            Assert::AreEqual(std::string("Almoço"), std::get<2>(refeicoes[0]));
+
+            // Com meal_type só sai essa refeição
+            db.removerRefeicao(1, 1, "Segunda-feira", "Jantar");
+            refeicoes = db.obterRefeicoes(1);
+            Assert::AreEqual(1, (int)refeicoes.size());
+            Assert::AreEqual(std::string("Almoço"), std::get<2>(refeicoes[0]));
+            Logger::WriteMessage("Refeições do utilizador obtidas com sucesso.");
+        }
         /* ---------------------fim dos testes ao meal planner------------------------- */
 
 
@@ -292,6 +446,64 @@ namespace UnitTests
             Assert::IsFalse(db.verificarFollower(2, 1)); // Relação inversa não deve existir
             Logger::WriteMessage("Verificação de seguidor concluída com sucesso.");
         }
+
+        TEST_METHOD(TesteListarSeguidos)
+        {
+            Logger::WriteMessage("Iniciando Teste: TesteListarSeguidos");
+            Database db(":memory:");
+            db.inserirUtilizador(1, "user1", "password1");
+            db.inserirUtilizador(2, "user2", "password2");
+            db.inserirUtilizador(3, "user3", "password3");
+            db.adicionarSeguidor(1, 2);
+            db.adicionarSeguidor(1, 3);
+            db.adicionarSeguidor(2, 3);
+
+            Assert::AreEqual((int)db.listarSeguidos(1).size(), 2);
+            Assert::AreEqual((int)db.listarSeguidos(3).size(), 0);
+            Logger::WriteMessage("Lista de seguidos obtida com sucesso.");
+        }
+
+        TEST_METHOD(TesteFiltrarSeguidos)
+        {
+            Logger::WriteMessage("Iniciando Teste: TesteFiltrarSeguidos");
+            Database db(":memory:");
+            db.inserirUtilizador(1, "user1", "password1");
+            db.inserirUtilizador(2, "user2", "password2");
+            db.inserirUtilizador(3, "user3", "password3");
+            db.adicionarSeguidor(1, 2);
+
+            auto seguidos = db.filtrarSeguidos(1, { "user2", "user3", "naoexiste" });
+            Assert::AreEqual((int)seguidos.size(), 1);
+            Assert::AreEqual(seguidos[0], std::string("user2"));
+            Assert::IsTrue(db.filtrarSeguidos(1, {}).empty());
+            Logger::WriteMessage("Filtragem de seguidos concluída com sucesso.");
+        }
         /* ---------------------fim dos testes para os seguidores------------------------- */
+
+        /* ---------------------testes para as notificações------------------------- */
+        TEST_METHOD(TesteObterNotifsDesde)
+        {
+            Logger::WriteMessage("Iniciando Teste: TesteObterNotifsDesde");
+            Database db(":memory:");
+            db.inserirUtilizador(1, "user1", "password1");
+            db.inserirUtilizador(2, "user2", "password2");
+            int primeira = db.adicionarNotificacao(1, 2, "primeira");
+            int segunda = db.adicionarNotificacao(1, 2, "segunda");
+            db.adicionarNotificacao(2, 1, "de outro utilizador");
+
+            auto todas = db.obterNotifsDesde(1, 0, 10);
+            Assert::AreEqual((int)todas.size(), 2);
+            Assert::AreEqual(std::get<0>(todas[0]), primeira);
+            Assert::AreEqual(std::get<2>(todas[0]), std::string("user2"));
+            Assert::AreEqual(std::get<3>(todas[1]), std::string("segunda"));
+
+            auto novas = db.obterNotifsDesde(1, primeira, 10);
+            Assert::AreEqual((int)novas.size(), 1);
+            Assert::AreEqual(std::get<0>(novas[0]), segunda);
+            Assert::AreEqual((int)db.obterNotifsDesde(1, 0, 1).size(), 1);
+            Assert::IsTrue(db.obterNotifsDesde(1, segunda, 10).empty());
+            Logger::WriteMessage("Notificações a seguir ao cursor obtidas com sucesso.");
+        }
+        /* ---------------------fim dos testes para as notificações------------------------- */
     };
 }